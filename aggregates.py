@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, Iterable, Optional
+
+from models import Employee, Skill, Task
+
+# Ten 10%-wide utilization buckets plus one for overcommitted employees
+UTILIZATION_LABELS = [f"{i * 10}-{i * 10 + 10}%" for i in range(10)] + ["Over 100%"]
+
+
+def utilization_bucket(employee: Employee) -> int:
+    if employee.max_workload_hours <= 0:
+        return 0
+    utilization = employee.current_workload / employee.max_workload_hours
+    if utilization > 1.0:
+        return 10
+    return min(9, int(utilization * 10))
+
+
+class DashboardAggregates:
+    """Dashboard figures kept up to date as the system changes.
+
+    TaskAssignmentSystem calls the ``*_added`` / ``*_removed`` / ``*_changed``
+    hooks, so reading the figures never loops over employees or tasks.
+    ``version`` increases with every update and can key caches of rendered
+    charts. All methods are thread-safe.
+    """
+
+    def __init__(self, recent_size: int = 10):
+        self.version = 0
+        self.total_employees = 0
+        self.total_tasks = 0
+        self.assigned_tasks = 0
+        self.completed_tasks = 0
+        self.total_workload = 0.0
+        self.total_capacity = 0.0
+        self.skill_counts: Counter = Counter()
+        self.priority_counts: Counter = Counter()
+        self.utilization_histogram = [0] * len(UTILIZATION_LABELS)
+        self.recent_activity: deque = deque(maxlen=recent_size)
+        self._buckets: Dict[str, int] = {}  # emp_id -> utilization bucket
+        self._priorities: Dict[str, str] = {}  # task_id -> priority name
+        self._lock = threading.Lock()
+
+    def rebuild(self, employees: Iterable[Employee], tasks: Iterable[Task]):
+        """Compute everything from scratch (done once, when first requested)"""
+        for employee in employees:
+            self.employee_added(employee)
+        tasks = list(tasks)
+        for task in tasks:
+            self._count_task(task, 1)
+        with self._lock:
+            for task in tasks[-self.recent_activity.maxlen:]:
+                self._log(None, "Task added", task, task.assigned_to)
+
+    def _log(self, timestamp: Optional[float], event: str, task: Task, emp_id: Optional[str]):
+        self.recent_activity.append({"time": timestamp, "event": event, "task_id": task.task_id,
+                                     "task_name": task.name, "priority": task.priority.name,
+                                     "assigned_to": emp_id})
+
+    # Employees
+
+    def employee_added(self, employee: Employee):
+        with self._lock:
+            self.version += 1
+            self.total_employees += 1
+            self.total_workload += employee.current_workload
+            self.total_capacity += employee.max_workload_hours
+            for skill in employee.skills.values():
+                self.skill_counts[skill.name] += 1
+            bucket = self._buckets[employee.emp_id] = utilization_bucket(employee)
+            self.utilization_histogram[bucket] += 1
+
+    def employee_removed(self, employee: Employee):
+        with self._lock:
+            self.version += 1
+            self.total_employees -= 1
+            self.total_workload -= employee.current_workload
+            self.total_capacity -= employee.max_workload_hours
+            for skill in employee.skills.values():
+                self.skill_counts[skill.name] -= 1
+                if not self.skill_counts[skill.name]:
+                    del self.skill_counts[skill.name]
+            self.utilization_histogram[self._buckets.pop(employee.emp_id)] -= 1
+
+    def skill_added(self, previous: Optional[Skill], skill: Skill):
+        if previous is not None:
+            return  # Level or experience changed, holder count did not
+        with self._lock:
+            self.version += 1
+            self.skill_counts[skill.name] += 1
+
+    def workload_changed(self, employee: Employee, delta: float):
+        with self._lock:
+            self.version += 1
+            self.total_workload += delta
+            old = self._buckets.get(employee.emp_id)
+            if old is None:
+                return
+            new = self._buckets[employee.emp_id] = utilization_bucket(employee)
+            self.utilization_histogram[old] -= 1
+            self.utilization_histogram[new] += 1
+
+    # Tasks
+
+    def _count_task(self, task: Task, sign: int):
+        with self._lock:
+            self.version += 1
+            self.total_tasks += sign
+            self.assigned_tasks += sign * bool(task.assigned_to)
+            self.completed_tasks += sign * bool(task.is_completed)
+            if sign > 0:
+                priority = self._priorities[task.task_id] = task.priority.name
+            else:
+                priority = self._priorities.pop(task.task_id)
+            self.priority_counts[priority] += sign
+            if not self.priority_counts[priority]:
+                del self.priority_counts[priority]
+
+    def task_added(self, task: Task):
+        self._count_task(task, 1)
+        with self._lock:
+            self._log(time.time(), "Task added", task, task.assigned_to)
+
+    def task_removed(self, task: Task):
+        self._count_task(task, -1)
+
+    def task_changed(self, task: Task):
+        """Re-count a task whose priority may have changed"""
+        with self._lock:
+            old = self._priorities.get(task.task_id)
+            new = task.priority.name
+            if old is None or old == new:
+                return
+            self.version += 1
+            self._priorities[task.task_id] = new
+            self.priority_counts[old] -= 1
+            if not self.priority_counts[old]:
+                del self.priority_counts[old]
+            self.priority_counts[new] += 1
+
+    def task_assigned(self, task: Task, employee: Employee):
+        with self._lock:
+            self.assigned_tasks += 1
+            self._log(time.time(), "Task assigned", task, employee.emp_id)
+        self.workload_changed(employee, task.estimated_hours)
+
+    def task_completed(self, task: Task, employee: Optional[Employee], released: float):
+        """``released`` hours came off ``employee``'s workload (None if no longer on the roster)"""
+        with self._lock:
+            self.version += 1
+            self.completed_tasks += 1
+            self._log(time.time(), "Task completed", task, task.assigned_to)
+        if employee is not None:
+            self.workload_changed(employee, -released)
+
+    def snapshot(self) -> dict:
+        """Consistent copy of every figure"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "total_employees": self.total_employees,
+                "total_tasks": self.total_tasks,
+                "assigned_tasks": self.assigned_tasks,
+                "unassigned_tasks": self.total_tasks - self.assigned_tasks,
+                "completed_tasks": self.completed_tasks,
+                "utilization": self.total_workload / self.total_capacity if self.total_capacity else 0.0,
+                "utilization_histogram": dict(zip(UTILIZATION_LABELS, self.utilization_histogram)),
+                "skill_counts": dict(self.skill_counts),
+                "priority_counts": dict(self.priority_counts),
+                "recent_activity": list(self.recent_activity),
+            }
@@ -1,11 +1,36 @@
+import io
+import os
+import time
 import streamlit as st
 import pandas as pd
+import bulk_io
 from models import Employee, Task, TaskPriority, Skill, SkillLevel
+from storage import SQLiteStorage
+from table_views import TASK_STATUSES, EmployeeTableView, TaskTableView
 from task_assignment import TaskAssignmentSystem
 
-# Initialize the task assignment system
-if 'task_system' not in st.session_state:
-    st.session_state.task_system = TaskAssignmentSystem()
+@st.cache_resource
+def get_task_system():
+    """One system per server process, shared by every browser session
+
+    Assignments are committed under per-task/per-employee locks, so
+    dispatchers working at the same time can't double-assign a task or
+    overcommit an employee. Data is persisted to SQLite across restarts.
+    """
+    storage = SQLiteStorage(os.environ.get("TASK_SYSTEM_DB", "task_system.db"))
+    return TaskAssignmentSystem(storage=storage)
+
+task_system = get_task_system()
+
+@st.cache_resource(max_entries=1)
+def get_employee_table(version):
+    """Column view of the roster, rebuilt only when the system version changes"""
+    return EmployeeTableView(task_system)
+
+@st.cache_resource(max_entries=1)
+def get_task_table(version):
+    """Column view of the backlog, rebuilt only when the system version changes"""
+    return TaskTableView(task_system)
 
 # Set page configuration
 st.set_page_config(
@@ -72,22 +97,73 @@ st.image(logo_path, width=220)
 st.title("Task Assignment System")
 st.markdown("Intelligent task assignment using advanced algorithms")
 
+def bulk_import_section(label, importer, exporter, records):
+    """Upload/download widgets for streaming CSV or JSONL files"""
+    with st.expander(f"📥 Bulk Import / Export {label}"):
+        uploaded = st.file_uploader(f"Upload {label.lower()} (CSV or JSONL)", type=["csv", "jsonl"],
+                                    key=f"upload_{label}")
+        if uploaded is not None and st.button(f"📥 Import {label}", key=f"import_{label}"):
+            status = st.empty()
+            # Parse the upload line by line instead of decoding it in one piece
+            stream = io.TextIOWrapper(uploaded, encoding="utf-8", newline="")
+            try:
+                report = importer(task_system, stream, bulk_io.detect_format(uploaded.name),
+                                  on_chunk=lambda progress: status.info(f"⏳ Imported {progress.imported} rows..."))
+            finally:
+                stream.detach()
+            status.success(f"✅ Imported {report.imported} {label.lower()}")
+            if report.failed:
+                st.warning(f"⚠️ {report.failed} rows could not be imported")
+                st.dataframe(pd.DataFrame([{"Line": error.line, "Error": error.message}
+                                           for error in report.errors]), use_container_width=True)
+
+        fmt = st.radio("Export format", ["csv", "jsonl"], horizontal=True, key=f"export_format_{label}")
+        if st.button(f"📤 Prepare {label} Export", key=f"export_{label}"):
+            buffer = io.StringIO()
+            exporter(records(), buffer, fmt)
+            st.download_button(f"⬇️ Download {label.lower()}.{fmt}", buffer.getvalue(),
+                               file_name=f"{label.lower()}.{fmt}", key=f"download_{label}")
+
+def paginated_table(table, mask, key):
+    """Sort and page controls for a table view; only the visible page becomes a DataFrame"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", list(table.sort_columns), key=f"{key}_sort")
+    with col2:
+        descending = st.checkbox("Descending", key=f"{key}_descending")
+    with col3:
+        page_size = st.selectbox("Rows per page", [25, 50, 100], key=f"{key}_page_size")
+    matching = int(mask.sum())
+    pages = max(1, -(-matching // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages  # A narrower filter left fewer pages
+    with col4:
+        page_number = st.number_input("Page", min_value=1, max_value=pages, key=f"{key}_page")
+    _, records = table.query(mask, sort_by, descending, page_number - 1, page_size)
+    st.caption(f"{matching} of {table.size} rows match · page {page_number} of {pages}")
+    if records:
+        st.dataframe(pd.DataFrame(records), use_container_width=True, hide_index=True)
+
 # Sidebar
 st.sidebar.header("Navigation")
-page = st.sidebar.radio("Go to", ["Dashboard", "Employee Management", "Task Management", "Task Assignment"])
+page = st.sidebar.radio("Go to", ["Dashboard", "Employee Management", "Task Management", "Task Assignment",
+                                 "Diagnostics"])
+page_started = time.perf_counter()
 
 # Dashboard page
 if page == "Dashboard":
     st.header("📊 Dashboard")
     
+    # Maintained incrementally by the system, so nothing here loops over the roster
+    stats = task_system.get_dashboard_aggregates().snapshot()
+    total_employees = stats["total_employees"]
+    total_tasks = stats["total_tasks"]
+    assigned_tasks = stats["assigned_tasks"]
+    unassigned_tasks = stats["unassigned_tasks"]
+
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_employees = len(st.session_state.task_system.employees)
-    total_tasks = len(st.session_state.task_system.tasks)
-    assigned_tasks = sum(1 for task in st.session_state.task_system.tasks.values() if task.assigned_to)
-    unassigned_tasks = total_tasks - assigned_tasks
-    
     with col1:
         st.metric("👥 Total Employees", total_employees)
     with col2:
@@ -98,59 +174,42 @@ if page == "Dashboard":
         st.metric("⏳ Unassigned Tasks", unassigned_tasks)
     
     # Charts section
-    if st.session_state.task_system.employees or st.session_state.task_system.tasks:
+    if total_employees or total_tasks:
         col1, col2 = st.columns(2)
         
         with col1:
             # Employee workload chart
-            if st.session_state.task_system.employees:
+            if total_employees:
                 st.subheader("👥 Employee Workload Distribution")
-                workload_data = []
-                for emp in st.session_state.task_system.employees.values():
-                    utilization = (emp.current_workload / emp.max_workload_hours) * 100 if emp.max_workload_hours > 0 else 0
-                    workload_data.append({
-                        "Employee": emp.name,
-                        "Current Workload": emp.current_workload,
-                        "Max Workload": emp.max_workload_hours,
-                        "Utilization %": utilization
-                    })
-                
-                workload_df = pd.DataFrame(workload_data)
-                st.bar_chart(workload_df.set_index("Employee")["Utilization %"])
+                st.caption(f"Overall utilization: {stats['utilization']:.1%}")
+                workload_df = pd.DataFrame({
+                    "Utilization": list(stats["utilization_histogram"].keys()),
+                    "Employees": list(stats["utilization_histogram"].values())
+                })
+                st.bar_chart(workload_df.set_index("Utilization"))
             
             # Skill distribution chart
-            if st.session_state.task_system.employees:
+            if stats["skill_counts"]:
                 st.subheader("🛠️ Skill Distribution")
-                skill_counts = {}
-                for emp in st.session_state.task_system.employees.values():
-                    for skill in emp.skills.values():
-                        skill_name = skill.name
-                        skill_counts[skill_name] = skill_counts.get(skill_name, 0) + 1
-                
-                if skill_counts:
-                    skill_df = pd.DataFrame({
-                        "Skill": list(skill_counts.keys()),
-                        "Count": list(skill_counts.values())
-                    })
-                    st.bar_chart(skill_df.set_index("Skill"))
+                top_skills = sorted(stats["skill_counts"].items(), key=lambda item: item[1], reverse=True)[:20]
+                skill_df = pd.DataFrame({
+                    "Skill": [name for name, _ in top_skills],
+                    "Count": [count for _, count in top_skills]
+                })
+                st.bar_chart(skill_df.set_index("Skill"))
         
         with col2:
             # Task priority distribution
-            if st.session_state.task_system.tasks:
+            if total_tasks:
                 st.subheader("🎯 Task Priority Distribution")
-                priority_counts = {}
-                for task in st.session_state.task_system.tasks.values():
-                    priority = task.priority.name
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-                
                 priority_df = pd.DataFrame({
-                    "Priority": list(priority_counts.keys()),
-                    "Count": list(priority_counts.values())
+                    "Priority": list(stats["priority_counts"].keys()),
+                    "Count": list(stats["priority_counts"].values())
                 })
                 st.bar_chart(priority_df.set_index("Priority"))
             
             # Task assignment status
-            if st.session_state.task_system.tasks:
+            if total_tasks:
                 st.subheader("📊 Task Assignment Status")
                 status_data = {
                     "Status": ["Assigned", "Unassigned"],
@@ -161,15 +220,16 @@ if page == "Dashboard":
     
     # Recent activity table
     st.subheader("📈 Recent Activity")
-    if st.session_state.task_system.tasks:
+    if stats["recent_activity"]:
         activity_data = []
-        for task in list(st.session_state.task_system.tasks.values())[-10:]:  # Show last 10 tasks
+        for event in reversed(stats["recent_activity"]):  # Newest first
             activity_data.append({
-                "Task ID": task.task_id,
-                "Task Name": task.name,
-                "Priority": task.priority.name,
-                "Assigned To": task.assigned_to or "Unassigned",
-                "Status": "✅ Completed" if task.is_completed else "⏳ Pending"
+                "Time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event["time"])) if event["time"] else "",
+                "Event": event["event"],
+                "Task ID": event["task_id"],
+                "Task Name": event["task_name"],
+                "Priority": event["priority"],
+                "Assigned To": event["assigned_to"] or "Unassigned"
             })
         
         st.dataframe(pd.DataFrame(activity_data), use_container_width=True)
@@ -227,27 +287,29 @@ elif page == "Employee Management":
                 employee = Employee(emp_id, emp_name, employee_skills, max_workload)
                 employee.performance_rating = performance_rating
                 
-                st.session_state.task_system.add_employee(employee)
+                task_system.add_employee(employee)
                 st.success(f"✅ Employee '{emp_name}' added successfully!")
             else:
                 st.error("❌ Please fill in Employee ID and Name")
 
+    bulk_import_section("Employees", bulk_io.import_employees, bulk_io.export_employees,
+                        lambda: task_system.employees.values())
+
     # Display existing employees
     st.subheader("📋 Current Employees")
-    if st.session_state.task_system.employees:
-        employees_data = []
-        for emp in st.session_state.task_system.employees.values():
-            skills_str = ", ".join([f"{s.name} ({s.level.name})" for s in emp.skills.values()])
-            employees_data.append({
-                "Employee ID": emp.emp_id,
-                "Name": emp.name,
-                "Skills": skills_str,
-                "Current Workload": f"{emp.current_workload}/{emp.max_workload_hours} hours",
-                "Performance": f"{emp.performance_rating:.2f}",
-                "Assigned Tasks": len(emp.assigned_tasks)
-            })
-        
-        st.dataframe(pd.DataFrame(employees_data), use_container_width=True)
+    if task_system.employees:
+        table = get_employee_table(task_system.version)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            search = st.text_input("Search ID or name", key="employee_search")
+            skills = st.multiselect("Has any of these skills", table.skill_names, key="employee_skills")
+        with col2:
+            min_level = st.selectbox("Minimum skill level", [level.name for level in SkillLevel],
+                                     key="employee_min_level")
+        with col3:
+            low, high = st.slider("Utilization %", 0, 200, (0, 200), step=5, key="employee_utilization")
+        mask = table.filter(skills, SkillLevel[min_level], (low / 100, high / 100), search)
+        paginated_table(table, mask, "employee")
     else:
         st.info("📝 No employees added yet. Add your first employee above!")
 
@@ -299,43 +361,44 @@ elif page == "Task Management":
                     deadline_days
                 )
                 
-                st.session_state.task_system.add_task(task)
+                task_system.add_task(task)
                 st.success(f"✅ Task '{task_name}' added successfully!")
             else:
                 st.error("❌ Please fill in Task ID and Name")
 
+    bulk_import_section("Tasks", bulk_io.import_tasks, bulk_io.export_tasks,
+                        lambda: task_system.tasks.values())
+
     # Display existing tasks
     st.subheader("📋 Current Tasks")
-    if st.session_state.task_system.tasks:
-        tasks_data = []
-        for task in st.session_state.task_system.tasks.values():
-            skills_str = ", ".join([f"{skill} ({level.name})" for skill, level in task.required_skills.items()])
-            tasks_data.append({
-                "Task ID": task.task_id,
-                "Name": task.name,
-                "Priority": task.priority.name,
-                "Hours": task.estimated_hours,
-                "Deadline": f"{task.deadline_days} days",
-                "Required Skills": skills_str,
-                "Assigned To": task.assigned_to or "Unassigned",
-                "Status": "✅ Completed" if task.is_completed else "⏳ Pending"
-            })
-        
-        st.dataframe(pd.DataFrame(tasks_data), use_container_width=True)
+    if task_system.tasks:
+        table = get_task_table(task_system.version)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            search = st.text_input("Search ID or name", key="task_search")
+        with col2:
+            priorities = st.multiselect("Priority", [p.name for p in TaskPriority], key="task_priorities")
+            statuses = st.multiselect("Status", TASK_STATUSES, key="task_statuses")
+        with col3:
+            skills = st.multiselect("Requires any of these skills", table.skill_names, key="task_skills")
+        mask = table.filter(skills, [TaskPriority[p] for p in priorities], statuses, search)
+        paginated_table(table, mask, "task")
     else:
         st.info("📝 No tasks added yet. Add your first task above!")
 
 elif page == "Task Assignment":
     st.header("🎯 Task Assignment")
-    
-    if not st.session_state.task_system.tasks:
+
+    # Render from one consistent snapshot while other sessions keep assigning
+    snapshot = task_system.snapshot()
+    if not snapshot.tasks:
         st.info("📝 Please add some tasks first in the Task Management section.")
-    elif not st.session_state.task_system.employees:
+    elif not snapshot.employees:
         st.info("👥 Please add some employees first in the Employee Management section.")
     else:
         # Select task for assignment
         task_options = {f"{task.task_id} - {task.name}": task.task_id 
-                       for task in st.session_state.task_system.tasks.values() 
+                       for task in snapshot.tasks.values() 
                        if not task.assigned_to}
         
         if task_options:
@@ -344,15 +407,17 @@ elif page == "Task Assignment":
             selected_task_id = task_options[selected_task_key]
             
             if st.button("🎯 Get Assignment Recommendations", type="primary"):
-                task = st.session_state.task_system.tasks[selected_task_id]
-                matches = st.session_state.task_system.find_best_matches(task, top_n=5)
+                task = snapshot.tasks[selected_task_id]
+                # Cached per snapshot version, so reruns reuse them until something changes
+                matches = snapshot.recommendations(selected_task_id, top_n=5, vectorized=True)
                 
                 st.subheader(f"📊 Assignment Recommendations for '{task.name}'")
                 st.markdown(f"**Task Details:** Priority: {task.priority.name}, Hours: {task.estimated_hours}, Deadline: {task.deadline_days} days")
                 
                 for i, (employee, probability) in enumerate(matches, 1):
-                    skill_match = st.session_state.task_system.calculate_skill_similarity(employee, task)
-                    availability = employee.get_availability_ratio()
+                    components = snapshot.get_score_components(employee, task)
+                    skill_match = components['skill_match']
+                    availability = components['availability']
                     
                     with st.expander(f"🥇 {i}. {employee.name} (Match Probability: {probability:.1%})"):
                         col1, col2 = st.columns(2)
@@ -364,14 +429,137 @@ elif page == "Task Assignment":
                             st.metric("⭐ Performance", f"{employee.performance_rating:.2f}")
                         
                         if st.button(f"✅ Assign to {employee.name}", key=f"assign_{i}"):
-                            if st.session_state.task_system.assign_task(selected_task_id, employee.emp_id):
+                            result = task_system.try_assign(selected_task_id, employee.emp_id)
+                            if result.ok:
                                 st.success(f"🎉 Task successfully assigned to {employee.name}!")
                                 st.rerun()
                             else:
-                                st.error("❌ Failed to assign task.")
+                                st.error(f"❌ Failed to assign task: {result.message}")
         else:
             st.success("🎉 All tasks are already assigned!")
 
+        if task_options and st.button("📅 Assign All by Deadline",
+                                      help="Earliest (priority-weighted) deadline first, to whoever can finish on time"):
+            assignments = task_system.assign_by_deadline()
+            st.success(f"🎉 Assigned {len(assignments)} of {len(task_options)} tasks")
+            st.rerun()
+
+        # Deadline-aware schedule of open work (see scheduling.py)
+        st.subheader("📅 Schedule")
+        scheduler = task_system.get_scheduler()
+        summary = scheduler.summary()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("⏳ Open Tasks", summary["open_tasks"])
+        with col2:
+            st.metric("⚠️ Late Tasks", summary["late_tasks"])
+        with col3:
+            st.metric("🔭 Beyond Horizon", summary["beyond_horizon"])
+
+        late = scheduler.late_tasks()
+        if late:
+            with st.expander(f"⚠️ {len(late)} tasks will miss their deadline"):
+                st.dataframe(pd.DataFrame([{
+                    "Task ID": placement.task_id,
+                    "Assigned To": placement.emp_id,
+                    "Finishes (day)": f"{placement.finish_day:.1f}",
+                    "Deadline (day)": placement.deadline_days,
+                    "Days Over": f"{-placement.slack_days:.1f}",
+                } for placement in late[:100]]), use_container_width=True, hide_index=True)
+
+        open_tasks = {f"{task.task_id} - {task.name} ({task.assigned_to})": task.task_id
+                      for task in snapshot.tasks.values() if task.assigned_to and not task.is_completed}
+        if open_tasks:
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_open = st.selectbox("Open task", list(open_tasks.keys()))
+                if st.button("✅ Mark Task Completed"):
+                    result = task_system.try_complete(open_tasks[selected_open])
+                    if result.ok:
+                        st.success("🎉 Task completed and capacity released")
+                        st.rerun()
+                    else:
+                        st.error(f"❌ {result.message}")
+            with col2:
+                emp_id = snapshot.tasks[open_tasks[selected_open]].assigned_to
+                plan = scheduler.plan(emp_id)
+                st.markdown(f"**Plan for {emp_id}**")
+                st.dataframe(pd.DataFrame([{
+                    "Task ID": placement.task_id,
+                    "Start (day)": f"{placement.start_day:.1f}",
+                    "Finish (day)": f"{placement.finish_day:.1f}",
+                    "Deadline (day)": placement.deadline_days,
+                    "On Time": "⚠️ Late" if placement.late else "✅",
+                } for placement in plan]), use_container_width=True, hide_index=True)
+
+elif page == "Diagnostics":
+    st.header("🩺 Diagnostics")
+
+    enabled = st.checkbox("Collect timing metrics", value=task_system.instrumentation is not None,
+                          help="Times the scoring and assignment methods. Adds overhead while enabled.")
+    if enabled and task_system.instrumentation is None:
+        task_system.enable_instrumentation()
+    elif not enabled and task_system.instrumentation is not None:
+        task_system.disable_instrumentation()
+
+    instrumentation = task_system.instrumentation
+    if instrumentation is not None:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🔎 Match Calls", instrumentation.match_calls)
+        with col2:
+            st.metric("🧮 Candidates Scored", instrumentation.candidates_scored)
+        with col3:
+            st.metric("✂️ Candidates Pruned", instrumentation.candidates_pruned)
+
+        rows = instrumentation.snapshot()
+        if rows:
+            st.subheader("⏱️ Method Timings")
+            st.dataframe(pd.DataFrame([{
+                "Method": row["name"],
+                "Calls": row["calls"],
+                "Total (ms)": round(row["total_ms"], 2),
+                "Self (ms)": round(row["self_ms"], 2),
+                "Mean (µs)": round(row["mean_us"], 1),
+                "p50 ≤ (µs)": row["p50_le_us"],
+                "p99 ≤ (µs)": row["p99_le_us"],
+            } for row in rows]), use_container_width=True)
+        else:
+            st.info("No calls recorded yet. Use the other pages, then come back.")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🔄 Reset Metrics"):
+                instrumentation.reset()
+                st.rerun()
+        with col2:
+            st.download_button("⬇️ Prometheus Metrics", instrumentation.prometheus_text(),
+                               file_name="metrics.txt")
+
+    st.subheader("🔬 Profile a Single Call")
+    task_options = {f"{task.task_id} - {task.name}": task.task_id
+                    for task in task_system.tasks.values() if not task.assigned_to}
+    if task_options:
+        selected_task_id = task_options[st.selectbox("Task", list(task_options.keys()))]
+        mode = st.radio("Profiler", ["cprofile", "sampling"], horizontal=True)
+        col1, col2 = st.columns(2)
+        profile = None
+        with col1:
+            if st.button("Profile Recommendations"):
+                from instrumentation import profile_call
+                profile = profile_call(task_system.find_best_matches, task_system.tasks[selected_task_id], 5,
+                                       mode=mode)
+        with col2:
+            if st.button("Profile Assignment", help="Auto-assigns the task for real"):
+                profile = task_system.profile_assignment(selected_task_id, mode=mode)
+        if profile is not None:
+            st.code(profile.report)
+    else:
+        st.info("No unassigned tasks to profile.")
+
+if task_system.instrumentation is not None:
+    task_system.instrumentation.observe(f"page:{page}", time.perf_counter() - page_started)
+
 # Add a footer
 st.markdown("---")
 st.markdown("*Task Assignment System - Intelligent task assignment using advanced algorithms*")
@@ -0,0 +1,125 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from models import Task
+from scoring import ScoringEngine
+from task_assignment import uncovered_upper_bound
+
+
+def plan_batch_assignment(engine: ScoringEngine, tasks: Sequence[Task],
+                          candidates_per_task: int = 16) -> List[Tuple[Task, int]]:
+    """Plan a backlog as one capacity-constrained matching, heuristically.
+
+    Every task is scored against the roster once; its ``candidates_per_task``
+    best employees become weighted edges (weight = assignment probability in
+    the current state). Tasks carry different hour counts, so this is a
+    generalized assignment problem rather than a plain bipartite matching:
+    edges are taken globally from best to worst while capacity
+    (max_workload_hours - current_workload) allows, then unplaced tasks get
+    one augmenting pass that moves a blocking task to another of its
+    candidates when that raises the total probability. This is a greedy
+    heuristic, not an exact solve: the total probability can fall short of
+    the optimum, most often when capacity is tight.
+
+    Returns (task, engine row) pairs; nothing is applied to the system.
+    """
+    if not tasks or engine.size == 0:
+        return []
+
+    k = min(candidates_per_task, engine.size)
+    bound = uncovered_upper_bound(engine.weights)
+    edge_tasks, edge_rows, edge_weights = [], [], []
+    for t, task in enumerate(tasks):
+        rows, probabilities = _top_candidates(engine, task, k, bound)
+        edge_tasks.append(np.full(len(rows), t, dtype=np.int64))
+        edge_rows.append(rows)
+        edge_weights.append(probabilities)
+
+    edge_tasks = np.concatenate(edge_tasks)
+    edge_rows = np.concatenate(edge_rows)
+    edge_weights = np.concatenate(edge_weights)
+    order = np.lexsort((edge_rows, edge_tasks, -edge_weights))
+
+    hours = [task.estimated_hours for task in tasks]
+    max_workload = engine.max_workload.tolist()
+    load = engine.current_workload.tolist()
+    assigned_row = [-1] * len(tasks)
+    assigned_weight = [0.0] * len(tasks)
+    candidates: Dict[int, List[Tuple[int, float]]] = {}
+    tasks_on_row: Dict[int, List[int]] = {}
+
+    for t, row, weight in zip(edge_tasks[order].tolist(), edge_rows[order].tolist(),
+                              edge_weights[order].tolist()):
+        candidates.setdefault(t, []).append((row, weight))
+        if assigned_row[t] >= 0 or load[row] + hours[t] > max_workload[row]:
+            continue
+        assigned_row[t] = row
+        assigned_weight[t] = weight
+        load[row] += hours[t]
+        tasks_on_row.setdefault(row, []).append(t)
+
+    # Augmenting pass: free room on a full candidate by moving one of its tasks
+    for t, options in candidates.items():
+        if assigned_row[t] >= 0:
+            continue
+        for row, weight in options:
+            move = _find_move(t, row, weight, hours, load, max_workload,
+                              assigned_weight, candidates, tasks_on_row)
+            if move is None:
+                continue
+            moved_task, new_row, new_weight = move
+            tasks_on_row[row].remove(moved_task)
+            load[row] -= hours[moved_task]
+            assigned_row[moved_task] = new_row
+            assigned_weight[moved_task] = new_weight
+            load[new_row] += hours[moved_task]
+            tasks_on_row.setdefault(new_row, []).append(moved_task)
+
+            assigned_row[t] = row
+            assigned_weight[t] = weight
+            load[row] += hours[t]
+            tasks_on_row[row].append(t)
+            break
+
+    return [(task, assigned_row[t]) for t, task in enumerate(tasks) if assigned_row[t] >= 0]
+
+
+def _top_candidates(engine: ScoringEngine, task: Task, k: int, bound: float):
+    """Rows and probabilities of the ``k`` best feasible employees for a task
+
+    Employees holding one of the required skills are scored first; the whole
+    roster is only scored when someone without those skills could still make
+    the cut.
+    """
+    rows = engine.covered_rows(task) if task.required_skills else None
+    if rows is not None:
+        probabilities = engine.score_task(task, rows, exact=False)
+        feasible = np.count_nonzero(probabilities)
+        if feasible < k or np.partition(probabilities, len(rows) - k)[len(rows) - k] <= bound:
+            rows = None
+    if rows is None:
+        rows = np.arange(engine.size)
+        probabilities = engine.score_task(task, exact=False)
+
+    if k < len(rows):
+        top = np.argpartition(-probabilities, k - 1)[:k]
+        rows, probabilities = rows[top], probabilities[top]
+    feasible = probabilities > 0
+    return rows[feasible], probabilities[feasible]
+
+
+def _find_move(t, row, weight, hours, load, max_workload, assigned_weight, candidates, tasks_on_row):
+    """Best (task, new_row, new_weight) move that lets task ``t`` fit on ``row``"""
+    best, best_gain = None, 0.0
+    for other in tasks_on_row.get(row, ()):
+        if load[row] - hours[other] + hours[t] > max_workload[row]:
+            continue
+        for new_row, new_weight in candidates[other]:
+            if new_row == row or load[new_row] + hours[other] > max_workload[new_row]:
+                continue
+            gain = weight + new_weight - assigned_weight[other]
+            if gain > best_gain:
+                best, best_gain = (other, new_row, new_weight), gain
+            break  # candidates are sorted, the first one that fits is the best
+    return best
@@ -0,0 +1,58 @@
+"""Compare two benchmark result files written by benchmarks.suite.
+
+Prints the change of each benchmark/size pair and exits non-zero when any
+pair got slower by more than ``--threshold`` (default 10%).
+
+Run with ``python -m benchmarks.compare baseline.json candidate.json``.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+
+def load(path: str) -> Tuple[dict, Dict[Tuple[str, int], dict]]:
+    with open(path) as stream:
+        data = json.load(stream)
+    return data.get("meta", {}), {(r["benchmark"], r["employees"]): r for r in data["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="mean_ms", help="result field to compare (e.g. p50_ms, p95_ms)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    base_meta, baseline = load(args.baseline)
+    cand_meta, candidate = load(args.candidate)
+    print(f"baseline  {base_meta.get('commit')}  {base_meta.get('timestamp')}")
+    print(f"candidate {cand_meta.get('commit')}  {cand_meta.get('timestamp')}")
+    print(f"{'benchmark':30s} {'employees':>9s} {'baseline':>12s} {'candidate':>12s} {'change':>8s}")
+
+    regressions = 0
+    for key in sorted(baseline.keys() | candidate.keys()):
+        name, size = key
+        if key not in baseline or key not in candidate:
+            where = "baseline" if key in baseline else "candidate"
+            print(f"{name:30s} {size:>9d}   only in {where}")
+            continue
+        before, after = baseline[key][args.metric], candidate[key][args.metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:30s} {size:>9d} {before:12.3f} {after:12.3f} {change:+8.1%}{flag}")
+
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Stress test for concurrent dispatchers sharing one TaskAssignmentSystem.
+
+Several threads race to auto-assign and manually assign the same backlog
+while another thread adds employees and skills. Afterwards every
+invariant is checked: each task is assigned at most once, each assigned task
+appears in exactly its assignee's list, and no employee's workload exceeds
+its capacity or differs from the hours of its tasks.
+
+Run with ``python -m benchmarks.concurrency_stress``; exits non-zero on a
+violation.
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import threading
+import time
+
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+from task_assignment import TaskAssignmentSystem
+
+SKILL_NAMES = [f"Skill {i}" for i in range(20)]
+
+
+def build_system(employees: int, tasks: int, seed: int) -> TaskAssignmentSystem:
+    rng = random.Random(seed)
+    system = TaskAssignmentSystem()
+    for i in range(employees):
+        skills = [Skill(name, rng.choice(list(SkillLevel)), rng.uniform(0, 10))
+                  for name in rng.sample(SKILL_NAMES, 3)]
+        system.add_employee(Employee(f"E{i}", f"Employee {i}", skills, rng.choice([16.0, 24.0, 40.0])))
+    for i in range(tasks):
+        required = {name: rng.choice(list(SkillLevel)) for name in rng.sample(SKILL_NAMES, 2)}
+        system.add_task(Task(f"T{i}", f"Task {i}", required, rng.choice(list(TaskPriority)),
+                             rng.choice([4.0, 8.0, 12.0]), 7))
+    return system
+
+
+def widen_commit_window(system: TaskAssignmentSystem):
+    """Yield the GIL inside the capacity check that precedes every commit
+
+    Without this a thread switch rarely lands between check and update, and
+    a missing lock could go unnoticed.
+    """
+    def has_capacity(employee, task):
+        time.sleep(0)
+        return TaskAssignmentSystem._has_capacity(employee, task)
+    system._has_capacity = has_capacity
+
+
+def dispatcher(system: TaskAssignmentSystem, task_ids, seed: int, barrier: threading.Barrier):
+    rng = random.Random(seed)
+    employee_ids = list(system.employees)
+    barrier.wait()
+    # Every dispatcher walks the backlog in the same order so they collide on the same tasks
+    for task_id in task_ids:
+        if rng.random() < 0.3:
+            system.assign_task(task_id, rng.choice(employee_ids))
+        else:
+            system.assign_task(task_id)
+
+
+def roster_churn(system: TaskAssignmentSystem, seed: int, barrier: threading.Barrier, hires: int):
+    rng = random.Random(seed)
+    barrier.wait()
+    for i in range(hires):
+        system.add_employee(Employee(f"N{i}", f"New hire {i}",
+                                     [Skill(rng.choice(SKILL_NAMES), SkillLevel.ADVANCED, 3.0)], 8.0))
+        system.employees[f"E{rng.randrange(10)}"].add_skill(
+            Skill(rng.choice(SKILL_NAMES), rng.choice(list(SkillLevel)), 5.0))
+
+
+def check_invariants(system: TaskAssignmentSystem):
+    violations = []
+    owners = {}
+    for employee in list(system.employees.values()):
+        hours = 0.0
+        for task_id in employee.assigned_tasks:
+            if task_id in owners:
+                violations.append(f"{task_id} assigned to both {owners[task_id]} and {employee.emp_id}")
+            owners[task_id] = employee.emp_id
+            hours += system.tasks[task_id].estimated_hours
+        if employee.current_workload > employee.max_workload_hours:
+            violations.append(f"{employee.emp_id} overcommitted: "
+                              f"{employee.current_workload}/{employee.max_workload_hours}")
+        if abs(employee.current_workload - hours) > 1e-9:
+            violations.append(f"{employee.emp_id} workload {employee.current_workload} != task hours {hours}")
+    for task in system.tasks.values():
+        if task.assigned_to != owners.get(task.task_id):
+            violations.append(f"{task.task_id} assigned_to={task.assigned_to} but listed under "
+                              f"{owners.get(task.task_id)}")
+    return violations, len(owners)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--hires", type=int, default=100, help="employees added while dispatching")
+    args = parser.parse_args()
+
+    sys.setswitchinterval(1e-5)  # Switch threads as often as possible to provoke races
+    failed = False
+    for round_number in range(args.rounds):
+        system = build_system(args.employees, args.tasks, seed=round_number)
+        widen_commit_window(system)
+        task_ids = list(system.tasks)
+        barrier = threading.Barrier(args.threads + 1)
+        threads = [threading.Thread(target=dispatcher, args=(system, task_ids, seed, barrier))
+                   for seed in range(args.threads)]
+        churn = threading.Thread(target=roster_churn, args=(system, round_number, barrier, args.hires))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in threads + [churn]:
+                thread.start()
+            for thread in threads + [churn]:
+                thread.join()
+
+        violations, assigned = check_invariants(system)
+        print(f"round {round_number}: {args.threads} threads, {assigned}/{len(task_ids)} tasks assigned, "
+              f"{len(violations)} violations")
+        for violation in violations[:10]:
+            print(f"  {violation}")
+        failed = failed or bool(violations)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Seeded generators for realistic synthetic rosters and backlogs.
+
+Skill popularity follows a Zipf distribution (a few skills are held and
+requested by many, a long tail by few), levels and priorities are drawn from
+skewed categorical distributions, and capacities, workloads and performance
+ratings vary per employee. The same seed always produces the same data.
+"""
+import itertools
+import random
+from typing import Dict, List, Sequence
+
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+
+LEVEL_WEIGHTS = {SkillLevel.BEGINNER: 0.30, SkillLevel.INTERMEDIATE: 0.35,
+                 SkillLevel.ADVANCED: 0.25, SkillLevel.EXPERT: 0.10}
+PRIORITY_WEIGHTS = {TaskPriority.LOW: 0.30, TaskPriority.MEDIUM: 0.40,
+                    TaskPriority.HIGH: 0.20, TaskPriority.CRITICAL: 0.10}
+CAPACITY_WEIGHTS = {20.0: 0.15, 30.0: 0.15, 40.0: 0.55, 50.0: 0.15}
+HOURS_WEIGHTS = {2.0: 0.15, 4.0: 0.25, 8.0: 0.30, 12.0: 0.15, 16.0: 0.10, 24.0: 0.05}
+
+
+def skill_names(count: int) -> List[str]:
+    """Skill names ordered from most to least popular"""
+    return [f"Skill {rank:04d}" for rank in range(count)]
+
+
+def zipf_cumulative(count: int, exponent: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..count, for random.choices(cum_weights=...)"""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def _choice(rng: random.Random, weights: Dict) -> object:
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+def _distinct(rng: random.Random, names: Sequence[str], cum_weights: List[float], count: int) -> List[str]:
+    """Draw ``count`` distinct names with Zipf-weighted probability"""
+    chosen: Dict[str, None] = {}
+    while len(chosen) < min(count, len(names)):
+        for name in rng.choices(names, cum_weights=cum_weights, k=count - len(chosen)):
+            chosen[name] = None
+    return list(chosen)
+
+
+def generate_roster(count: int, seed: int = 0, skill_count: int = 500, exponent: float = 1.1,
+                    employee_class=Employee, loaded: bool = False) -> List[Employee]:
+    """``count`` employees with 2-8 Zipf-distributed skills each
+
+    With ``loaded`` employees start partly booked (0-75% of capacity).
+    """
+    rng = random.Random(seed)
+    names = skill_names(skill_count)
+    cum_weights = zipf_cumulative(skill_count, exponent)
+    employees = []
+    for i in range(count):
+        skills = [Skill(name, _choice(rng, LEVEL_WEIGHTS), round(rng.gammavariate(2.0, 2.0), 1))
+                  for name in _distinct(rng, names, cum_weights, rng.randint(2, 8))]
+        employee = employee_class(f"E{i:06d}", f"Employee {i}", skills, _choice(rng, CAPACITY_WEIGHTS))
+        employee.performance_rating = round(min(1.0, max(0.3, rng.gauss(0.8, 0.12))), 2)
+        if loaded:
+            employee.current_workload = float(int(employee.max_workload_hours * rng.uniform(0, 0.75)))
+        employees.append(employee)
+    return employees
+
+
+def generate_backlog(count: int, seed: int = 0, skill_count: int = 500, exponent: float = 1.1,
+                     task_class=Task) -> List[Task]:
+    """``count`` unassigned tasks requiring 1-4 Zipf-distributed skills each"""
+    rng = random.Random(seed + 1_000_003)  # Independent of the roster drawn from the same seed
+    names = skill_names(skill_count)
+    cum_weights = zipf_cumulative(skill_count, exponent)
+    return [task_class(f"T{i:06d}", f"Task {i}",
+                       {name: _choice(rng, LEVEL_WEIGHTS)
+                        for name in _distinct(rng, names, cum_weights, rng.randint(1, 4))},
+                       _choice(rng, PRIORITY_WEIGHTS), _choice(rng, HOURS_WEIGHTS), rng.randint(1, 30))
+            for i in range(count)]
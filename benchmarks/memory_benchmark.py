@@ -0,0 +1,64 @@
+"""Compare the memory footprint of the standard and compact model classes.
+
+Run with ``python -m benchmarks.memory_benchmark [--employees N] [--tasks N]``.
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from compact_models import CompactEmployee, CompactTask
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+
+SKILL_NAMES = [f"Skill {i}" for i in range(200)]
+
+
+def _build(employee_class, task_class, employees: int, tasks: int, seed: int):
+    rng = random.Random(seed)
+    levels = list(SkillLevel)
+    priorities = list(TaskPriority)
+    roster = []
+    for i in range(employees):
+        skills = [Skill(name, rng.choice(levels), round(rng.uniform(0, 12), 1))
+                  for name in rng.sample(SKILL_NAMES, 5)]
+        employee = employee_class(f"E{i:06d}", f"Employee {i}", skills, 40.0)
+        employee.performance_rating = rng.uniform(0.3, 1.0)
+        roster.append(employee)
+    backlog = [task_class(f"T{i:06d}", f"Task {i}",
+                          {name: rng.choice(levels) for name in rng.sample(SKILL_NAMES, 3)},
+                          rng.choice(priorities), 8.0, 7)
+               for i in range(tasks)]
+    return roster, backlog
+
+
+def measure(employee_class, task_class, employees: int, tasks: int, seed: int = 0) -> int:
+    """Bytes retained by a roster and backlog built with the given classes"""
+    gc.collect()
+    tracemalloc.start()
+    objects = _build(employee_class, task_class, employees, tasks, seed)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    args = parser.parse_args()
+
+    # Warm the shared vocabulary so both runs measure only per-object memory
+    measure(CompactEmployee, CompactTask, 1, 1)
+
+    standard = measure(Employee, Task, args.employees, args.tasks)
+    compact = measure(CompactEmployee, CompactTask, args.employees, args.tasks)
+    print(f"{args.employees} employees, {args.tasks} tasks (5 skills per employee, 3 per task)")
+    print(f"  standard: {standard / 2**20:8.1f} MiB ({standard / args.employees:6.0f} B/employee incl. tasks)")
+    print(f"  compact:  {compact / 2**20:8.1f} MiB ({compact / args.employees:6.0f} B/employee incl. tasks)")
+    print(f"  reduction: {1 - compact / standard:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Scaling of sharded process-pool scoring against the serial engine.
+
+Scores a batch of tasks against a synthetic roster serially and with
+1, 2, 4, ... workers (up to the CPU count), checks every parallel result is
+identical to the serial one, and prints the time and speedup per worker
+count.
+
+Run with ``python -m benchmarks.parallel_scaling --employees 200000``.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.generators import generate_backlog, generate_roster
+from task_assignment import TaskAssignmentSystem
+
+
+def build_system(employees: int, seed: int) -> TaskAssignmentSystem:
+    system = TaskAssignmentSystem()
+    for employee in generate_roster(employees, seed, loaded=True):
+        system.add_employee(employee)
+    return system
+
+
+def timed(function, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    system = build_system(args.employees, args.seed)
+    tasks = generate_backlog(args.tasks, args.seed)
+    system.get_scoring_engine()
+
+    serial_time, expected = timed(lambda: system.find_best_matches_batch(tasks, args.top_n), args.repeat)
+    print(f"{args.employees} employees, {args.tasks} tasks, top {args.top_n}")
+    print(f"serial      {serial_time:8.3f}s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        system.enable_parallel_scoring(workers)
+        system.find_best_matches_batch(tasks[:1], args.top_n)  # Start workers and attach
+        elapsed, result = timed(lambda: system.find_best_matches_batch(tasks, args.top_n), args.repeat)
+        system.disable_parallel_scoring()
+        if result != expected:
+            raise SystemExit(f"{workers} workers: results differ from the serial path")
+        print(f"{workers:2d} workers  {elapsed:8.3f}s  speedup {serial_time / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Assignment throughput of one organisation-wide system against partitions.
+
+Splits a synthetic roster and backlog into 1, 2, 4, ... equally sized
+departments and assigns the whole backlog with
+PartitionedAssignmentSystem.assign_many, borrowing across partitions when
+a department runs out of room. One partition is the plain
+TaskAssignmentSystem. Prints time, tasks/sec and how many tasks were
+assigned and borrowed per partition count.
+
+Run with ``python -m benchmarks.partition_scaling --employees 20000 --tasks 4000 --mode batch``.
+"""
+import argparse
+import time
+
+from benchmarks.generators import generate_backlog, generate_roster
+from partitioning import PartitionedAssignmentSystem
+
+
+def build_system(partitions: int, employees: int, tasks: int, seed: int) -> PartitionedAssignmentSystem:
+    system = PartitionedAssignmentSystem(verbose=False)
+    for i, employee in enumerate(generate_roster(employees, seed, loaded=True)):
+        system.add_employee(employee, f"dept-{i % partitions}")
+    for i, task in enumerate(generate_backlog(tasks, seed)):
+        system.add_task(task, f"dept-{i % partitions}")
+    return system
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5_000)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--max-partitions", type=int, default=16)
+    parser.add_argument("--mode", choices=("greedy", "batch", "deadline"), default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.employees} employees, {args.tasks} tasks, {args.mode}")
+    baseline = None
+    partitions = 1
+    while partitions <= args.max_partitions:
+        with build_system(partitions, args.employees, args.tasks, args.seed) as system:
+            start = time.perf_counter()
+            assignments = system.assign_many(mode=args.mode)
+            elapsed = time.perf_counter() - start
+            borrowed = len(system.borrowed)
+        baseline = baseline or elapsed
+        print(f"{partitions:3d} partitions  {elapsed:8.3f}s  {args.tasks / elapsed:9.0f} tasks/s  "
+              f"speedup {baseline / elapsed:5.2f}x  assigned {len(assignments)}  borrowed {borrowed}")
+        partitions *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Restart time of a journaled TaskAssignmentSystem.
+
+Builds a system on journal.JournalStorage from generated data, writes a
+snapshot, makes ``--tail`` more assignments so they have to be replayed,
+then times reopening the directory (snapshot load + journal replay) and
+constructing the system on it, averaged over ``--repeat`` restarts.
+
+Run with ``python -m benchmarks.recovery --employees 100000``.
+"""
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import tempfile
+import time
+
+from benchmarks.generators import generate_backlog, generate_roster
+from journal import JournalStorage
+from task_assignment import TaskAssignmentSystem
+
+
+def populate(directory: str, employees: int, tasks: int, tail: int, seed: int):
+    storage = JournalStorage(directory, snapshot_every=10 ** 12)  # Snapshot only where this script says
+    system = TaskAssignmentSystem(storage=storage)
+    backlog = list(generate_backlog(tasks + tail, seed))
+    with contextlib.redirect_stdout(io.StringIO()), storage.transaction():
+        for employee in generate_roster(employees, seed, loaded=True):
+            system.add_employee(employee)
+        for task in backlog:
+            system.add_task(task)
+        system.assign_batch([task.task_id for task in backlog[:tasks]])
+    storage.snapshot()
+    with contextlib.redirect_stdout(io.StringIO()):
+        system.assign_batch([task.task_id for task in backlog[tasks:]])
+    storage.close()
+
+
+def restart(directory: str) -> dict:
+    start = time.perf_counter()
+    storage = JournalStorage(directory)
+    recovered = time.perf_counter()
+    system = TaskAssignmentSystem(storage=storage)
+    ready = time.perf_counter()
+    replayed = storage.seq - storage.snapshot_seq
+    storage.close()
+    return {"recover_s": recovered - start, "system_s": ready - recovered, "total_s": ready - start,
+            "employees": len(system.employees), "replayed_records": replayed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=20_000, help="tasks in the snapshot")
+    parser.add_argument("--tail", type=int, default=1000, help="tasks added and assigned after the snapshot")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        populate(directory, args.employees, args.tasks, args.tail, args.seed)
+        runs = [restart(directory) for _ in range(args.repeat)]
+    result = {key: statistics.fmean(run[key] for run in runs) for key in ("recover_s", "system_s", "total_s")}
+    print(json.dumps({"employees": runs[0]["employees"], "replayed_records": runs[0]["replayed_records"],
+                      **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
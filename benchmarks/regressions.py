@@ -0,0 +1,354 @@
+"""Checks for bugs fixed after review.
+
+Each check replays the scenario that used to fail and verifies the
+outcome against a plain recomputation.
+
+Run with ``python -m benchmarks.regressions``; exits non-zero on a failure.
+"""
+import io
+import json
+import sys
+from typing import Callable, Dict, List
+
+import bulk_io
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+from task_assignment import TaskAssignmentSystem
+
+
+def check_rankings_after_requirement_change() -> List[str]:
+    """Reassigning required_skills must unindex the old skills (rankings.py _drop_slot)"""
+    system = TaskAssignmentSystem(verbose=False)
+    alice = Employee("E1", "Alice", [Skill("Go", SkillLevel.ADVANCED, 3.0)])
+    bob = Employee("E2", "Bob", [Skill("Rust", SkillLevel.EXPERT, 5.0)])
+    task = Task("T1", "Port service", {"Python": SkillLevel.INTERMEDIATE}, TaskPriority.HIGH, 8.0, 5)
+    other = Task("T2", "Review", {"Go": SkillLevel.BEGINNER}, TaskPriority.LOW, 4.0, 3)
+    for employee in (alice, bob):
+        system.add_employee(employee)
+    system.add_task(task)
+    system.add_task(other)
+    system.enable_candidate_rankings()
+
+    task.required_skills = {"Rust": SkillLevel.ADVANCED}
+    system.assign_task("T1", "E2")  # Frees T1's slot
+    bob.add_skill(Skill("Python", SkillLevel.EXPERT, 2.0))  # An old skill of T1
+    system.add_task(Task("T3", "Docs", {"Go": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 2.0, 2))
+    alice.add_skill(Skill("Python", SkillLevel.ADVANCED, 1.0))
+
+    errors = []
+    for open_task in (t for t in system.tasks.values() if not t.assigned_to):
+        served = system.find_best_matches(open_task, 2)
+        expected = system.find_best_matches_batch([open_task], 2)[0]
+        if served != expected:
+            errors.append(f"rankings for {open_task.task_id} differ from a full scan")
+    return errors
+
+
+def check_import_malformed_rows() -> List[str]:
+    """Wrongly typed skills must become row errors, not abort the import (bulk_io.py)"""
+    employees = [
+        {"emp_id": "E1", "name": "Alice", "skills": [{"name": "Python", "level": "EXPERT"}]},
+        {"emp_id": "E2", "name": "Bob", "skills": ["Python"]},
+        {"emp_id": "E3", "name": "Carol", "skills": [{"name": "Python", "level": 3}]},
+        {"emp_id": "E4", "name": "Dan", "skills": "SQL:ADVANCED:2"},
+    ]
+    tasks = [
+        {"task_id": "T1", "name": "Ok", "priority": "HIGH", "estimated_hours": 4, "deadline_days": 2,
+         "required_skills": {"Python": "ADVANCED"}},
+        {"task_id": "T2", "name": "Int level", "priority": "LOW", "estimated_hours": 4, "deadline_days": 2,
+         "required_skills": {"Python": 3}},
+        {"task_id": "T3", "name": "Null level", "priority": "LOW", "estimated_hours": 4, "deadline_days": 2,
+         "required_skills": {"Python": None}},
+        {"task_id": "T4", "name": "List", "priority": "LOW", "estimated_hours": 4, "deadline_days": 2,
+         "required_skills": ["Python"]},
+    ]
+    system = TaskAssignmentSystem(verbose=False)
+    errors = []
+    for importer, records, imported, failed in ((bulk_io.import_employees, employees, {"E1", "E4"}, [2, 3]),
+                                                (bulk_io.import_tasks, tasks, {"T1"}, [2, 3, 4])):
+        stream = io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+        report = importer(system, stream, "jsonl")
+        lines = [error.line for error in report.errors]
+        if lines != failed:
+            errors.append(f"{importer.__name__}: rows {lines} rejected, expected {failed}")
+        for key in imported:
+            if key not in system.employees and key not in system.tasks:
+                errors.append(f"{importer.__name__}: {key} was not imported")
+    for parse, value in ((bulk_io.parse_skills, ["Python"]), (bulk_io.parse_required_skills, {"Python": 3})):
+        try:
+            parse(value)
+            errors.append(f"{parse.__name__} accepted {value!r}")
+        except ValueError:
+            pass  # What service.py turns into a 400
+    return errors
+
+
+def check_batch_skips_replaced_records() -> List[str]:
+    """assign_batch must not apply a plan to tasks or employees replaced since scoring (task_assignment.py)"""
+    import batch_assignment
+
+    system = TaskAssignmentSystem(verbose=False)
+    for emp_id in ("E1", "E2"):
+        system.add_employee(Employee(emp_id, emp_id, [Skill("Python", SkillLevel.EXPERT, 4.0)]))
+    for task_id in ("T1", "T2"):
+        system.add_task(Task(task_id, task_id, {"Python": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 4.0, 3))
+
+    plan_batch_assignment = batch_assignment.plan_batch_assignment
+
+    def plan_then_replace(engine, tasks, candidates_per_task):
+        plan = plan_batch_assignment(engine, tasks, candidates_per_task)
+        # Another writer replaces one planned task and one planned employee
+        task, row = plan[0]
+        system.remove_task(task.task_id)
+        system.add_task(Task(task.task_id, "Replacement", {}, TaskPriority.LOW, 1.0, 1))
+        emp_id = engine.employees[plan[1][1]].emp_id
+        system.remove_employee(emp_id)
+        system.add_employee(Employee(emp_id, "Replacement", []))
+        return plan
+
+    batch_assignment.plan_batch_assignment = plan_then_replace
+    try:
+        assignments = system.assign_batch(["T1", "T2"])
+    finally:
+        batch_assignment.plan_batch_assignment = plan_batch_assignment
+
+    errors = []
+    for employee in system.employees.values():
+        for task_id in employee.assigned_tasks:
+            if system.tasks[task_id].assigned_to != employee.emp_id:
+                errors.append(f"{employee.emp_id} holds {task_id}, which is assigned to "
+                              f"{system.tasks[task_id].assigned_to!r}")
+        if employee.name == "Replacement" and employee.current_workload:
+            errors.append(f"replacement {employee.emp_id} got work planned for the employee it replaced")
+    if assignments:
+        errors.append(f"stale pairs applied: {assignments}")
+    return errors
+
+
+def check_completion_releases_clamped_hours() -> List[str]:
+    """Completing a task must take only the hours actually released off the dashboard (try_complete)"""
+    from aggregates import DashboardAggregates
+
+    system = TaskAssignmentSystem(verbose=False)
+    employee = Employee("E1", "Alice", [Skill("Python", SkillLevel.EXPERT, 4.0)], max_workload_hours=40.0)
+    system.add_employee(employee)
+    system.add_employee(Employee("E2", "Bob", [], max_workload_hours=40.0))
+    system.add_task(Task("T1", "Big", {"Python": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 10.0, 3))
+    system.assign_task("T1", "E1")
+    employee.current_workload = 4.0  # Edited down below the task's estimate
+    aggregates = system.get_dashboard_aggregates()
+    system.complete_task("T1")  # Releases 4 hours, not 10
+
+    recomputed = DashboardAggregates()
+    recomputed.rebuild(system.employees.values(), system.tasks.values())
+    if abs(aggregates.total_workload - recomputed.total_workload) > 1e-9:
+        return [f"dashboard workload {aggregates.total_workload:g}h after completion, "
+                f"{recomputed.total_workload:g}h recomputed"]
+    return []
+
+
+def check_service_unknown_paths() -> List[str]:
+    """Unknown paths are 404s, wrong methods 405s and non-string employee IDs 400s (service.py)"""
+    import asyncio
+
+    from service import AssignmentService, HTTPError
+
+    system = TaskAssignmentSystem(verbose=False)
+    system.add_employee(Employee("E1", "Alice", [Skill("Python", SkillLevel.EXPERT, 4.0)]))
+    system.add_task(Task("T1", "Ok", {"Python": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 4.0, 3))
+    service = AssignmentService(system)
+    cases = [("GET", "/tasks/T1/foo", 404), ("POST", "/tasks/T1/schedule", 404),
+             ("GET", "/employees/E1/foo", 404), ("GET", "/tasks/T1/assign/x", 404), ("GET", "/", 404),
+             ("GET", "/tasks/T1/assign", 405), ("POST", "/employees/E1/schedule", 405),
+             ("POST", "/health", 405), ("PATCH", "/tasks/T1", 405),
+             ("GET", "/employees/E1/schedule", 200), ("GET", "/tasks/T1/recommendations", 200),
+             ("POST", "/tasks/T1/assign", 400, {"employee_id": 1}),
+             ("POST", "/tasks/T1/assign", 404, {"employee_id": "E9"}),
+             ("POST", "/tasks/T1/assign", 200, {"employee_id": "E1"})]
+
+    async def status(method, path, body=None):
+        try:
+            return (await service.dispatch(method, path, json.dumps(body).encode() if body else b""))[0]
+        except HTTPError as error:
+            return error.status
+
+    errors = []
+    for method, path, expected, *body in cases:
+        got = asyncio.run(status(method, path, *body))
+        if got != expected:
+            errors.append(f"{method} {path} {body[0] if body else ''}: {got}, expected {expected}")
+    return errors
+
+
+def check_import_round_trip_keeps_assignments() -> List[str]:
+    """Re-importing an export keeps assignments and rejects IDs already present (bulk_io.py)"""
+    source = TaskAssignmentSystem(verbose=False)
+    source.add_employee(Employee("E1", "Alice", [Skill("Python", SkillLevel.EXPERT, 4.0)]))
+    source.add_employee(Employee("E2", "Bob", [Skill("Python", SkillLevel.ADVANCED, 2.0)]))
+    for task_id in ("T1", "T2", "T3"):
+        source.add_task(Task(task_id, task_id, {"Python": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 6.0, 3))
+    source.assign_task("T1", "E1")
+    source.assign_task("T2", "E1")
+    source.complete_task("T2")
+
+    errors = []
+    for fmt in ("csv", "jsonl"):
+        employees, tasks = io.StringIO(), io.StringIO()
+        bulk_io.export_employees(source.employees.values(), employees, fmt)
+        bulk_io.export_tasks(source.tasks.values(), tasks, fmt)
+        system = TaskAssignmentSystem(verbose=False)
+        bulk_io.import_employees(system, io.StringIO(employees.getvalue()), fmt)
+        bulk_io.import_tasks(system, io.StringIO(tasks.getvalue()), fmt)
+        state = {task_id: (task.assigned_to, task.is_completed) for task_id, task in system.tasks.items()}
+        if state != {"T1": ("E1", False), "T2": ("E1", True), "T3": (None, False)}:
+            errors.append(f"{fmt}: tasks came back as {state}")
+        alice = system.employees["E1"]
+        if alice.assigned_tasks != ["T1"] or alice.current_workload != 6.0:
+            errors.append(f"{fmt}: E1 has {alice.assigned_tasks}, {alice.current_workload}h")
+        if system.assign_task("T1", "E2"):
+            errors.append(f"{fmt}: the re-imported T1 could be assigned again")
+
+        report = bulk_io.import_tasks(system, io.StringIO(tasks.getvalue()), fmt)
+        if report.imported or report.failed != 3:
+            errors.append(f"{fmt}: re-importing tasks imported {report.imported}, rejected {report.failed}")
+        report = bulk_io.import_employees(system, io.StringIO(employees.getvalue()), fmt)
+        if report.imported or system.employees["E1"] is not alice:
+            errors.append(f"{fmt}: re-importing employees replaced existing ones")
+
+    orphan = io.StringIO(json.dumps({"task_id": "T9", "name": "Orphan", "priority": "LOW", "estimated_hours": 1,
+                                     "deadline_days": 1, "assigned_to": "E9"}) + "\n")
+    report = bulk_io.import_tasks(TaskAssignmentSystem(verbose=False), orphan, "jsonl")
+    if report.imported or [error.line for error in report.errors] != [1]:
+        errors.append("a task assigned to an unknown employee was imported")
+    return errors
+
+
+def check_replaced_employee_recovers_alike() -> List[str]:
+    """Every backend must reopen a replaced employee without the old record's assignments (storage.py)"""
+    import tempfile
+
+    from journal import JournalStorage
+    from storage import SQLiteStorage
+
+    errors = []
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {"memory": None,
+                    "sqlite": lambda: SQLiteStorage(f"{directory}/tasks.db"),
+                    "journal": lambda: JournalStorage(f"{directory}/journal")}
+        recovered = {}
+        for name, make in backends.items():
+            system = TaskAssignmentSystem(storage=make() if make else None, verbose=False)
+            system.add_employee(Employee("E1", "Alice", [Skill("Python", SkillLevel.EXPERT, 4.0)]))
+            system.add_task(Task("T1", "Open", {"Python": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 6.0, 3))
+            system.assign_task("T1", "E1")
+            system.add_employee(Employee("E1", "Alice again", [Skill("Go", SkillLevel.ADVANCED, 1.0)]))
+            if make is not None:
+                system.storage.close()
+                system = TaskAssignmentSystem(storage=make(), verbose=False)
+            recovered[name] = list(system.employees["E1"].assigned_tasks)
+            system.storage.close()
+        if len({tuple(tasks) for tasks in recovered.values()}) > 1:
+            errors.append(f"assigned_tasks of the replaced employee differ: {recovered}")
+    return errors
+
+
+def check_snapshot_recommendations_follow_weights() -> List[str]:
+    """Cached snapshot recommendations must not survive a weight change (snapshots.py)"""
+    system = TaskAssignmentSystem(verbose=False)
+    system.add_employee(Employee("E1", "Skilled", [Skill("Python", SkillLevel.EXPERT, 8.0)]))
+    system.add_employee(Employee("E2", "Idle", [Skill("Python", SkillLevel.BEGINNER, 0.5)]))
+    system.employees["E1"].current_workload = 36.0
+    system.add_task(Task("T1", "Port", {"Python": SkillLevel.ADVANCED}, TaskPriority.MEDIUM, 2.0, 3))
+    snapshot = system.snapshot()
+    snapshot.recommendations("T1", 1)  # Cached with the default weights
+    system.assignment_weights.update({'skill_match': 0.0, 'availability': 1.0, 'experience': 0.0,
+                                      'performance': 0.0, 'priority_match': 0.0})
+    served = [employee.emp_id for employee, _ in snapshot.recommendations("T1", 1)]
+    expected = [employee.emp_id for employee, _ in snapshot.find_best_matches(snapshot.tasks["T1"], 1)]
+    if served != expected:
+        return [f"after a weight change served {served}, expected {expected}"]
+    return []
+
+
+def check_sqlite_match_loads_only_candidates() -> List[str]:
+    """A first match on SQLite must not load the whole roster (capacity index, uncovered scan)"""
+    import tempfile
+
+    from storage import SQLiteStorage
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/tasks.db"
+        system = TaskAssignmentSystem(storage=SQLiteStorage(path), verbose=False)
+        with system.storage.transaction():
+            for i in range(300):
+                skills = [Skill("Rust" if i % 30 == 0 else "Go", SkillLevel.EXPERT, 5.0)]
+                system.add_employee(Employee(f"E{i}", f"Employee {i}", skills))
+            system.add_task(Task("T1", "Port", {"Rust": SkillLevel.ADVANCED}, TaskPriority.HIGH, 4.0, 3))
+        system.storage.close()
+
+        system = TaskAssignmentSystem(storage=SQLiteStorage(path), verbose=False)
+        matches = system.find_best_matches(system.tasks["T1"], 3)
+        loaded = len(system.storage.employees._loaded)
+        system.storage.close()
+    if len(matches) != 3 or loaded != 10:
+        return [f"{loaded} of 300 employees loaded for 10 skill holders, {len(matches)} matches"]
+    return []
+
+
+def check_compact_scoring_builds_no_skills() -> List[str]:
+    """Scoring a CompactEmployee must read its skill arrays, not build Skill objects (compact_models.py)"""
+    import compact_models
+
+    system = TaskAssignmentSystem(verbose=False, cache_size=0)
+    skills = [Skill("Python", SkillLevel.EXPERT, 4.0), Skill("SQL", SkillLevel.BEGINNER, 1.0)]
+    employee = compact_models.CompactEmployee("E1", "Alice", skills)
+    system.add_employee(employee)
+    task = Task("T1", "Report", {"Python": SkillLevel.ADVANCED, "SQL": SkillLevel.INTERMEDIATE,
+                                 "Go": SkillLevel.BEGINNER}, TaskPriority.MEDIUM, 4.0, 3)
+    system.add_task(task)
+    expected = system.calculate_assignment_probability(Employee("E1", "Alice", skills), task)
+
+    built = []
+    skill_class = compact_models.Skill
+    compact_models.Skill = lambda *args: built.append(args) or skill_class(*args)
+    try:
+        probability = system.calculate_assignment_probability(employee, task)
+    finally:
+        compact_models.Skill = skill_class
+    errors = []
+    if built:
+        errors.append(f"{len(built)} Skill objects built while scoring")
+    if probability != expected:
+        errors.append(f"compact score {probability} differs from {expected}")
+    return errors
+
+
+CHECKS: Dict[str, Callable[[], List[str]]] = {
+    "rankings_after_requirement_change": check_rankings_after_requirement_change,
+    "import_malformed_rows": check_import_malformed_rows,
+    "import_round_trip_keeps_assignments": check_import_round_trip_keeps_assignments,
+    "replaced_employee_recovers_alike": check_replaced_employee_recovers_alike,
+    "sqlite_match_loads_only_candidates": check_sqlite_match_loads_only_candidates,
+    "batch_skips_replaced_records": check_batch_skips_replaced_records,
+    "compact_scoring_builds_no_skills": check_compact_scoring_builds_no_skills,
+    "completion_releases_clamped_hours": check_completion_releases_clamped_hours,
+    "snapshot_recommendations_follow_weights": check_snapshot_recommendations_follow_weights,
+    "service_unknown_paths": check_service_unknown_paths,
+}
+
+
+def main():
+    failed = False
+    for name, check in CHECKS.items():
+        try:
+            errors = check()
+        except Exception as exc:  # A crash is what most of these used to do
+            errors = [f"{type(exc).__name__}: {exc}"]
+        print(f"{name:40s} {'FAIL' if errors else 'ok'}")
+        for error in errors:
+            print(f"    {error}")
+        failed |= bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Load generator for service.py.
+
+Opens ``--concurrency`` keep-alive connections and fires recommendation
+requests for random tasks for ``--duration`` seconds, then reports
+requests/sec and p50/p99 latency, plus the service's mean batch size.
+
+By default a service is started in a subprocess on a synthetic roster;
+pass ``--port`` of an already running service with ``--no-spawn`` to
+measure that instead. Compare ``--max-batch 1`` (no coalescing) against the
+default to see what micro-batching buys.
+
+Run with ``python -m benchmarks.service_load``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import bulk_io
+from benchmarks.generators import generate_backlog, generate_roster
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_dataset(directory: str, employees: int, tasks: int, seed: int) -> Tuple[str, str]:
+    employee_path = os.path.join(directory, "employees.jsonl")
+    task_path = os.path.join(directory, "tasks.jsonl")
+    with open(employee_path, "w") as stream:
+        bulk_io.export_employees(generate_roster(employees, seed), stream, "jsonl")
+    with open(task_path, "w") as stream:
+        bulk_io.export_tasks(generate_backlog(tasks, seed), stream, "jsonl")
+    return employee_path, task_path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def wait_until_ready(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError("service did not start")
+            await asyncio.sleep(0.1)
+            continue
+        await request(reader, writer, "GET", "/health")
+        writer.close()
+        return
+
+
+async def client(port: int, task_ids: List[str], top_n: int, stop_at: float, seed: int,
+                 latencies: List[float], errors: List[int]):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.monotonic() < stop_at:
+            path = f"/tasks/{rng.choice(task_ids)}/recommendations?top_n={top_n}"
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "GET", path)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(args: argparse.Namespace, port: int, task_ids: List[str]) -> dict:
+    latencies: List[float] = []
+    errors: List[int] = []
+    started = time.monotonic()
+    stop_at = started + args.duration
+    await asyncio.gather(*(client(port, task_ids, args.top_n, stop_at, args.seed + i, latencies, errors)
+                           for i in range(args.concurrency)))
+    elapsed = time.monotonic() - started
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, stats = await request(reader, writer, "GET", "/stats")
+    writer.close()
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "mean_batch_size": stats["mean_batch_size"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--batch-window", type=float, default=0.002)
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--no-spawn", action="store_true", help="load an already running service on --port")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.no_spawn:
+        if args.port is None:
+            parser.error("--no-spawn needs --port")
+        task_ids = [f"T{i:06d}" for i in range(args.tasks)]
+        print(json.dumps(asyncio.run(run_load(args, args.port, task_ids)), indent=2))
+        return
+
+    port = args.port or free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        employee_path, task_path = write_dataset(directory, args.employees, args.tasks, args.seed)
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "service.py"), "--port", str(port),
+             "--employees", employee_path, "--tasks", task_path,
+             "--max-batch", str(args.max_batch), "--batch-window", str(args.batch_window)],
+            stdout=subprocess.DEVNULL)
+        try:
+            asyncio.run(wait_until_ready(port))
+            task_ids = [f"T{i:06d}" for i in range(args.tasks)]
+            result = asyncio.run(run_load(args, port, task_ids))
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps({"employees": args.employees, "concurrency": args.concurrency,
+                      "max_batch": args.max_batch, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Performance benchmarks for TaskAssignmentSystem.
+
+For each roster size, times on generated data (see generators.py):
+
+    find_best_matches             scalar path, one call per sampled task
+    find_best_matches_vectorized  NumPy engine path, same tasks
+    assign_task_auto              sequential auto-assignment of sampled tasks
+    assign_all                    whole backlog as one batch
+    dashboard_aggregates          the aggregation loops the app's Dashboard page used to run
+    dashboard_snapshot            the incrementally maintained figures it reads now
+    read_snapshot                 copy-on-write snapshot taken after each of a series of assignments
+
+Results go to a JSON file that benchmarks.compare can diff against another
+run, e.g. one from the previous commit.
+
+Run with ``python -m benchmarks.suite --sizes 1000 10000 100000 --output results.json``.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.generators import generate_backlog, generate_roster
+from task_assignment import TaskAssignmentSystem
+
+
+def build_system(employees: int, tasks: int, seed: int) -> TaskAssignmentSystem:
+    system = TaskAssignmentSystem()
+    for employee in generate_roster(employees, seed, loaded=True):
+        system.add_employee(employee)
+    for task in generate_backlog(tasks, seed):
+        system.add_task(task)
+    return system
+
+
+def dashboard_aggregates(system: TaskAssignmentSystem) -> dict:
+    """The per-rerun loops the Dashboard page in app.py ran before aggregates.py, without the rendering"""
+    assigned_tasks = sum(1 for task in system.tasks.values() if task.assigned_to)
+    workload_data = []
+    for emp in system.employees.values():
+        utilization = (emp.current_workload / emp.max_workload_hours) * 100 if emp.max_workload_hours > 0 else 0
+        workload_data.append({"Employee": emp.name, "Current Workload": emp.current_workload,
+                              "Max Workload": emp.max_workload_hours, "Utilization %": utilization})
+    skill_counts = {}
+    for emp in system.employees.values():
+        for skill in emp.skills.values():
+            skill_counts[skill.name] = skill_counts.get(skill.name, 0) + 1
+    priority_counts = {}
+    for task in system.tasks.values():
+        priority_counts[task.priority.name] = priority_counts.get(task.priority.name, 0) + 1
+    recent = [(task.task_id, task.name, task.priority.name, task.assigned_to or "Unassigned")
+              for task in list(system.tasks.values())[-10:]]
+    return {"assigned": assigned_tasks, "workload": workload_data, "skills": skill_counts,
+            "priorities": priority_counts, "recent": recent}
+
+
+def timed_calls(function: Callable[[object], object], items) -> List[float]:
+    durations = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for item in items:
+            start = time.perf_counter()
+            function(item)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def bench_find_best_matches(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    tasks = list(system.tasks.values())[:args.samples]
+    return timed_calls(lambda task: system.find_best_matches(task, args.top_n), tasks)
+
+
+def bench_find_best_matches_vectorized(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    tasks = list(system.tasks.values())[:args.samples]
+    system.get_scoring_engine()  # Encoding the roster is a one-off cost, not per call
+    return timed_calls(lambda task: system.find_best_matches(task, args.top_n, vectorized=True), tasks)
+
+
+def bench_assign_task_auto(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    task_ids = list(system.tasks)[:args.samples]
+    return timed_calls(system.assign_task, task_ids)
+
+
+def bench_assign_all(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    return timed_calls(lambda _: system.assign_all(), [None])
+
+
+def bench_dashboard_aggregates(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    return timed_calls(lambda _: dashboard_aggregates(system), range(args.repeat))
+
+
+def bench_dashboard_snapshot(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    aggregates = system.get_dashboard_aggregates()
+    return timed_calls(lambda _: aggregates.snapshot(), range(args.repeat))
+
+
+def bench_read_snapshot(args, size: int) -> List[float]:
+    system = build_system(size, args.tasks_per_size(size), args.seed)
+    system.snapshot()  # The first snapshot copies every record once
+    durations = []
+    for task_id in list(system.tasks)[:args.samples]:
+        system.try_assign(task_id)
+        start = time.perf_counter()
+        system.snapshot()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "find_best_matches": bench_find_best_matches,
+    "find_best_matches_vectorized": bench_find_best_matches_vectorized,
+    "assign_task_auto": bench_assign_task_auto,
+    "assign_all": bench_assign_all,
+    "dashboard_aggregates": bench_dashboard_aggregates,
+    "dashboard_snapshot": bench_dashboard_snapshot,
+    "read_snapshot": bench_read_snapshot,
+}
+
+
+def summarize(durations: List[float]) -> dict:
+    ordered = sorted(durations)
+    return {
+        "runs": len(ordered),
+        "total_s": sum(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "samples": args.samples,
+        "task_ratio": args.task_ratio,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time TaskAssignmentSystem hot paths on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000],
+                        help="roster sizes to benchmark")
+    parser.add_argument("--task-ratio", type=float, default=0.2, help="backlog size as a fraction of the roster")
+    parser.add_argument("--samples", type=int, default=100,
+                        help="tasks timed by the per-call benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of whole-system benchmarks")
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+    args.tasks_per_size = lambda size: max(1, int(size * args.task_ratio))
+
+    results = []
+    for size in args.sizes:
+        for name in args.only or BENCHMARKS:
+            durations = BENCHMARKS[name](args, size)
+            record = {"benchmark": name, "employees": size, "tasks": args.tasks_per_size(size),
+                      **summarize(durations)}
+            results.append(record)
+            print(f"{name:30s} {size:>8d} employees  mean {record['mean_ms']:10.3f} ms  "
+                  f"p95 {record['p95_ms']:10.3f} ms  ({record['runs']} runs)")
+
+    with open(args.output, "w") as stream:
+        json.dump({"meta": metadata(args), "results": results}, stream, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Time a what-if sweep of assignment_weights against the per-vector loop it replaces.
+
+Builds the component tensor for ``--tasks`` unassigned tasks once, then
+evaluates ``--vectors`` random weight vectors in both modes. For
+comparison, times setting assignment_weights and calling
+find_best_matches(task, 1) for every task, for ``--baseline`` vectors, and
+checks those top choices agree with the independent sweep.
+
+Run with ``python -m benchmarks.weight_sweep --employees 10000 --vectors 200``.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+
+from benchmarks.generators import generate_backlog, generate_roster
+from task_assignment import TaskAssignmentSystem
+from what_if import COMPONENTS, ComponentTensor, sweep
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--vectors", type=int, default=200)
+    parser.add_argument("--baseline", type=int, default=2, help="vectors timed with the find_best_matches loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    system = TaskAssignmentSystem()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for employee in generate_roster(args.employees, args.seed, loaded=True):
+            system.add_employee(employee)
+        for task in generate_backlog(args.tasks, args.seed):
+            system.add_task(task)
+    tasks = list(system.tasks.values())
+    rng = random.Random(args.seed)
+    vectors = [dict(zip(COMPONENTS, (rng.random() for _ in COMPONENTS))) for _ in range(args.vectors)]
+
+    start = time.perf_counter()
+    tensor = ComponentTensor(system.get_scoring_engine(), tasks)
+    built = time.perf_counter()
+    independent = sweep(tensor, vectors, sequential=False)
+    independent_done = time.perf_counter()
+    sequential = sweep(tensor, vectors)
+    sequential_done = time.perf_counter()
+
+    original = dict(system.assignment_weights)
+    baseline = min(args.baseline, args.vectors)
+    mismatches = 0
+    loop_start = time.perf_counter()
+    for i in range(baseline):
+        system.assignment_weights.update(vectors[i])
+        choices = independent.top_choices(i)
+        for task in tasks:
+            matches = system.find_best_matches(task, 1)
+            mismatches += choices[task.task_id] != (matches[0][0].emp_id if matches else None)
+    loop_s = (time.perf_counter() - loop_start) / max(1, baseline)
+    system.assignment_weights.update(original)
+
+    best = sequential.best()
+    print(json.dumps({
+        "employees": args.employees, "tasks": len(tasks), "vectors": args.vectors,
+        "tensor_s": round(built - start, 3),
+        "independent_sweep_s": round(independent_done - built, 3),
+        "sequential_sweep_s": round(sequential_done - independent_done, 3),
+        "loop_s_per_vector": round(loop_s, 3),
+        "loop_s_all_vectors_estimate": round(loop_s * args.vectors, 1),
+        "baseline_mismatches": int(mismatches),
+        "best_sequential": sequential.records()[best],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Streaming CSV / JSONL import and export of employees and tasks.
+
+Rows are parsed lazily and handed to the system in fixed-size chunks, so
+memory stays bounded no matter how large the file is. Bad rows are reported
+with their line number instead of aborting the import.
+
+CSV columns:
+    employees: emp_id, name, max_workload_hours, performance_rating,
+               current_workload, skills ("Python:EXPERT:5.0;SQL:ADVANCED:2")
+    tasks:     task_id, name, priority, estimated_hours, deadline_days,
+               required_skills ("Python:ADVANCED;React:INTERMEDIATE")
+
+JSONL records use the same field names, with ``skills`` as a list of
+{"name", "level", "experience_years"} objects and ``required_skills`` as a
+{name: level} object. Optional numeric fields fall back to the model
+defaults.
+
+Exports round-trip: tasks keep ``assigned_to`` and ``is_completed``, and an
+open task goes back on its assignee's assigned_tasks without adding its
+hours again (they are in the employee's ``current_workload``). Import the
+employees first; a task assigned to an unknown employee, and any ID that is
+already in the system, is reported as a bad row.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+
+EMPLOYEE_FIELDS = ["emp_id", "name", "max_workload_hours", "performance_rating", "current_workload", "skills"]
+TASK_FIELDS = ["task_id", "name", "priority", "estimated_hours", "deadline_days", "required_skills",
+               "assigned_to", "is_completed"]
+
+
+@dataclass
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)  # First max_errors failures only
+
+    def record_error(self, line: int, message: str, max_errors: int):
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append(RowError(line, message))
+
+
+def detect_format(filename: str) -> str:
+    """Return 'csv' or 'jsonl' based on a file name"""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type: {filename}")
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, record) pairs; JSONL lines that fail to parse yield the exception"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as error:
+                yield line_number, error
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def _number(record: dict, key: str, default: Optional[float], cast=float):
+    value = record.get(key)
+    if value is None or value == "":
+        if default is None:
+            raise ValueError(f"missing {key}")
+        return default
+    return cast(value)
+
+
+def _required(record: dict, key: str) -> str:
+    value = record.get(key)
+    if value is None or str(value).strip() == "":
+        raise ValueError(f"missing {key}")
+    return str(value).strip()
+
+
+def _level(name: str) -> SkillLevel:
+    if not isinstance(name, str):
+        raise ValueError(f"skill level must be a string, not {name!r}")
+    try:
+        return SkillLevel[name.strip().upper()]
+    except KeyError:
+        raise ValueError(f"unknown skill level {name!r}") from None
+
+
+def _skill_object(item) -> Skill:
+    if not isinstance(item, dict):
+        raise ValueError(f"bad skill entry {item!r}: expected an object")
+    return Skill(_required(item, "name"), _level(_required(item, "level")),
+                 _number(item, "experience_years", 0.0))
+
+
+def parse_skills(value) -> List[Skill]:
+    """Parse a 'name:LEVEL:years;...' string or a list of skill objects"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [_skill_object(item) for item in value]
+    skills = []
+    for part in str(value).split(";"):
+        if not part.strip():
+            continue
+        pieces = part.split(":")
+        if len(pieces) not in (2, 3):
+            raise ValueError(f"bad skill entry {part!r}")
+        years = float(pieces[2]) if len(pieces) == 3 and pieces[2].strip() else 0.0
+        skills.append(Skill(pieces[0].strip(), _level(pieces[1]), years))
+    return skills
+
+
+def parse_required_skills(value) -> Dict[str, SkillLevel]:
+    """Parse a 'name:LEVEL;...' string or a {name: level} object"""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {name: _level(level) for name, level in value.items()}
+    required = {}
+    for part in str(value).split(";"):
+        if not part.strip():
+            continue
+        name, sep, level = part.partition(":")
+        if not sep:
+            raise ValueError(f"bad required skill entry {part!r}")
+        required[name.strip()] = _level(level)
+    return required
+
+
+def _flag(record: dict, key: str) -> bool:
+    value = record.get(key)
+    if isinstance(value, bool):
+        return value
+    text = "" if value is None else str(value).strip().lower()
+    if text in ("", "0", "false", "no"):
+        return False
+    if text in ("1", "true", "yes"):
+        return True
+    raise ValueError(f"bad {key} {value!r}")
+
+
+def parse_employee(record: dict, employee_class=Employee) -> Employee:
+    employee = employee_class(_required(record, "emp_id"), _required(record, "name"),
+                              parse_skills(record.get("skills")),
+                              _number(record, "max_workload_hours", 40.0))
+    employee.performance_rating = _number(record, "performance_rating", 1.0)
+    employee.current_workload = _number(record, "current_workload", 0.0)
+    return employee
+
+
+def parse_task(record: dict, task_class=Task, with_state: bool = False) -> Task:
+    """Parse a task record; ``with_state`` also reads assigned_to and is_completed"""
+    priority = _required(record, "priority").upper()
+    if priority not in TaskPriority.__members__:
+        raise ValueError(f"unknown priority {priority!r}")
+    task = task_class(_required(record, "task_id"), _required(record, "name"),
+                      parse_required_skills(record.get("required_skills")),
+                      TaskPriority[priority],
+                      _number(record, "estimated_hours", None),
+                      _number(record, "deadline_days", None, int))
+    if with_state:
+        task.assigned_to = str(record.get("assigned_to") or "").strip() or None
+        task.is_completed = _flag(record, "is_completed")
+    return task
+
+
+def iter_chunks(stream: TextIO, fmt: str, parse: Callable[[dict], object], report: ImportReport,
+                chunk_size: int = 1000, max_errors: int = 100) -> Iterator[List[object]]:
+    """Parse records lazily and yield (line number, object) lists of at most ``chunk_size``"""
+    chunk = []
+    for line_number, record in iter_records(stream, fmt):
+        try:
+            if isinstance(record, Exception):
+                raise ValueError(f"invalid JSON: {record}")
+            if not isinstance(record, dict):
+                raise ValueError("record is not an object")
+            chunk.append((line_number, parse(record)))
+        except (ValueError, TypeError, KeyError) as error:
+            report.record_error(line_number, str(error), max_errors)
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _import(add: Callable[[object], None], system, stream: TextIO, fmt: str,
+            parse: Callable[[dict], object], chunk_size: int, max_errors: int,
+            on_chunk: Optional[Callable[[ImportReport], None]]) -> ImportReport:
+    """``add`` raises ValueError to reject a row"""
+    report = ImportReport()
+    for chunk in iter_chunks(stream, fmt, parse, report, chunk_size, max_errors):
+        with system.storage.transaction():
+            for line_number, item in chunk:
+                try:
+                    add(item)
+                except ValueError as error:
+                    report.record_error(line_number, str(error), max_errors)
+                    continue
+                report.imported += 1
+        if on_chunk is not None:
+            on_chunk(report)
+    return report
+
+
+def _add_new_employee(system, employee: Employee):
+    # Replacing would drop the existing employee's assignments
+    with system._write_lock:
+        if employee.emp_id in system.employees:
+            raise ValueError(f"employee {employee.emp_id} already exists")
+        system.add_employee(employee)
+
+
+def _add_new_task(system, task: Task):
+    # Replacing would leave an assigned task's hours on its old assignee
+    with system._write_lock:
+        if task.task_id in system.tasks:
+            raise ValueError(f"task {task.task_id} already exists")
+        system.restore_task(task)
+
+
+def import_employees(system, stream: TextIO, fmt: str = "csv", chunk_size: int = 1000,
+                     max_errors: int = 100,
+                     on_chunk: Optional[Callable[[ImportReport], None]] = None,
+                     employee_class=Employee) -> ImportReport:
+    """Stream employees from ``stream`` into ``system``, one transaction per chunk
+
+    Pass ``employee_class=compact_models.CompactEmployee`` for large rosters.
+    """
+    return _import(partial(_add_new_employee, system), system, stream, fmt,
+                   partial(parse_employee, employee_class=employee_class),
+                   chunk_size, max_errors, on_chunk)
+
+
+def import_tasks(system, stream: TextIO, fmt: str = "csv", chunk_size: int = 1000,
+                 max_errors: int = 100,
+                 on_chunk: Optional[Callable[[ImportReport], None]] = None,
+                 task_class=Task) -> ImportReport:
+    """Stream tasks from ``stream`` into ``system``, one transaction per chunk"""
+    return _import(partial(_add_new_task, system), system, stream, fmt,
+                   partial(parse_task, task_class=task_class, with_state=True),
+                   chunk_size, max_errors, on_chunk)
+
+
+def employee_record(employee: Employee, fmt: str) -> dict:
+    skills = list(employee.skills.values())
+    return {
+        "emp_id": employee.emp_id,
+        "name": employee.name,
+        "max_workload_hours": employee.max_workload_hours,
+        "performance_rating": employee.performance_rating,
+        "current_workload": employee.current_workload,
+        "skills": (";".join(f"{s.name}:{s.level.name}:{s.experience_years}" for s in skills) if fmt == "csv"
+                   else [{"name": s.name, "level": s.level.name, "experience_years": s.experience_years}
+                         for s in skills]),
+    }
+
+
+def task_record(task: Task, fmt: str) -> dict:
+    return {
+        "task_id": task.task_id,
+        "name": task.name,
+        "priority": task.priority.name,
+        "estimated_hours": task.estimated_hours,
+        "deadline_days": task.deadline_days,
+        "required_skills": (";".join(f"{name}:{level.name}" for name, level in task.required_skills.items())
+                            if fmt == "csv" else
+                            {name: level.name for name, level in task.required_skills.items()}),
+        "assigned_to": task.assigned_to or "",
+        "is_completed": task.is_completed,
+    }
+
+
+def _export(records: Iterable[dict], stream: TextIO, fmt: str, fieldnames: List[str]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fieldnames)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    elif fmt == "jsonl":
+        for record in records:
+            stream.write(json.dumps(record) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return count
+
+
+def export_employees(employees: Iterable[Employee], stream: TextIO, fmt: str = "csv") -> int:
+    """Write employees to ``stream`` one row at a time; returns the row count"""
+    return _export((employee_record(emp, fmt) for emp in employees), stream, fmt, EMPLOYEE_FIELDS)
+
+
+def export_tasks(tasks: Iterable[Task], stream: TextIO, fmt: str = "csv") -> int:
+    """Write tasks to ``stream`` one row at a time; returns the row count"""
+    return _export((task_record(task, fmt) for task in tasks), stream, fmt, TASK_FIELDS)
@@ -0,0 +1,59 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+from models import Employee
+
+# Slack for float rounding: the index only pre-selects, callers still check capacity exactly
+_EPSILON = 1e-6
+
+
+class CapacityIndex:
+    """Employees ordered by remaining capacity (max_workload_hours - current_workload).
+
+    Finding who has room for a task is a binary search plus a slice, so
+    candidate retrieval costs work proportional to the employees who can
+    take it, not the roster size. TaskAssignmentSystem updates an entry
+    whenever an employee's workload changes. Thread-safe.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[float, str]] = []  # Sorted (remaining hours, emp_id)
+        self._remaining: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, remaining: Iterable[Tuple[str, float]]):
+        """Bulk-build from (emp_id, remaining hours) pairs, e.g. storage.remaining_capacity()"""
+        with self._lock:
+            self._remaining.update(remaining)
+            self._entries = sorted((remaining, emp_id) for emp_id, remaining in self._remaining.items())
+
+    def update(self, employee: Employee):
+        """(Re-)index an employee after they were added or their workload changed"""
+        remaining = employee.max_workload_hours - employee.current_workload
+        with self._lock:
+            self._discard(employee.emp_id)
+            self._remaining[employee.emp_id] = remaining
+            insort(self._entries, (remaining, employee.emp_id))
+
+    def remove(self, emp_id: str):
+        with self._lock:
+            self._discard(emp_id)
+
+    def _discard(self, emp_id: str):
+        remaining = self._remaining.pop(emp_id, None)
+        if remaining is not None:
+            del self._entries[bisect_left(self._entries, (remaining, emp_id))]
+
+    def with_room(self, hours: float) -> List[str]:
+        """IDs of employees with at least ``hours`` remaining (give or take rounding)"""
+        with self._lock:
+            start = bisect_left(self._entries, (hours - _EPSILON,))
+            return [emp_id for _, emp_id in self._entries[start:]]
+
+    def count_with_room(self, hours: float) -> int:
+        with self._lock:
+            return len(self._entries) - bisect_left(self._entries, (hours - _EPSILON,))
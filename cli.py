@@ -0,0 +1,165 @@
+"""Headless command line for batch recommendation and assignment runs.
+
+Loads a roster and a backlog (CSV or JSONL, see bulk_io), runs
+recommendations or auto-assignment for every open task and streams one
+JSON line per task to stdout (or ``--output``). Only models,
+task_assignment and bulk_io are imported up front, so startup takes tens
+of milliseconds; NumPy is only loaded by the modes that score in batches.
+
+Nothing is printed per task. A one-line JSON summary goes to stderr at the
+end; ``--quiet`` drops it and ``--verbose`` adds the system's usual
+messages, also on stderr.
+
+    python cli.py recommend --employees staff.csv --tasks backlog.jsonl --top-n 3
+    python cli.py assign --employees staff.csv --tasks backlog.csv --output results.jsonl
+    python cli.py assign --employees staff.csv --tasks backlog.csv --mode batch --export-tasks done.csv
+
+Output records:
+    recommend: {"task_id", "matches": [{"emp_id", "probability"}, ...]}
+    assign:    {"task_id", "assigned", "emp_id"} plus "message" when not assigned
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from typing import Iterator, List, TextIO
+
+import bulk_io
+from models import Employee, Task
+from task_assignment import TaskAssignmentSystem
+
+ASSIGN_MODES = ("greedy", "batch", "deadline")
+
+
+def load(system: TaskAssignmentSystem, employees: str, tasks: str, compact: bool = False) -> dict:
+    """Import both files; returns {"employees": ImportReport-as-dict, "tasks": ...}"""
+    employee_class, task_class = Employee, Task
+    if compact:
+        from compact_models import CompactEmployee, CompactTask
+        employee_class, task_class = CompactEmployee, CompactTask
+    reports = {}
+    for kind, path in (("employees", employees), ("tasks", tasks)):
+        with open(path, newline="") as stream:
+            fmt = bulk_io.detect_format(path)
+            if kind == "employees":
+                report = bulk_io.import_employees(system, stream, fmt, employee_class=employee_class)
+            else:
+                report = bulk_io.import_tasks(system, stream, fmt, task_class=task_class)
+        reports[kind] = {"imported": report.imported, "failed": report.failed,
+                         "errors": [{"line": error.line, "message": error.message} for error in report.errors]}
+    return reports
+
+
+def open_tasks(system: TaskAssignmentSystem, limit: int = None) -> List[Task]:
+    tasks = [task for task in system.tasks.values() if not task.assigned_to and not task.is_completed]
+    return tasks if limit is None else tasks[:limit]
+
+
+def recommend(system: TaskAssignmentSystem, tasks: List[Task], top_n: int,
+              vectorized: bool = False, chunk_size: int = 256) -> Iterator[dict]:
+    for start in range(0, len(tasks), chunk_size):
+        chunk = tasks[start:start + chunk_size]
+        if vectorized:
+            ranked = system.find_best_matches_batch(chunk, top_n)
+        else:
+            ranked = [system.find_best_matches(task, top_n) for task in chunk]
+        for task, matches in zip(chunk, ranked):
+            yield {"task_id": task.task_id,
+                   "matches": [{"emp_id": employee.emp_id, "probability": probability}
+                               for employee, probability in matches]}
+
+
+def assign(system: TaskAssignmentSystem, tasks: List[Task], mode: str) -> Iterator[dict]:
+    if mode == "greedy":
+        for task in tasks:
+            result = system.try_assign(task.task_id)
+            record = {"task_id": task.task_id, "assigned": result.ok, "emp_id": result.emp_id}
+            if not result.ok:
+                record["message"] = result.message
+            yield record
+        return
+
+    task_ids = [task.task_id for task in tasks]
+    if mode == "batch":
+        assignments = system.assign_batch(task_ids)
+    elif mode == "deadline":
+        assignments = system.assign_by_deadline(task_ids)
+    else:
+        raise ValueError(f"Unknown assignment mode: {mode}")
+    for task_id in task_ids:
+        emp_id = assignments.get(task_id)
+        record = {"task_id": task_id, "assigned": emp_id is not None, "emp_id": emp_id}
+        if emp_id is None:
+            record["message"] = f"No suitable employee found for task {task_id}"
+        yield record
+
+
+def write_records(records: Iterator[dict], stream: TextIO) -> dict:
+    """Write JSON lines; returns counts for the summary"""
+    written = assigned = 0
+    for record in records:
+        stream.write(json.dumps(record) + "\n")
+        written += 1
+        assigned += bool(record.get("assigned"))
+    return {"records": written, "assigned": assigned}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch task recommendation and assignment")
+    parser.add_argument("command", choices=("recommend", "assign"))
+    parser.add_argument("--employees", required=True, help="CSV/JSONL roster")
+    parser.add_argument("--tasks", required=True, help="CSV/JSONL backlog")
+    parser.add_argument("--output", help="JSONL results file (default: stdout)")
+    parser.add_argument("--mode", choices=ASSIGN_MODES, default="greedy",
+                        help="assign: one task at a time in file order (greedy), by global best-first matching "
+                             "(batch) or earliest deadline first (deadline)")
+    parser.add_argument("--top-n", type=int, default=3, help="recommend: matches per task")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="score with NumPy: tasks in batches (recommend), or candidate rankings kept "
+                             "current between assignments (greedy assign); same results")
+    parser.add_argument("--limit", type=int, help="only the first N open tasks")
+    parser.add_argument("--compact", action="store_true", help="use the slot-based models for large inputs")
+    parser.add_argument("--export-tasks", metavar="PATH", help="write every task's final state (CSV/JSONL)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("--quiet", action="store_true", help="no summary on stderr")
+    verbosity.add_argument("--verbose", action="store_true", help="system messages on stderr")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    system = TaskAssignmentSystem(verbose=args.verbose)
+    output = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        # Keep stdout for results: anything the system prints goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            imports = load(system, args.employees, args.tasks, args.compact)
+            loaded = time.perf_counter()
+            tasks = open_tasks(system, args.limit)
+            if args.command == "recommend":
+                records = recommend(system, tasks, args.top_n, args.vectorized)
+            else:
+                if args.vectorized and args.mode == "greedy":
+                    system.enable_candidate_rankings()
+                records = assign(system, tasks, args.mode)
+            counts = write_records(records, output)
+            if args.export_tasks:
+                with open(args.export_tasks, "w", newline="") as stream:
+                    bulk_io.export_tasks(system.tasks.values(), stream, bulk_io.detect_format(args.export_tasks))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+
+    if not args.quiet:
+        done = time.perf_counter()
+        summary = {"command": args.command, "tasks": len(tasks), **counts,
+                   "load_s": round(loaded - start, 3), "run_s": round(done - loaded, 3), "imports": imports}
+        if args.command == "assign":
+            summary["mode"] = args.mode
+        print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
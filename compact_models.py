@@ -0,0 +1,195 @@
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+
+from models import Observable, Skill, SkillLevel, TaskPriority
+
+_LEVELS = {level.value: level for level in SkillLevel}
+
+
+class SkillVocabulary:
+    """Interns skill names as small integer IDs"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            skill_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return skill_id
+
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+
+# Shared by every compact object so IDs are comparable across employees and tasks
+SKILL_VOCABULARY = SkillVocabulary()
+
+
+class _SkillView(Mapping):
+    """Read-only ``{name: Skill}`` view over a CompactEmployee's skill arrays"""
+    __slots__ = ('_employee',)
+
+    def __init__(self, employee: "CompactEmployee"):
+        self._employee = employee
+
+    def __getitem__(self, name: str) -> Skill:
+        employee = self._employee
+        index = employee._find(name)
+        if index < 0:
+            raise KeyError(name)
+        return Skill(SKILL_VOCABULARY.name(employee._skill_ids[index]),
+                     _LEVELS[employee._skill_levels[index]], employee._skill_years[index])
+
+    def __contains__(self, name) -> bool:
+        return self._employee._find(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (SKILL_VOCABULARY.name(skill_id) for skill_id in self._employee._skill_ids)
+
+    def __len__(self) -> int:
+        return len(self._employee._skill_ids)
+
+
+class CompactEmployee(Observable):
+    """Memory-compact drop-in for models.Employee.
+
+    Uses ``__slots__`` instead of a per-instance dict and keeps skills as
+    three parallel arrays (interned skill ID, level value, experience years)
+    instead of a dict of Skill dataclasses. ``skills`` is a read-only mapping
+    view that builds Skill objects on access; change skills with add_skill.
+    The scorer reads get_skill_level / get_skill_experience, which answer
+    from the arrays without building any.
+    """
+    __slots__ = ('emp_id', 'name', 'max_workload_hours', 'current_workload', 'assigned_tasks',
+                 '_performance_rating', '_observers', '_skill_ids', '_skill_levels', '_skill_years')
+
+    def __init__(self, emp_id: str, name: str, skills: List[Skill],
+                 max_workload_hours: float = 40.0):
+        self.emp_id = emp_id
+        self.name = name
+        self.max_workload_hours = max_workload_hours
+        self.current_workload = 0.0
+        self.assigned_tasks = []
+        self._observers = []
+        self._performance_rating = 1.0
+        self._skill_ids = array('I')
+        self._skill_levels = array('b')
+        self._skill_years = array('d')
+        for skill in skills:
+            self._set_skill(skill)
+
+    @property
+    def performance_rating(self) -> float:
+        return self._performance_rating
+
+    @performance_rating.setter
+    def performance_rating(self, rating: float):
+        self._performance_rating = rating
+        for observer in self._observers:
+            observer.on_performance_changed(self)
+
+    @property
+    def skills(self) -> Mapping:
+        return _SkillView(self)
+
+    def _find(self, name: str) -> int:
+        skill_id = SKILL_VOCABULARY.get(name)
+        if skill_id is None:
+            return -1
+        try:
+            return self._skill_ids.index(skill_id)
+        except ValueError:
+            return -1
+
+    def _set_skill(self, skill: Skill) -> Optional[Skill]:
+        index = self._find(skill.name)
+        if index < 0:
+            self._skill_ids.append(SKILL_VOCABULARY.intern(skill.name))
+            self._skill_levels.append(skill.level.value)
+            self._skill_years.append(skill.experience_years)
+            return None
+        previous = Skill(skill.name, _LEVELS[self._skill_levels[index]], self._skill_years[index])
+        self._skill_levels[index] = skill.level.value
+        self._skill_years[index] = skill.experience_years
+        return previous
+
+    def add_skill(self, skill: Skill):
+        previous = self._set_skill(skill)
+        for observer in self._observers:
+            observer.on_skill_added(self, previous, skill)
+
+    def get_skill_level(self, skill_name: str) -> int:
+        index = self._find(skill_name)
+        return self._skill_levels[index] if index >= 0 else 0
+
+    def get_skill_experience(self, skill_name: str) -> Optional[float]:
+        index = self._find(skill_name)
+        return self._skill_years[index] if index >= 0 else None
+
+    def get_availability_ratio(self) -> float:
+        return max(0, (self.max_workload_hours - self.current_workload) / self.max_workload_hours)
+
+
+class CompactTask(Observable):
+    """Memory-compact drop-in for models.Task.
+
+    Same attributes and change notifications as Task, stored in
+    ``__slots__``; required skill names are interned through the shared
+    vocabulary so every task references one copy of each name.
+    """
+    __slots__ = ('task_id', 'name', 'estimated_hours', 'assigned_to', 'is_completed',
+                 '_observers', '_required_skills', '_priority', '_deadline_days')
+
+    def __init__(self, task_id: str, name: str, required_skills: Dict[str, SkillLevel],
+                 priority: TaskPriority, estimated_hours: float, deadline_days: int):
+        self._observers = []
+        self.task_id = task_id
+        self.name = name
+        self.required_skills = required_skills
+        self.priority = priority
+        self.estimated_hours = estimated_hours
+        self.deadline_days = deadline_days
+        self.assigned_to = None
+        self.is_completed = False
+
+    @property
+    def required_skills(self) -> Dict[str, SkillLevel]:
+        return self._required_skills
+
+    @required_skills.setter
+    def required_skills(self, required_skills: Dict[str, SkillLevel]):
+        self._required_skills = {SKILL_VOCABULARY.name(SKILL_VOCABULARY.intern(name)): level
+                                 for name, level in required_skills.items()}
+        self._notify_changed()
+
+    @property
+    def priority(self) -> TaskPriority:
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority: TaskPriority):
+        self._priority = priority
+        self._notify_changed()
+
+    @property
+    def deadline_days(self) -> int:
+        return self._deadline_days
+
+    @deadline_days.setter
+    def deadline_days(self, deadline_days: int):
+        self._deadline_days = deadline_days
+        self._notify_changed()
+
+    def _notify_changed(self):
+        for observer in self._observers:
+            observer.on_task_changed(self)
@@ -0,0 +1,288 @@
+"""Opt-in timing metrics and profiling hooks for TaskAssignmentSystem.
+
+Nothing here runs unless TaskAssignmentSystem.enable_instrumentation() is
+called. Enabling it shadows the selected methods on that one instance with
+timing wrappers; disabling deletes the wrappers again, so a system that
+never enables instrumentation pays nothing.
+
+For every wrapped method the metrics hold the call count, cumulative
+(inclusive) time, self time (excluding other wrapped methods it called)
+and a latency histogram. Self time separates e.g. the weighting and
+sigmoid in calculate_assignment_probability from the skill scoring it calls.
+find_best_matches also reports how many candidates it scored versus pruned.
+"""
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+INSTRUMENTED_METHODS = (
+    "calculate_skill_similarity",
+    "calculate_experience_score",
+    "calculate_priority_match_score",
+    "_static_components",
+    "_probability_upper_bound",
+    "calculate_assignment_probability",
+    "calculate_probability_matrix",
+    "find_best_matches",
+    "find_best_matches_batch",
+    "get_score_components",
+    "get_scoring_engine",
+    "assign_task",
+    "assign_batch",
+)
+
+METRIC_PREFIX = "task_assignment"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (inf if in the last bucket)"""
+        total = sum(self.counts)
+        if total == 0:
+            return 0.0
+        rank, seen = q * total, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class TimerStats:
+    """Counters for one method or named section"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.self_seconds = 0.0
+        self.histogram = Histogram()
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileResult:
+    result: object
+    report: str
+
+
+class Instrumentation:
+    """Metrics registry plus the wrappers that feed it; thread-safe"""
+
+    def __init__(self, methods: Iterable[str] = ()):
+        self.methods = tuple(methods)  # Names wrapped on the system instance
+        self.timers: Dict[str, TimerStats] = {}
+        self.match_calls = 0
+        self.candidates_scored = 0
+        self.candidates_pruned = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _timer(self, name: str) -> TimerStats:
+        with self._lock:
+            return self.timers.setdefault(name, TimerStats())
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def wrap(self, name: str, function: Callable) -> Callable:
+        """Return ``function`` timed under ``name``"""
+        stats = self._timer(name)
+        lock = self._lock
+        stack_of = self._stack
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            stack = stack_of()
+            stack.append(0.0)  # Time spent in wrapped callees
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with lock:
+                    stats.calls += 1
+                    stats.total_seconds += elapsed
+                    stats.self_seconds += elapsed - children
+                    stats.histogram.observe(elapsed)
+
+        timed.__wrapped__ = function
+        return timed
+
+    def observe(self, name: str, seconds: float):
+        """Record a duration measured elsewhere (e.g. rendering a page)"""
+        stats = self._timer(name)
+        with self._lock:
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.self_seconds += seconds
+            stats.histogram.observe(seconds)
+
+    def record_candidates(self, scored: int, roster_size: int):
+        """One find_best_matches call scored ``scored`` of ``roster_size`` employees"""
+        with self._lock:
+            self.match_calls += 1
+            self.candidates_scored += scored
+            self.candidates_pruned += max(0, roster_size - scored)
+
+    def reset(self):
+        with self._lock:
+            for name in self.timers:
+                self.timers[name] = TimerStats()
+            self.match_calls = self.candidates_scored = self.candidates_pruned = 0
+
+    def snapshot(self) -> List[dict]:
+        """One row per timer, slowest cumulative time first"""
+        with self._lock:
+            rows = [{
+                "name": name,
+                "calls": stats.calls,
+                "total_ms": stats.total_seconds * 1000,
+                "self_ms": stats.self_seconds * 1000,
+                "mean_us": stats.mean_seconds * 1e6,
+                "p50_le_us": stats.histogram.quantile(0.5) * 1e6,
+                "p99_le_us": stats.histogram.quantile(0.99) * 1e6,
+            } for name, stats in self.timers.items() if stats.calls]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_calls_total Calls per instrumented method or section.",
+            f"# TYPE {p}_calls_total counter",
+        ]
+        with self._lock:
+            timers = [(_label(name), stats) for name, stats in sorted(self.timers.items())]
+            for name, stats in timers:
+                lines.append(f'{p}_calls_total{{method="{name}"}} {stats.calls}')
+            lines += [f"# HELP {p}_self_seconds_total Time spent in a method excluding instrumented callees.",
+                      f"# TYPE {p}_self_seconds_total counter"]
+            for name, stats in timers:
+                lines.append(f'{p}_self_seconds_total{{method="{name}"}} {stats.self_seconds!r}')
+            lines += [f"# HELP {p}_duration_seconds Latency per instrumented method or section.",
+                      f"# TYPE {p}_duration_seconds histogram"]
+            for name, stats in timers:
+                cumulative = 0
+                for bound, count in zip(stats.histogram.buckets, stats.histogram.counts):
+                    cumulative += count
+                    lines.append(f'{p}_duration_seconds_bucket{{method="{name}",le="{bound!r}"}} {cumulative}')
+                lines.append(f'{p}_duration_seconds_bucket{{method="{name}",le="+Inf"}} {stats.calls}')
+                lines.append(f'{p}_duration_seconds_sum{{method="{name}"}} {stats.total_seconds!r}')
+                lines.append(f'{p}_duration_seconds_count{{method="{name}"}} {stats.calls}')
+            lines += [f"# HELP {p}_match_candidates_total Employees scored or pruned by find_best_matches.",
+                      f"# TYPE {p}_match_candidates_total counter",
+                      f'{p}_match_candidates_total{{outcome="scored"}} {self.candidates_scored}',
+                      f'{p}_match_candidates_total{{outcome="pruned"}} {self.candidates_pruned}']
+        return "\n".join(lines) + "\n"
+
+
+def instrument(system, methods: Iterable[str] = INSTRUMENTED_METHODS) -> Instrumentation:
+    """Shadow ``methods`` on the ``system`` instance with timing wrappers"""
+    instrumentation = Instrumentation(methods)
+    for name in instrumentation.methods:
+        setattr(system, name, instrumentation.wrap(name, getattr(system, name)))
+    return instrumentation
+
+
+def uninstrument(system, instrumentation: Instrumentation):
+    for name in instrumentation.methods:
+        if name in vars(system):
+            delattr(system, name)
+
+
+class SamplingProfiler:
+    """Samples the calling thread's stack from a background thread.
+
+    Much lower overhead than cProfile on hot loops, at the cost of
+    statistical (per ``interval``) rather than exact counts.
+    """
+
+    def __init__(self, interval: float = 0.0005):
+        self.interval = interval
+        self.samples = 0
+        self.leaf = Counter()
+        self.inclusive = Counter()
+
+    def run(self, function: Callable, *args, **kwargs):
+        target = threading.get_ident()
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                seen = set()
+                leaf = True
+                while frame is not None:
+                    code = frame.f_code
+                    key = f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+                    if leaf:
+                        self.leaf[key] += 1
+                        leaf = False
+                    if key not in seen:
+                        self.inclusive[key] += 1
+                        seen.add(key)
+                    frame = frame.f_back
+                self.samples += 1
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            done.set()
+            sampler.join()
+
+    def report(self, limit: int = 25) -> str:
+        if not self.samples:
+            return "No samples taken (the call finished within one interval)\n"
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms",
+                 f"{'self %':>7s} {'total %':>8s}  function"]
+        for key, count in self.leaf.most_common(limit):
+            lines.append(f"{count / self.samples:7.1%} {self.inclusive[key] / self.samples:8.1%}  {key}")
+        return "\n".join(lines) + "\n"
+
+
+def profile_call(function: Callable, *args, mode: str = "cprofile", limit: int = 25,
+                 **kwargs) -> ProfileResult:
+    """Run ``function`` once under cProfile or the sampling profiler and return its report"""
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(function, *args, **kwargs)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return ProfileResult(result, stream.getvalue())
+    if mode == "sampling":
+        profiler = SamplingProfiler()
+        result = profiler.run(function, *args, **kwargs)
+        return ProfileResult(result, profiler.report(limit))
+    raise ValueError(f"Unknown profile mode: {mode}")
@@ -0,0 +1,455 @@
+"""Durable in-memory storage: an append-only operation journal plus periodic snapshots.
+
+JournalStorage keeps employees and tasks in plain dicts, like
+InMemoryStorage, and appends every change the system reports to a journal
+in ``directory``:
+
+    journal.log    one JSON record per line, never rewritten; doubles as the
+                   audit trail (see read_journal and assignment_history)
+    snapshot.bin   compact binary image of every employee and task, plus the
+                   journal position it covers
+
+Records are written immediately but fsynced in groups by a background
+thread every ``flush_interval`` seconds (0 fsyncs at the end of every
+write or transaction instead), so a crash loses at most that window. The
+same thread writes a new snapshot every ``snapshot_every`` records.
+Opening the directory loads the snapshot and replays only the journal tail
+after it; a record torn by a crash is cut off.
+
+Record types (every record also carries ``seq``, ``time`` and ``op``):
+
+    employee          full employee, on add or replace
+    employee_update   name, capacity, workload and performance rating
+    skill             one skill added to or changed on an employee
+    task              full task, on add, replace or requirement change
+    assign            task_id, emp_id, estimated_hours and the employee's new current_workload
+    complete          task_id, emp_id and the employee's new current_workload
+    remove_employee   emp_id
+    remove_task       task_id
+"""
+import gc
+import io
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+from storage import InMemoryStorage
+
+JOURNAL_FILE = "journal.log"
+SNAPSHOT_FILE = "snapshot.bin"
+
+# magic, format version, last seq, journal offset, payload length, payload CRC-32
+_SNAPSHOT_HEADER = struct.Struct("<8sIQQQI")
+_SNAPSHOT_MAGIC = b"TASKSNAP"
+_SNAPSHOT_VERSION = 1
+
+_LEVELS = {level.value: level for level in SkillLevel}
+_PRIORITIES = {priority.value: priority for priority in TaskPriority}
+
+
+class _SafeUnpickler(pickle.Unpickler):
+    """Snapshots only hold builtin containers and scalars; refuse anything else"""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"unexpected object in snapshot: {module}.{name}")
+
+
+class _JournaledDict(dict):
+    """Dict whose item assignments and deletions are journaled, under the storage lock"""
+
+    def __init__(self, lock, on_set: Callable[[object], None], on_delete: Callable[[str], None]):
+        super().__init__()
+        self._lock = lock
+        self._on_set = on_set
+        self._on_delete = on_delete
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._on_set(value)
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            self._on_delete(key)
+            super().__delitem__(key)
+
+
+# Compact row encodings shared by snapshots
+
+def _employee_row(employee: Employee) -> tuple:
+    skills = list(employee.skills.values())
+    return (employee.emp_id, employee.name, employee.max_workload_hours, employee.current_workload,
+            employee.performance_rating, tuple(employee.assigned_tasks),
+            tuple(skill.name for skill in skills), bytes(skill.level.value for skill in skills),
+            tuple(skill.experience_years for skill in skills))
+
+
+def _task_row(task: Task) -> tuple:
+    required = task.required_skills
+    return (task.task_id, task.name, task.priority.value, task.estimated_hours, task.deadline_days,
+            tuple(required), bytes(level.value for level in required.values()),
+            task.assigned_to, task.is_completed)
+
+
+def _employee_from_row(row: tuple, employee_class) -> Employee:
+    emp_id, name, max_hours, workload, rating, assigned, skill_names, levels, years = row
+    employee = employee_class(emp_id, name, [Skill(skill_name, _LEVELS[level], experience)
+                                             for skill_name, level, experience in zip(skill_names, levels, years)],
+                              max_hours)
+    employee.current_workload = workload
+    employee.performance_rating = rating
+    employee.assigned_tasks = list(assigned)
+    return employee
+
+
+def _task_from_row(row: tuple, task_class) -> Task:
+    task_id, name, priority, hours, deadline, skill_names, levels, assigned_to, completed = row
+    task = task_class(task_id, name, {skill_name: _LEVELS[level] for skill_name, level in zip(skill_names, levels)},
+                      _PRIORITIES[priority], hours, deadline)
+    task.assigned_to = assigned_to
+    task.is_completed = completed
+    return task
+
+
+def write_snapshot(path: str, seq: int, offset: int, employee_rows: List[tuple], task_rows: List[tuple]):
+    """Atomically replace the snapshot at ``path``"""
+    payload = pickle.dumps((employee_rows, task_rows), protocol=pickle.HIGHEST_PROTOCOL)
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, seq, offset, len(payload),
+                                   zlib.crc32(payload))
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as stream:
+        stream.write(header)
+        stream.write(payload)
+        stream.flush()
+        os.fsync(stream.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def read_snapshot(path: str) -> Tuple[int, int, List[tuple], List[tuple]]:
+    """(last seq, journal offset, employee rows, task rows) of a snapshot"""
+    with open(path, "rb") as stream:
+        header = stream.read(_SNAPSHOT_HEADER.size)
+        if len(header) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f"{path}: truncated snapshot header")
+        magic, version, seq, offset, length, checksum = _SNAPSHOT_HEADER.unpack(header)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError(f"{path}: not a version {_SNAPSHOT_VERSION} snapshot")
+        payload = stream.read(length)
+    if len(payload) != length or zlib.crc32(payload) != checksum:
+        raise ValueError(f"{path}: snapshot is corrupt")
+    employee_rows, task_rows = _SafeUnpickler(io.BytesIO(payload)).load()
+    return seq, offset, employee_rows, task_rows
+
+
+def _fsync_directory(directory: str):
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Not supported on Windows; the rename is still atomic
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def iter_journal(path: str, offset: int = 0) -> Iterator[Tuple[int, dict]]:
+    """Yield (end offset, record) for each complete record from ``offset`` on
+
+    Stops at a torn final record. A damaged record anywhere else raises
+    ValueError.
+    """
+    with open(path, "rb") as stream:
+        stream.seek(offset)
+        for line in stream:
+            if not line.endswith(b"\n"):
+                return  # Torn by a crash mid-write
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if not stream.read(1):
+                    return
+                raise ValueError(f"{path}: damaged journal record at offset {offset}") from None
+            offset += len(line)
+            yield offset, record
+
+
+def read_journal(directory: str) -> Iterator[dict]:
+    """Every journal record in ``directory``, oldest first"""
+    path = os.path.join(directory, JOURNAL_FILE)
+    if os.path.exists(path):
+        for _, record in iter_journal(path):
+            yield record
+
+
+def assignment_history(directory: str, emp_id: str = None, task_id: str = None) -> List[dict]:
+    """Audit trail of assignments, optionally for one employee or task
+
+    Each entry holds ``time`` (Unix seconds), ``seq``, ``task_id``,
+    ``emp_id``, ``estimated_hours`` and the employee's resulting
+    ``current_workload``.
+    """
+    return [record for record in read_journal(directory)
+            if record["op"] == "assign"
+            and (emp_id is None or record["emp_id"] == emp_id)
+            and (task_id is None or record["task_id"] == task_id)]
+
+
+class JournalStorage(InMemoryStorage):
+    """In-memory storage made durable by a journal and snapshots (see module docstring)
+
+    Opening an existing directory recovers its state; pass the storage to
+    TaskAssignmentSystem to continue where the last process left off.
+    Call close() on shutdown to fsync the last records.
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.01, snapshot_every: int = 50_000,
+                 employee_class=Employee, task_class=Task):
+        super().__init__()
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.employee_class = employee_class
+        self.task_class = task_class
+        self._lock = threading.RLock()  # Held for every write and for the whole of a transaction
+        self.employees = _JournaledDict(self._lock, self._journal_employee, self._journal_employee_removed)
+        self.tasks = _JournaledDict(self._lock, self.save_task, self._journal_task_removed)
+        self.seq = 0  # seq of the last journaled record
+        self.snapshot_seq = 0  # seq covered by the latest snapshot
+        self._depth = 0
+        self._snapshot_lock = threading.Lock()
+        self._dirty = False
+        self._snapshot_rows: List[tuple] = []  # Employee rows recovered from the snapshot, see skill_postings
+        self._replayed_employees = set()  # emp_ids whose snapshot row the journal tail made stale
+
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        offset = self._recover()
+        self._journal = open(self.journal_path, "ab")
+        self._journal.truncate(offset)  # Drop a record torn by a crash
+
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+            self._flusher.start()
+
+    # Recovery
+
+    def _recover(self) -> int:
+        """Load the snapshot and replay the journal tail; return the journal's valid length"""
+        offset = 0
+        gc_was_enabled = gc.isenabled()
+        gc.disable()  # Building many small objects would otherwise trigger repeated full collections
+        try:
+            if os.path.exists(self.snapshot_path):
+                self.seq, offset, employee_rows, task_rows = read_snapshot(self.snapshot_path)
+                self.snapshot_seq = self.seq
+                self._snapshot_rows = employee_rows
+                for row in employee_rows:
+                    dict.__setitem__(self.employees, row[0], _employee_from_row(row, self.employee_class))
+                for row in task_rows:
+                    dict.__setitem__(self.tasks, row[0], _task_from_row(row, self.task_class))
+            journal_size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+            if journal_size < offset:
+                raise ValueError(f"{self.journal_path} is shorter than the snapshot in {self.directory} expects")
+            if journal_size:
+                for offset, record in iter_journal(self.journal_path, offset):
+                    self._replay(record)
+                    self.seq = record["seq"]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return offset
+
+    def _replay(self, record: dict):
+        op = record["op"]
+        if "emp_id" in record and op not in ("assign", "complete"):
+            self._replayed_employees.add(record["emp_id"])
+        if op == "employee":
+            employee = self.employee_class(
+                record["emp_id"], record["name"],
+                [Skill(name, SkillLevel[level], years) for name, level, years in record["skills"]],
+                record["max_workload_hours"])
+            employee.current_workload = record["current_workload"]
+            employee.performance_rating = record["performance_rating"]
+            employee.assigned_tasks = list(record["assigned_tasks"])
+            dict.__setitem__(self.employees, employee.emp_id, employee)
+        elif op == "employee_update":
+            employee = self.employees[record["emp_id"]]
+            employee.name = record["name"]
+            employee.max_workload_hours = record["max_workload_hours"]
+            employee.current_workload = record["current_workload"]
+            employee.performance_rating = record["performance_rating"]
+        elif op == "skill":
+            self.employees[record["emp_id"]].add_skill(
+                Skill(record["name"], SkillLevel[record["level"]], record["experience_years"]))
+        elif op == "task":
+            task = self.task_class(
+                record["task_id"], record["name"],
+                {name: SkillLevel[level] for name, level in record["required_skills"].items()},
+                TaskPriority[record["priority"]], record["estimated_hours"], record["deadline_days"])
+            task.assigned_to = record["assigned_to"]
+            task.is_completed = record["is_completed"]
+            dict.__setitem__(self.tasks, task.task_id, task)
+        elif op == "assign":
+            # Absolute values, so replaying a change a snapshot already holds is harmless
+            task = self.tasks[record["task_id"]]
+            employee = self.employees[record["emp_id"]]
+            task.assigned_to = employee.emp_id
+            employee.current_workload = record["current_workload"]
+            if task.task_id not in employee.assigned_tasks:
+                employee.assigned_tasks.append(task.task_id)
+        elif op == "complete":
+            task = self.tasks[record["task_id"]]
+            task.is_completed = True
+            employee = self.employees.get(record["emp_id"])
+            if employee is not None:
+                employee.current_workload = record["current_workload"]
+                if task.task_id in employee.assigned_tasks:
+                    employee.assigned_tasks.remove(task.task_id)
+        elif op == "remove_employee":
+            dict.pop(self.employees, record["emp_id"], None)
+        elif op == "remove_task":
+            dict.pop(self.tasks, record["task_id"], None)
+        else:
+            raise ValueError(f"unknown journal operation {op!r}")
+
+    def add_load_listener(self, callback: Callable[[object], None]):
+        """Recovered objects count as loaded: hand each to ``callback`` now"""
+        for employee in self.employees.values():
+            callback(employee)
+        for task in self.tasks.values():
+            callback(task)
+
+    def skill_postings(self) -> Iterable[Tuple[str, str, int]]:
+        """Read from the recovered snapshot columns where they are still current
+
+        Only employees the journal tail changed are read from their objects,
+        which keeps restarts with large rosters fast.
+        """
+        rows, self._snapshot_rows = self._snapshot_rows, None
+        if rows is None:
+            return super().skill_postings()
+        stale = self._replayed_employees
+        postings = [(row[0], name, level) for row in rows if row[0] not in stale
+                    for name, level in zip(row[6], row[7])]
+        for emp_id in stale:
+            employee = self.employees.get(emp_id)
+            if employee is not None:
+                postings.extend((emp_id, skill.name, skill.level.value) for skill in employee.skills.values())
+        stale.clear()
+        return postings
+
+    # Journal writes
+
+    def _append(self, op: str, **fields):
+        with self._lock:
+            self.seq += 1
+            record = {"seq": self.seq, "time": time.time(), "op": op, **fields}
+            self._journal.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            self._dirty = True
+            if self._depth == 0 and self.flush_interval <= 0:
+                self.sync()
+
+    @contextmanager
+    def transaction(self):
+        """Serialize a group of writes; with flush_interval=0 they are fsynced together at the end"""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self.flush_interval <= 0:
+                    self.sync()
+
+    def _journal_employee(self, employee: Employee):
+        self._append("employee", emp_id=employee.emp_id, name=employee.name,
+                     max_workload_hours=employee.max_workload_hours,
+                     current_workload=employee.current_workload,
+                     performance_rating=employee.performance_rating,
+                     skills=[[skill.name, skill.level.name, skill.experience_years]
+                             for skill in employee.skills.values()],
+                     assigned_tasks=list(employee.assigned_tasks))
+
+    def _journal_employee_removed(self, emp_id: str):
+        self._append("remove_employee", emp_id=emp_id)
+
+    def _journal_task_removed(self, task_id: str):
+        self._append("remove_task", task_id=task_id)
+
+    def save_employee(self, employee: Employee):
+        self._append("employee_update", emp_id=employee.emp_id, name=employee.name,
+                     max_workload_hours=employee.max_workload_hours,
+                     current_workload=employee.current_workload,
+                     performance_rating=employee.performance_rating)
+
+    def save_skill(self, emp_id: str, skill: Skill):
+        self._append("skill", emp_id=emp_id, name=skill.name, level=skill.level.name,
+                     experience_years=skill.experience_years)
+
+    def save_task(self, task: Task):
+        self._append("task", task_id=task.task_id, name=task.name, priority=task.priority.name,
+                     estimated_hours=task.estimated_hours, deadline_days=task.deadline_days,
+                     required_skills={name: level.name for name, level in task.required_skills.items()},
+                     assigned_to=task.assigned_to, is_completed=task.is_completed)
+
+    def record_assignment(self, task: Task, employee: Employee):
+        self._append("assign", task_id=task.task_id, emp_id=employee.emp_id,
+                     estimated_hours=task.estimated_hours, current_workload=employee.current_workload)
+
+    def record_completion(self, task: Task, employee: Optional[Employee]):
+        self._append("complete", task_id=task.task_id, emp_id=task.assigned_to,
+                     current_workload=None if employee is None else employee.current_workload)
+
+    # Durability
+
+    def sync(self):
+        """Flush and fsync every record written so far"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._journal.flush()
+            self._dirty = False
+            descriptor = self._journal.fileno()
+        os.fsync(descriptor)
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            self.sync()
+            if self.seq - self.snapshot_seq >= self.snapshot_every:
+                self.snapshot()
+
+    def snapshot(self):
+        """Write a snapshot of the current state, so recovery replays only later records
+
+        Writers are paused only while the rows are copied, not while the
+        file is written.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                self._journal.flush()
+                seq, offset = self.seq, self._journal.tell()
+                employee_rows = [_employee_row(employee) for employee in self.employees.values()]
+                task_rows = [_task_row(task) for task in self.tasks.values()]
+            self.sync()  # The snapshot must never cover records that are not durable
+            write_snapshot(self.snapshot_path, seq, offset, employee_rows, task_rows)
+            self.snapshot_seq = seq
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self.sync()
+            self._journal.close()
@@ -0,0 +1,42 @@
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StripedLocks:
+    """Fixed pool of re-entrant locks shared out by key hash.
+
+    Gives per-employee / per-task locking without one lock object per record.
+    Keys are hashed with CRC32 so the stripe of a key is stable. ``hold``
+    acquires the stripes of several keys in index order, so two threads
+    locking the same keys can never deadlock.
+    """
+
+    def __init__(self, stripes: int = 1024):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _stripe(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % len(self._locks)
+
+    @contextmanager
+    def hold(self, *keys: str) -> Iterator[None]:
+        stripes = sorted({self._stripe(key) for key in keys})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    @contextmanager
+    def hold_all(self) -> Iterator[None]:
+        """Acquire every stripe, e.g. to read a consistent view of all records"""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class SkillLevel(Enum):
     BEGINNER = 1
@@ -14,15 +14,27 @@ class TaskPriority(Enum):
     HIGH = 3
     CRITICAL = 4
 
+class Observable:
+    """Mixin for model objects that notify systems about changes"""
+    __slots__ = ()
+
+    def add_observer(self, observer):
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self._observers:
+            self._observers.remove(observer)
+
 @dataclass
 class Skill:
     name: str
     level: SkillLevel
     experience_years: float
 
-class Task:
+class Task(Observable):
     def __init__(self, task_id: str, name: str, required_skills: Dict[str, SkillLevel], 
                  priority: TaskPriority, estimated_hours: float, deadline_days: int):
+        self._observers = []  # Systems notified when requirements change
         self.task_id = task_id
         self.name = name
         self.required_skills = required_skills
@@ -32,7 +44,41 @@ class Task:
         self.assigned_to = None
         self.is_completed = False
 
-class Employee:
+    # Requirements are properties so cached scores can be invalidated and
+    # schedules replanned; assign a new dict rather than mutating
+    # required_skills in place.
+    @property
+    def required_skills(self) -> Dict[str, SkillLevel]:
+        return self._required_skills
+
+    @required_skills.setter
+    def required_skills(self, required_skills: Dict[str, SkillLevel]):
+        self._required_skills = required_skills
+        self._notify_changed()
+
+    @property
+    def priority(self) -> TaskPriority:
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority: TaskPriority):
+        self._priority = priority
+        self._notify_changed()
+
+    @property
+    def deadline_days(self) -> int:
+        return self._deadline_days
+
+    @deadline_days.setter
+    def deadline_days(self, deadline_days: int):
+        self._deadline_days = deadline_days
+        self._notify_changed()
+
+    def _notify_changed(self):
+        for observer in self._observers:
+            observer.on_task_changed(self)
+
+class Employee(Observable):
     def __init__(self, emp_id: str, name: str, skills: List[Skill], 
                  max_workload_hours: float = 40.0):
         self.emp_id = emp_id
@@ -41,15 +87,33 @@ class Employee:
         self.max_workload_hours = max_workload_hours
         self.current_workload = 0.0
         self.assigned_tasks = []
+        self._observers = []  # Systems notified when skills or performance change
         self.performance_rating = 1.0  # Default performance multiplier
 
+    @property
+    def performance_rating(self) -> float:
+        return self._performance_rating
+
+    @performance_rating.setter
+    def performance_rating(self, rating: float):
+        self._performance_rating = rating
+        for observer in self._observers:
+            observer.on_performance_changed(self)
+
     def add_skill(self, skill: Skill):
+        previous = self.skills.get(skill.name)
         self.skills[skill.name] = skill
+        for observer in self._observers:
+            observer.on_skill_added(self, previous, skill)
 
     def get_skill_level(self, skill_name: str) -> int:
-        if skill_name in self.skills:
-            return self.skills[skill_name].level.value
-        return 0
+        skill = self.skills.get(skill_name)
+        return skill.level.value if skill is not None else 0
+
+    def get_skill_experience(self, skill_name: str) -> Optional[float]:
+        """Years of experience in a skill, or None if the employee does not have it"""
+        skill = self.skills.get(skill_name)
+        return skill.experience_years if skill is not None else None
 
     def get_availability_ratio(self) -> float:
         return max(0, (self.max_workload_hours - self.current_workload) / self.max_workload_hours) 
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""Process-pool scoring for very large rosters.
+
+The scoring engine's arrays are copied once into a shared memory segment
+and the parent engine is re-pointed at it, so assignments keep updating the
+very memory the workers read. Each call then only pickles the task
+requirements and the shard bounds; every worker scores its contiguous block
+of rows with the normal ScoringEngine code and returns its local top-k, and
+the parent merges those. Because shard rankings use the same
+(probability desc, row asc) order as ScoringEngine.top_matches, the merged
+result is identical to the serial one.
+"""
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import SkillLevel, Task, TaskPriority
+from scoring import ScoringEngine
+
+_ALIGN = 64
+_HEADER = 8  # Length of the pickled layout that follows
+
+
+class TaskSpec(NamedTuple):
+    """The parts of a task the engine reads; cheap to pickle, unlike a Task with observers"""
+    required_skills: Dict[str, SkillLevel]
+    priority: TaskPriority
+    estimated_hours: float
+
+
+def _spec(task: Task) -> TaskSpec:
+    return TaskSpec(dict(task.required_skills), task.priority, task.estimated_hours)
+
+
+def _share(engine: ScoringEngine) -> shared_memory.SharedMemory:
+    """Copy the engine's arrays into a new segment and re-point the engine at it"""
+    names = sorted(engine.skill_columns)
+    arrays = {
+        'max_workload': engine.max_workload,
+        'current_workload': engine.current_workload,
+        'performance': engine.performance,
+        'skill_rows': np.concatenate([engine.skill_columns[n][0] for n in names] or [np.zeros(0, np.int64)]),
+        'skill_levels': np.concatenate([engine.skill_columns[n][1] for n in names] or [np.zeros(0)]),
+        'skill_years': np.concatenate([engine.skill_columns[n][2] for n in names] or [np.zeros(0)]),
+    }
+    bounds, start = {}, 0
+    for name in names:
+        end = start + len(engine.skill_columns[name][0])
+        bounds[name] = (start, end)
+        start = end
+
+    # Lay the arrays out after the header, each aligned
+    layout = {'arrays': {}, 'skills': bounds}
+    offset = 0
+    for key, array in arrays.items():
+        layout['arrays'][key] = (array.dtype.str, offset, len(array))
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header = pickle.dumps(layout)
+    base = -(-(_HEADER + len(header)) // _ALIGN) * _ALIGN
+
+    segment = shared_memory.SharedMemory(create=True, size=max(1, base + offset))
+    segment.buf[:_HEADER] = len(header).to_bytes(_HEADER, 'little')
+    segment.buf[_HEADER:_HEADER + len(header)] = header
+    views = _views(segment, layout, base)
+    for key, array in arrays.items():
+        views[key][:] = array
+
+    engine.max_workload = views['max_workload']
+    engine.current_workload = views['current_workload']
+    engine.performance = views['performance']
+    engine.skill_columns = _columns(views, bounds)
+    engine._shared_memory = segment  # Released together with the views
+    return segment
+
+
+def _views(segment: shared_memory.SharedMemory, layout: dict, base: int) -> Dict[str, np.ndarray]:
+    return {key: np.ndarray(length, dtype=np.dtype(dtype), buffer=segment.buf, offset=base + offset)
+            for key, (dtype, offset, length) in layout['arrays'].items()}
+
+
+def _columns(views: Dict[str, np.ndarray],
+             bounds: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    return {name: (views['skill_rows'][start:end], views['skill_levels'][start:end],
+                   views['skill_years'][start:end])
+            for name, (start, end) in bounds.items()}
+
+
+# Worker side: one attached engine per process, replaced when the parent republishes
+
+_worker_engine: Optional[ScoringEngine] = None
+
+
+def _attach(segment_name: str, weights: Dict[str, float]) -> ScoringEngine:
+    global _worker_engine
+    engine = _worker_engine
+    if engine is None or engine._shared_memory.name != segment_name:
+        _worker_engine = engine = None  # Drop the old views before their segment
+        segment = shared_memory.SharedMemory(name=segment_name)
+        length = int.from_bytes(bytes(segment.buf[:_HEADER]), 'little')
+        layout = pickle.loads(bytes(segment.buf[_HEADER:_HEADER + length]))
+        base = -(-(_HEADER + length) // _ALIGN) * _ALIGN
+        views = _views(segment, layout, base)
+        engine = ScoringEngine.from_arrays(weights, views['max_workload'], views['current_workload'],
+                                           views['performance'], _columns(views, layout['skills']))
+        engine._shared_memory = segment
+        _worker_engine = engine
+    engine.weights = weights
+    return engine
+
+
+def _score_shard(segment_name: str, weights: Dict[str, float], start: int, stop: int,
+                 tasks: Sequence[TaskSpec], top_n: int) -> List[List[Tuple[int, float]]]:
+    engine = _attach(segment_name, weights)
+    rows = slice(start, stop)
+    return [engine.top_matches(task, top_n, rows) for task in tasks]
+
+
+class ParallelScorer:
+    """Shards scoring across a process pool.
+
+    ``workers`` defaults to the CPU count and ``shards`` to ``workers``.
+    The pool uses the spawn start method, so it is safe to create from a
+    threaded program (scripts need the usual ``if __name__ == "__main__"``
+    guard). Calls are serialized; each one already uses every worker.
+    """
+
+    def __init__(self, workers: Optional[int] = None, shards: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = shards or self.workers
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        self._engine: Optional[ScoringEngine] = None
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _publish(self, engine: ScoringEngine):
+        if engine is self._engine:
+            return
+        segment = _share(engine)
+        if self._segment is not None:
+            self._segment.unlink()  # Workers and the old engine keep their mappings until released
+        self._engine, self._segment = engine, segment
+
+    def top_matches_batch(self, engine: ScoringEngine, tasks: Sequence[Task],
+                          top_n: int = 3) -> List[List[Tuple[int, float]]]:
+        """ScoringEngine.top_matches for every task, scored shard by shard in parallel"""
+        if top_n <= 0 or engine.size == 0:
+            return [[] for _ in tasks]
+        specs = [_spec(task) for task in tasks]
+        step = -(-engine.size // self.shards)
+        with self._lock:
+            self._publish(engine)
+            futures = [self._pool.submit(_score_shard, self._segment.name, dict(engine.weights),
+                                         start, min(start + step, engine.size), specs, top_n)
+                       for start in range(0, engine.size, step)]
+            shard_results = [future.result() for future in futures]
+
+        merged = []
+        for i in range(len(specs)):
+            candidates = [match for shard in shard_results for match in shard[i]]
+            candidates.sort(key=lambda match: (-match[1], match[0]))
+            merged.append(candidates[:top_n])
+        return merged
+
+    def top_matches(self, engine: ScoringEngine, task: Task, top_n: int = 3) -> List[Tuple[int, float]]:
+        return self.top_matches_batch(engine, [task], top_n)[0]
+
+    def close(self):
+        with self._lock:
+            self._pool.shutdown()
+            if self._segment is not None:
+                self._segment.unlink()
+                self._segment = None
+            self._engine = None
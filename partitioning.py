@@ -0,0 +1,351 @@
+"""Partitioned assignment: one TaskAssignmentSystem per team.
+
+Employees and tasks are tagged with a partition key (a department, a
+team, a region) when they are added. Every partition is a complete
+TaskAssignmentSystem with its own storage, skill and capacity indexes,
+score cache and locks, plus one worker thread that runs its assignments.
+Scoring a task only looks at its own partition's roster, and partitions
+never wait on each other's locks, so matching cost follows the size of
+the team rather than of the organisation.
+
+When a partition has nobody who can take a task, it can be *borrowed*:
+the other partitions are asked for their best match, and the task moves
+to the partition with the highest-scoring candidate and is assigned
+there. A borrowed task stays with the lending partition, which carries
+the workload, until it is removed; ``borrowed`` maps it to its home.
+
+    system = PartitionedAssignmentSystem()
+    system.add_employee(alice, "platform")
+    system.add_task(task, "platform")
+    system.assign_task(task.task_id)              # Platform first, then borrow
+    system.assign_many(mode="batch")              # All partitions in parallel
+"""
+import threading
+from collections import ChainMap
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from models import Employee, Task
+from task_assignment import AssignmentResult, TaskAssignmentSystem
+
+ASSIGN_MODES = ("greedy", "batch", "deadline")
+
+
+class PartitionedAssignmentSystem:
+    """Routes employees and tasks to per-partition TaskAssignmentSystems.
+
+    ``partition_key`` derives the partition of an employee or task added
+    without an explicit one; ``system_factory`` builds the system of a new
+    partition (e.g. to give each its own SQLiteStorage). With ``borrow``
+    off, tasks are only ever assigned within their own partition.
+    Thread-safe: work on one partition runs on its worker thread.
+    """
+
+    def __init__(self, partition_key: Callable[[object], Hashable] = None,
+                 system_factory: Callable[[Hashable], TaskAssignmentSystem] = None,
+                 borrow: bool = True, verbose: bool = True):
+        self.verbose = verbose
+        self.borrow = borrow
+        self.partition_key = partition_key
+        self.system_factory = system_factory or (lambda key: TaskAssignmentSystem(verbose=verbose))
+        self.partitions: Dict[Hashable, TaskAssignmentSystem] = {}
+        self.borrowed: Dict[str, Hashable] = {}  # Borrowed task ID -> home partition
+        self._workers: Dict[Hashable, ThreadPoolExecutor] = {}
+        self._employee_partition: Dict[str, Hashable] = {}
+        self._task_partition: Dict[str, Hashable] = {}
+        self._routing_lock = threading.RLock()  # Guards the routing tables and partition list
+
+    def _report(self, message: str = ""):
+        if self.verbose:
+            print(message)
+
+    # Partitions and routing
+
+    def add_partition(self, key: Hashable) -> TaskAssignmentSystem:
+        """The system of partition ``key``, created (with its worker) on first use"""
+        with self._routing_lock:
+            system = self.partitions.get(key)
+            if system is None:
+                system = self.partitions[key] = self.system_factory(key)
+                self._workers[key] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"partition-{key}")
+            return system
+
+    def submit(self, key: Hashable, function: Callable, *args, **kwargs) -> Future:
+        """Run ``function`` on partition ``key``'s worker thread"""
+        return self._workers[key].submit(function, *args, **kwargs)
+
+    def close(self):
+        """Stop the worker threads after their queued work"""
+        for worker in self._workers.values():
+            worker.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def partition_of_employee(self, emp_id: str) -> Optional[Hashable]:
+        return self._employee_partition.get(emp_id)
+
+    def partition_of_task(self, task_id: str) -> Optional[Hashable]:
+        """Partition currently holding the task (the lender's, once borrowed)"""
+        return self._task_partition.get(task_id)
+
+    def _resolve(self, obj, partition: Optional[Hashable]) -> Hashable:
+        if partition is not None:
+            return partition
+        if self.partition_key is None:
+            raise ValueError("No partition given and no partition_key to derive one")
+        return self.partition_key(obj)
+
+    @property
+    def employees(self) -> ChainMap:
+        """Read-only view of every partition's employees"""
+        return ChainMap(*(system.employees for system in list(self.partitions.values())))
+
+    @property
+    def tasks(self) -> ChainMap:
+        """Read-only view of every partition's tasks"""
+        return ChainMap(*(system.tasks for system in list(self.partitions.values())))
+
+    @property
+    def version(self) -> int:
+        """Increases with every change to any partition"""
+        return sum(system.version for system in list(self.partitions.values()))
+
+    # Roster and backlog
+
+    def add_employee(self, employee: Employee, partition: Hashable = None) -> bool:
+        """Add (or replace) an employee in a partition, moving them if they were in another one
+
+        Fails if moving would leave assigned tasks behind.
+        """
+        key = self._resolve(employee, partition)
+        with self._routing_lock:
+            current = self._employee_partition.get(employee.emp_id)
+            if current is not None and current != key:
+                if not self.partitions[current].remove_employee(employee.emp_id):
+                    return False
+            self.add_partition(key).add_employee(employee)
+            self._employee_partition[employee.emp_id] = key
+        return True
+
+    def add_task(self, task: Task, partition: Hashable = None) -> bool:
+        """Add (or replace) a task in a partition, moving it if it was in another one
+
+        Fails if the task is assigned in another partition.
+        """
+        key = self._resolve(task, partition)
+        with self._routing_lock:
+            current = self._task_partition.get(task.task_id)
+            if current is not None and current != key:
+                if not self.partitions[current].remove_task(task.task_id):
+                    return False
+            self.add_partition(key).add_task(task)
+            self._task_partition[task.task_id] = key
+            self.borrowed.pop(task.task_id, None)
+        return True
+
+    def remove_employee(self, emp_id: str) -> bool:
+        """Remove an employee who has no assigned tasks"""
+        with self._routing_lock:
+            key = self._employee_partition.get(emp_id)
+            if key is None:
+                self._report(f"Employee {emp_id} not found")
+                return False
+            if not self.partitions[key].remove_employee(emp_id):
+                return False
+            del self._employee_partition[emp_id]
+            return True
+
+    def remove_task(self, task_id: str) -> bool:
+        """Remove a task that is not assigned"""
+        with self._routing_lock:
+            key = self._task_partition.get(task_id)
+            if key is None:
+                self._report(f"Task {task_id} not found")
+                return False
+            if not self.partitions[key].remove_task(task_id):
+                return False
+            del self._task_partition[task_id]
+            self.borrowed.pop(task_id, None)
+            return True
+
+    # Matching
+
+    def find_best_matches(self, task: Task, top_n: int = 3,
+                          borrow: bool = False) -> List[Tuple[Employee, float]]:
+        """Best matches within the task's partition, or across all partitions with ``borrow``
+
+        Across partitions, ties go to the task's own partition, then to
+        partitions in the order they were created.
+        """
+        home = self._task_partition.get(task.task_id)
+        if home is None:
+            raise KeyError(f"Task {task.task_id} is not in any partition")
+        if not borrow:
+            return self.partitions[home].find_best_matches(task, top_n)
+        ranked = []
+        for order, (key, system) in enumerate(self._by_preference(home)):
+            ranked.extend((-probability, order, i, employee)
+                          for i, (employee, probability) in enumerate(system.find_best_matches(task, top_n)))
+        ranked.sort(key=lambda entry: entry[:3])
+        return [(employee, -neg_probability) for neg_probability, _, _, employee in ranked[:top_n]]
+
+    def _by_preference(self, home: Hashable) -> List[Tuple[Hashable, TaskAssignmentSystem]]:
+        partitions = list(self.partitions.items())
+        return [(home, self.partitions[home])] + [(key, system) for key, system in partitions if key != home]
+
+    # Assignment
+
+    def assign_task(self, task_id: str, employee_id: str = None) -> bool:
+        """Assign a task within its partition, borrowing from another one if needed
+
+        With ``employee_id`` from another partition, the task is borrowed by
+        that employee's partition.
+        """
+        result = self.try_assign(task_id, employee_id)
+        self._report(result.message)
+        return result.ok
+
+    def try_assign(self, task_id: str, employee_id: str = None,
+                   borrow: bool = None) -> AssignmentResult:
+        """assign_task without printing: returns an AssignmentResult"""
+        home = self._task_partition.get(task_id)
+        if home is None:
+            return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
+        if employee_id is not None:
+            lender = self._employee_partition.get(employee_id)
+            if lender is None:
+                return AssignmentResult(task_id, None, False, f"Employee {employee_id} not found")
+            if lender != home:
+                return self.submit(lender, self._transfer_and_assign, task_id, home, lender, employee_id).result()
+        result = self.submit(home, self.partitions[home].try_assign, task_id, employee_id).result()
+        if result.ok or employee_id is not None or not (self.borrow if borrow is None else borrow):
+            return result
+        return self._borrow(task_id, home) or result
+
+    def _borrow(self, task_id: str, home: Hashable) -> Optional[AssignmentResult]:
+        """Assign a task its partition could not place to another partition's best candidate"""
+        task = self.partitions[home].tasks.get(task_id)
+        if task is None or task.assigned_to or task.is_completed:
+            return None
+        offers = []
+        for order, (key, system) in enumerate(self._by_preference(home)[1:]):
+            matches = system.find_best_matches(task, 1)
+            if matches:
+                offers.append((-matches[0][1], order, key))
+        for _, _, lender in sorted(offers):
+            result = self.submit(lender, self._transfer_and_assign, task_id, home, lender).result()
+            if result.ok or task.assigned_to:
+                return result
+        return None
+
+    def _transfer_and_assign(self, task_id: str, home: Hashable, lender: Hashable,
+                             employee_id: str = None) -> AssignmentResult:
+        """Move an open task from ``home`` to ``lender`` and assign it there; moves it back on failure
+
+        Runs on the lender's worker.
+        """
+        source, target = self.partitions[home], self.partitions[lender]
+        with self._routing_lock:
+            task = source.tasks.get(task_id)
+            if task is None or self._task_partition.get(task_id) != home:
+                return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
+            if not source.remove_task(task_id):
+                return AssignmentResult(task_id, task.assigned_to, False,
+                                        f"Task {task_id} is already assigned to {task.assigned_to}")
+            target.add_task(task)
+            self._task_partition[task_id] = lender
+
+        result = target.try_assign(task_id, employee_id)
+        with self._routing_lock:
+            if result.ok:
+                self.borrowed[task_id] = home
+            elif self._task_partition.get(task_id) == lender and target.remove_task(task_id):
+                source.add_task(task)
+                self._task_partition[task_id] = home
+        return result
+
+    def assign_many(self, task_ids: List[str] = None, mode: str = "greedy",
+                    borrow: bool = None) -> Dict[str, str]:
+        """Assign many tasks (default: every open one), all partitions in parallel
+
+        Each partition places its own tasks on its worker: in order
+        (greedy), by global best-first matching (batch, see assign_batch) or
+        earliest deadline first (deadline, see assign_by_deadline). Tasks
+        still open afterwards are then offered to other partitions, in the
+        order given. Returns a mapping of task ID to employee ID.
+        """
+        if mode not in ASSIGN_MODES:
+            raise ValueError(f"Unknown assignment mode: {mode}")
+        if task_ids is None:
+            task_ids = [task_id for task_id, task in self.tasks.items()
+                        if not task.assigned_to and not task.is_completed]
+
+        groups: Dict[Hashable, List[str]] = {}
+        for task_id in dict.fromkeys(task_ids):
+            key = self._task_partition.get(task_id)
+            if key is not None:
+                groups.setdefault(key, []).append(task_id)
+        futures = [self.submit(key, self._assign_partition, key, ids, mode) for key, ids in groups.items()]
+        assignments = {}
+        for future in futures:
+            assignments.update(future.result())
+
+        if self.borrow if borrow is None else borrow:
+            for task_id in task_ids:
+                key = self._task_partition.get(task_id)
+                if task_id in assignments or key is None:
+                    continue
+                result = self._borrow(task_id, key)
+                if result is not None and result.ok:
+                    assignments[task_id] = result.emp_id
+
+        self._report(f"Assigned {len(assignments)} of {len(task_ids)} tasks "
+                     f"({sum(task_id in self.borrowed for task_id in assignments)} borrowed)")
+        return assignments
+
+    def _assign_partition(self, key: Hashable, task_ids: List[str], mode: str) -> Dict[str, str]:
+        system = self.partitions[key]
+        if mode == "batch":
+            return system.assign_batch(task_ids)
+        if mode == "deadline":
+            return system.assign_by_deadline(task_ids)
+        assignments = {}
+        for task_id in task_ids:
+            result = system.try_assign(task_id)
+            if result.ok:
+                assignments[task_id] = result.emp_id
+        return assignments
+
+    def complete_task(self, task_id: str) -> bool:
+        """Mark an assigned task as done, releasing its hours from the assignee's workload"""
+        result = self.try_complete(task_id)
+        self._report(result.message)
+        return result.ok
+
+    def try_complete(self, task_id: str) -> AssignmentResult:
+        """complete_task without printing: returns an AssignmentResult"""
+        key = self._task_partition.get(task_id)
+        if key is None:
+            return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
+        return self.submit(key, self.partitions[key].try_complete, task_id).result()
+
+    def summary(self) -> Dict[Hashable, Dict[str, int]]:
+        """Per-partition employee, task and open task counts, and tasks borrowed in and out"""
+        with self._routing_lock:
+            borrowed = list(self.borrowed.items())
+            partitions = list(self.partitions.items())
+        summary = {}
+        for key, system in partitions:
+            tasks = list(system.tasks.values())
+            summary[key] = {
+                'employees': len(system.employees),
+                'tasks': len(tasks),
+                'open_tasks': sum(not task.assigned_to and not task.is_completed for task in tasks),
+                'borrowed_in': sum(self._task_partition.get(task_id) == key for task_id, _ in borrowed),
+                'borrowed_out': sum(home == key for _, home in borrowed),
+            }
+        return summary
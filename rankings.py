@@ -0,0 +1,320 @@
+"""Materialized per-task candidate rankings, maintained incrementally.
+
+Every open (unassigned) task keeps its best ``depth`` candidates as a sorted
+list of (-probability, roster position, employee) entries, plus a bound: the
+best key any employee outside the list can have. Ties keep roster order, as
+in find_best_matches, so serving the first ``top_n`` entries gives exactly
+what find_best_matches would return while the list holds at least ``top_n``
+entries (or no outsider can place at all). Only when a list runs short is
+its task re-scored against the roster.
+
+Changes are scored as deltas:
+
+- a new or changed employee is scored against the open tasks only, and
+  only where it could enter a list;
+- a new or changed task is scored against the employees;
+- an assignment only re-ranks the assignee's own entries, since a higher
+  workload can only lower their scores; a completion re-scores the
+  assignee against the open tasks, since it can raise them.
+"""
+import math
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models import Employee, Task, TaskPriority
+from task_assignment import PRIORITY_PERFORMANCE_THRESHOLDS
+
+NO_BOUND = (0.0, math.inf)  # Bound of a list no outsider can join
+
+_PRIORITIES = list(TaskPriority)
+
+
+def _group(task: Task) -> int:
+    """Tasks in one group give the same score to an employee holding none of their skills"""
+    return _PRIORITIES.index(task.priority) + (len(_PRIORITIES) if not task.required_skills else 0)
+
+
+class CandidateRankings:
+    """Top ``depth`` candidates of every open task; thread-safe
+
+    TaskAssignmentSystem calls the hooks after each change and serves
+    find_best_matches from top_matches() while the rankings are enabled.
+    """
+
+    def __init__(self, system, depth: int = 10):
+        self.system = system
+        self.depth = depth
+        self.refreshes = 0  # Tasks (re-)scored against the whole roster
+        self.served = 0  # Requests answered straight from a list
+        self._slots: Dict[str, int] = {}  # task_id -> slot
+        self._tasks: List[Optional[Task]] = []
+        self._entries: List[List[Tuple[float, int, Employee]]] = []
+        self._free: List[int] = []
+        self._members: Dict[str, Dict[int, Tuple[float, int]]] = {}  # emp_id -> {slot: key}
+        self._task_skills: Dict[str, set] = {}  # skill -> slots of open tasks requiring it
+        self._slot_skills: List[tuple] = []  # Skills each slot is indexed under in _task_skills
+        # Per-slot columns for scoring one employee against every open task at once
+        self._hours = np.zeros(0, dtype=np.float64)
+        self._groups = np.zeros(0, dtype=np.int64)
+        self._bound_neg = np.zeros(0, dtype=np.float64)
+        self._bound_pos = np.zeros(0, dtype=np.float64)
+        self._open = np.zeros(0, dtype=bool)
+        self._updates = 0  # Increases with every hook, to detect races with refreshes
+        self._lock = threading.RLock()
+
+    def rebuild(self, tasks):
+        """Rank every open task from scratch (done once, when first requested)"""
+        tasks = [task for task in tasks if not task.assigned_to and not task.is_completed]
+        ranked = self.system.find_best_matches_batch(tasks, self.depth + 1)
+        with self._lock:
+            for task, matches in zip(tasks, ranked):
+                self._install(self._add_slot(task), matches)
+
+    # Slot maintenance (lock held)
+
+    def _add_slot(self, task: Task) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._tasks)
+            self._tasks.append(None)
+            self._entries.append([])
+            self._slot_skills.append(())
+            if slot >= len(self._open):
+                size = max(16, 2 * len(self._open))
+                for name in ('_hours', '_groups', '_bound_neg', '_bound_pos', '_open'):
+                    column = getattr(self, name)
+                    grown = np.zeros(size, dtype=column.dtype)
+                    grown[:len(column)] = column
+                    setattr(self, name, grown)
+        self._slots[task.task_id] = slot
+        self._tasks[slot] = task
+        self._hours[slot] = task.estimated_hours
+        self._groups[slot] = _group(task)
+        self._bound_neg[slot], self._bound_pos[slot] = NO_BOUND
+        self._open[slot] = True
+        # Kept, since by the time task_changed runs required_skills is already the new set
+        self._slot_skills[slot] = tuple(task.required_skills)
+        for skill_name in self._slot_skills[slot]:
+            self._task_skills.setdefault(skill_name, set()).add(slot)
+        return slot
+
+    def _drop_slot(self, task_id: str):
+        slot = self._slots.pop(task_id, None)
+        if slot is None:
+            return
+        self._clear(slot)
+        for skill_name in self._slot_skills[slot]:
+            slots = self._task_skills.get(skill_name)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._task_skills[skill_name]
+        self._tasks[slot] = None
+        self._slot_skills[slot] = ()
+        self._open[slot] = False
+        self._free.append(slot)
+
+    def _clear(self, slot: int):
+        for _, _, employee in self._entries[slot]:
+            self._forget(employee.emp_id, slot)
+        self._entries[slot] = []
+
+    def _forget(self, emp_id: str, slot: int):
+        slots = self._members.get(emp_id)
+        if slots is not None:
+            slots.pop(slot, None)
+            if not slots:
+                del self._members[emp_id]
+
+    def _install(self, slot: int, matches: List[Tuple[Employee, float]]):
+        """Replace a list with fresh find_best_matches results (``depth + 1`` of them)"""
+        self._clear(slot)
+        position = self.system.skill_index.position
+        employees = self.system.employees
+        entries = self._entries[slot]
+        for employee, probability in matches[:self.depth]:
+            if employees.get(employee.emp_id) is not employee:
+                continue  # Removed or replaced while the task was being scored
+            key = (-probability, position(employee.emp_id))
+            entries.append(key + (employee,))
+            self._members.setdefault(employee.emp_id, {})[slot] = key
+        if len(matches) > self.depth:
+            employee, probability = matches[self.depth]
+            self._bound_neg[slot], self._bound_pos[slot] = -probability, position(employee.emp_id)
+        else:
+            self._bound_neg[slot], self._bound_pos[slot] = NO_BOUND
+
+    def _place(self, slot: int, employee: Employee, position: int, probability: float):
+        """Move ``employee`` to its new key in one list, keeping outsiders behind the bound"""
+        entries = self._entries[slot]
+        old = self._members.get(employee.emp_id, {}).get(slot)
+        if old is not None:
+            del entries[bisect_left(entries, old)]
+            self._forget(employee.emp_id, slot)
+        key = (-probability, position)
+        if probability <= 0 or key >= (self._bound_neg[slot], self._bound_pos[slot]):
+            return  # An outsider no better than the bound: nothing to record
+        insort(entries, key + (employee,))
+        self._members.setdefault(employee.emp_id, {})[slot] = key
+        if len(entries) > self.depth:
+            evicted_neg, evicted_pos, evicted = entries.pop()
+            self._forget(evicted.emp_id, slot)
+            self._bound_neg[slot], self._bound_pos[slot] = evicted_neg, evicted_pos
+
+    def _uncovered_probabilities(self, employee: Employee) -> np.ndarray:
+        """The employee's probability for each task group, where it holds none of the skills"""
+        weights = self.system.assignment_weights
+        availability = employee.get_availability_ratio()
+        performance = min(1.0, employee.performance_rating)
+        probabilities = np.zeros(2 * len(_PRIORITIES), dtype=np.float64)
+        for group in range(len(probabilities)):
+            # Same operations, in the same order, as calculate_assignment_probability
+            if group < len(_PRIORITIES):
+                skill_similarity, experience = 0.0, 0.1
+            else:
+                skill_similarity, experience = 0.5, 0.5
+            required = PRIORITY_PERFORMANCE_THRESHOLDS[_PRIORITIES[group % len(_PRIORITIES)]]
+            priority_match = 1.0 if employee.performance_rating >= required else employee.performance_rating / required
+            weighted_score = (
+                skill_similarity * weights['skill_match'] +
+                availability * weights['availability'] +
+                experience * weights['experience'] +
+                performance * weights['performance'] +
+                priority_match * weights['priority_match']
+            )
+            probabilities[group] = 1 / (1 + math.exp(-5 * (weighted_score - 0.5)))
+        return probabilities
+
+    def _score_employee(self, employee: Employee):
+        """Re-score one employee against every open task it could place on (lock held)"""
+        if self.system.employees.get(employee.emp_id) is not employee:
+            return
+        position = self.system.skill_index.position(employee.emp_id)
+        size = len(self._tasks)
+        members = set(self._members.get(employee.emp_id, ()))
+        covered = set()
+        for skill_name in employee.skills:
+            covered.update(self._task_skills.get(skill_name, ()))
+
+        # Holding none of a task's skills, the score only depends on its group
+        feasible = ~(employee.current_workload + self._hours[:size] > employee.max_workload_hours)
+        negated = -self._uncovered_probabilities(employee)[self._groups[:size]]
+        bound_neg, bound_pos = self._bound_neg[:size], self._bound_pos[:size]
+        beats = (negated < bound_neg) | ((negated == bound_neg) & (position < bound_pos))
+        uncovered = self._open[:size] & feasible & beats
+        if covered:
+            uncovered[np.fromiter(covered, dtype=np.int64, count=len(covered))] = False
+        for slot in np.flatnonzero(uncovered).tolist():
+            self._place(slot, employee, position, float(-negated[slot]))
+
+        probability = self.system.calculate_assignment_probability
+        for slot in covered | members:
+            if slot in covered or not uncovered[slot]:
+                self._place(slot, employee, position, probability(employee, self._tasks[slot]))
+
+    # Hooks called by TaskAssignmentSystem
+
+    def employee_changed(self, employee: Employee):
+        """An employee was added, or their skills or performance changed"""
+        with self._lock:
+            self._updates += 1
+            self._score_employee(employee)
+
+    def employee_removed(self, employee: Employee):
+        with self._lock:
+            self._updates += 1
+            for slot, key in self._members.pop(employee.emp_id, {}).items():
+                entries = self._entries[slot]
+                del entries[bisect_left(entries, key)]
+
+    def workload_released(self, employee: Employee):
+        """Hours came off an employee's workload, which can only raise their scores"""
+        self.employee_changed(employee)
+
+    def task_assigned(self, task: Task, employee: Employee):
+        """Drop the task; the assignee's higher workload only moves their own entries"""
+        with self._lock:
+            self._updates += 1
+            self._drop_slot(task.task_id)
+            if self.system.employees.get(employee.emp_id) is not employee:
+                return
+            position = self.system.skill_index.position(employee.emp_id)
+            probability = self.system.calculate_assignment_probability
+            for slot in list(self._members.get(employee.emp_id, ())):
+                self._place(slot, employee, position, probability(employee, self._tasks[slot]))
+
+    def task_removed(self, task: Task):
+        with self._lock:
+            self._updates += 1
+            self._drop_slot(task.task_id)
+
+    def task_changed(self, task: Task):
+        """A task was added, or its requirements or priority changed"""
+        with self._lock:
+            self._updates += 1
+            self._drop_slot(task.task_id)
+        self._refresh(task)
+
+    task_added = task_changed
+
+    def _refresh(self, task: Task) -> Optional[List[Tuple[Employee, float]]]:
+        """Score an open task against the roster and store its list
+
+        Scoring runs without the lock; if a hook fires meanwhile the result
+        may be stale, so it is scored again. Returns the fresh matches.
+        """
+        matches = None
+        for _ in range(3):
+            with self._lock:
+                if task.assigned_to or task.is_completed or self.system.tasks.get(task.task_id) is not task:
+                    self._drop_slot(task.task_id)
+                    return matches
+                updates = self._updates
+            matches = self.system.find_best_matches_batch([task], self.depth + 1)[0]
+            with self._lock:
+                if self._updates != updates:
+                    continue
+                self.refreshes += 1
+                slot = self._slots.get(task.task_id)
+                if slot is None:
+                    slot = self._add_slot(task)
+                self._install(slot, matches)
+                return matches
+        return matches
+
+    # Queries
+
+    def top_matches(self, task: Task, top_n: int = 3) -> Optional[List[Tuple[Employee, float]]]:
+        """find_best_matches(task, top_n) from the task's list
+
+        None if the task is not open or ``top_n`` exceeds ``depth``.
+        """
+        if top_n > self.depth:
+            return None
+        with self._lock:
+            slot = self._slots.get(task.task_id)
+            if slot is None or self._tasks[slot] is not task:
+                return None
+            entries = self._entries[slot]
+            if len(entries) >= top_n or (self._bound_neg[slot], self._bound_pos[slot]) == NO_BOUND:
+                self.served += 1
+                return [(employee, -neg_probability) for neg_probability, _, employee in entries[:top_n]]
+        matches = self._refresh(task)
+        if matches is None:
+            return None
+        return matches[:top_n]
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "open_tasks": len(self._slots),
+                "depth": self.depth,
+                "entries": sum(len(entries) for entries in self._entries),
+                "served": self.served,
+                "refreshes": self.refreshes,
+            }
+
@@ -0,0 +1,245 @@
+"""Deadline-aware placement of assigned work on employees' calendars.
+
+Each employee works ``max_workload_hours / WORKDAYS_PER_WEEK`` hours per
+working day. Their open (assigned, not completed) tasks are queued
+earliest-deadline-first, with each deadline scaled by
+PRIORITY_DEADLINE_WEIGHTS so more urgent priorities move ahead, and worked
+through back to back from day 0 (today). A task is late when it would
+finish after its ``deadline_days``.
+
+TaskAssignmentSystem keeps a Scheduler current: an assignment, completion
+or task change replans only the affected employee's queue, never the
+whole plan.
+"""
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from models import Employee, Task, TaskPriority
+
+WORKDAYS_PER_WEEK = 5
+
+# A CRITICAL task due in 10 days is queued like a MEDIUM one due in 5
+PRIORITY_DEADLINE_WEIGHTS = {
+    TaskPriority.CRITICAL: 0.5,
+    TaskPriority.HIGH: 0.75,
+    TaskPriority.MEDIUM: 1.0,
+    TaskPriority.LOW: 1.5,
+}
+
+
+def urgency_key(task: Task) -> Tuple[float, int, str]:
+    """Queue order: weighted deadline, then higher priority, then task ID"""
+    return (task.deadline_days * PRIORITY_DEADLINE_WEIGHTS[task.priority], -task.priority.value, task.task_id)
+
+
+def hours_per_day(employee: Employee) -> float:
+    return employee.max_workload_hours / WORKDAYS_PER_WEEK
+
+
+@dataclass
+class Placement:
+    task_id: str
+    emp_id: str
+    start_day: float  # Working days from today, fractional
+    finish_day: float
+    deadline_days: int
+
+    @property
+    def late(self) -> bool:
+        return self.finish_day > self.deadline_days
+
+    @property
+    def slack_days(self) -> float:
+        return self.deadline_days - self.finish_day
+
+
+class Scheduler:
+    """Per-employee EDF queues and the placements they imply; thread-safe
+
+    ``horizon_days`` bounds calendar() and marks placements finishing
+    after it as beyond the horizon in summary().
+    """
+
+    def __init__(self, horizon_days: int = 20):
+        self.horizon_days = horizon_days
+        self.replans = 0  # Employee queues re-solved so far
+        self._queues: Dict[str, List[Tuple[float, int, str]]] = {}  # emp_id -> sorted urgency keys
+        self._keys: Dict[str, Tuple[float, int, str]] = {}  # task_id -> its key in the queue
+        self._tasks: Dict[str, Task] = {}
+        self._owners: Dict[str, str] = {}  # task_id -> emp_id
+        self._capacity: Dict[str, float] = {}  # emp_id -> hours per day
+        self._placements: Dict[str, Placement] = {}
+        self._late: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def rebuild(self, employees: Iterable[Employee], tasks: Iterable[Task]):
+        """Plan everything from scratch (done once, when first requested)"""
+        with self._lock:
+            for employee in employees:
+                self._capacity[employee.emp_id] = hours_per_day(employee)
+            for task in tasks:
+                if task.assigned_to and not task.is_completed and task.assigned_to in self._capacity:
+                    self._enqueue(task, task.assigned_to)
+            for queue in self._queues.values():
+                queue.sort()
+            for emp_id in self._queues:
+                self._replan(emp_id)
+
+    # Queue maintenance (lock held)
+
+    def _enqueue(self, task: Task, emp_id: str, keep_sorted: bool = False):
+        key = self._keys[task.task_id] = urgency_key(task)
+        queue = self._queues.setdefault(emp_id, [])
+        if keep_sorted:
+            insort(queue, key)
+        else:
+            queue.append(key)
+        self._tasks[task.task_id] = task
+        self._owners[task.task_id] = emp_id
+
+    def _dequeue(self, task_id: str) -> Optional[str]:
+        emp_id = self._owners.pop(task_id, None)
+        if emp_id is None:
+            return None
+        queue = self._queues[emp_id]
+        del queue[bisect_left(queue, self._keys.pop(task_id))]
+        if not queue:
+            del self._queues[emp_id]
+        del self._tasks[task_id]
+        self._placements.pop(task_id, None)
+        self._late.discard(task_id)
+        return emp_id
+
+    def _replan(self, emp_id: str):
+        self.replans += 1
+        daily = self._capacity.get(emp_id, 0.0)
+        worked = 0.0
+        for _, _, task_id in self._queues.get(emp_id, ()):
+            task = self._tasks[task_id]
+            start = worked / daily if daily > 0 else float("inf")
+            worked += task.estimated_hours
+            finish = worked / daily if daily > 0 else float("inf")
+            placement = self._placements[task_id] = Placement(task_id, emp_id, start, finish, task.deadline_days)
+            if placement.late:
+                self._late.add(task_id)
+            else:
+                self._late.discard(task_id)
+
+    # Hooks called by TaskAssignmentSystem
+
+    def employee_changed(self, employee: Employee):
+        """An employee was added or replaced; capacity may differ"""
+        with self._lock:
+            self._capacity[employee.emp_id] = hours_per_day(employee)
+            if employee.emp_id in self._queues:
+                self._replan(employee.emp_id)
+
+    def employee_removed(self, employee: Employee):
+        with self._lock:
+            self._capacity.pop(employee.emp_id, None)
+
+    def task_assigned(self, task: Task, employee: Employee):
+        with self._lock:
+            self._dequeue(task.task_id)
+            self._enqueue(task, employee.emp_id, keep_sorted=True)
+            self._replan(employee.emp_id)
+
+    def task_completed(self, task: Task):
+        """Drop a completed (or removed) task and move the rest of its queue up"""
+        with self._lock:
+            emp_id = self._dequeue(task.task_id)
+            if emp_id is not None and emp_id in self._queues:
+                self._replan(emp_id)
+
+    task_removed = task_completed
+
+    def task_changed(self, task: Task):
+        """Re-queue a task whose priority, deadline or hours may have changed"""
+        with self._lock:
+            emp_id = self._dequeue(task.task_id)
+            if emp_id is not None:
+                self._enqueue(task, emp_id, keep_sorted=True)
+                self._replan(emp_id)
+
+    # Queries
+
+    def placement(self, task_id: str) -> Optional[Placement]:
+        with self._lock:
+            return self._placements.get(task_id)
+
+    def plan(self, emp_id: str) -> List[Placement]:
+        """An employee's open tasks in the order they will be worked on"""
+        with self._lock:
+            return [self._placements[task_id] for _, _, task_id in self._queues.get(emp_id, ())]
+
+    def late_tasks(self) -> List[Placement]:
+        """Placements finishing after their deadline, most overdue first"""
+        with self._lock:
+            return sorted((self._placements[task_id] for task_id in self._late), key=lambda p: p.slack_days)
+
+    def finish_if_added(self, employee: Employee, task: Task) -> Tuple[float, int]:
+        """(finish day of ``task``, on-time tasks it would make late) if queued for ``employee``"""
+        daily = hours_per_day(employee)
+        if daily <= 0:
+            return float("inf"), 0
+        with self._lock:
+            queue = self._queues.get(employee.emp_id, ())
+            position = bisect_left(queue, urgency_key(task))
+            worked = sum(self._tasks[task_id].estimated_hours for _, _, task_id in queue[:position])
+            delay = task.estimated_hours / daily
+            pushed_late = sum(1 for _, _, task_id in queue[position:]
+                              if not self._placements[task_id].late
+                              and self._placements[task_id].finish_day + delay > self._placements[task_id].deadline_days)
+        return (worked + task.estimated_hours) / daily, pushed_late
+
+    def calendar(self, emp_id: str, days: int = None) -> List[List[Tuple[str, float]]]:
+        """Hours per task on each working day, for the first ``days`` (default horizon_days) days"""
+        days = self.horizon_days if days is None else days
+        with self._lock:
+            daily = self._capacity.get(emp_id, 0.0)
+            calendar: List[List[Tuple[str, float]]] = [[] for _ in range(days)]
+            if daily <= 0:
+                return calendar
+            day, free = 0, daily
+            for _, _, task_id in self._queues.get(emp_id, ()):
+                remaining = self._tasks[task_id].estimated_hours
+                while remaining > 1e-9 and day < days:
+                    hours = min(remaining, free)
+                    calendar[day].append((task_id, hours))
+                    remaining -= hours
+                    free -= hours
+                    if free <= 1e-9:
+                        day, free = day + 1, daily
+            return calendar
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "open_tasks": len(self._placements),
+                "late_tasks": len(self._late),
+                "beyond_horizon": sum(1 for placement in self._placements.values()
+                                      if placement.finish_day > self.horizon_days),
+                "employees_with_work": len(self._queues),
+                "replans": self.replans,
+            }
+
+
+def choose_employee(scheduler: Scheduler, task: Task, candidates: Sequence[Employee],
+                    has_capacity) -> Optional[Employee]:
+    """First candidate (best match first) that finishes ``task`` on time without making
+    others late; else the first that finishes it on time; else the first with capacity"""
+    on_time = fallback = None
+    for employee in candidates:
+        if not has_capacity(employee, task):
+            continue
+        if fallback is None:
+            fallback = employee
+        finish, pushed_late = scheduler.finish_if_added(employee, task)
+        if finish <= task.deadline_days:
+            if not pushed_late:
+                return employee
+            if on_time is None:
+                on_time = employee
+    return on_time or fallback
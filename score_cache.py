@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+# (skill_similarity, experience, priority_match) for one (emp_id, task_id) pair
+StaticComponents = Tuple[float, float, float]
+
+
+class ScoreComponentCache:
+    """Bounded LRU cache of the workload-independent score components.
+
+    Skill similarity, experience and priority match depend only on the
+    employee's skills and performance rating and on the task definition, so
+    they survive assignments. Entries are dropped per employee or per task
+    when those inputs change. All methods are thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # Bumped by every invalidation
+        self._entries: "OrderedDict[Tuple[str, str], StaticComponents]" = OrderedDict()
+        self._keys_by_employee: Dict[str, Set[Tuple[str, str]]] = {}
+        self._keys_by_task: Dict[str, Set[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, emp_id: str, task_id: str) -> Optional[StaticComponents]:
+        with self._lock:
+            key = (emp_id, task_id)
+            components = self._entries.get(key)
+            if components is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return components
+
+    def put(self, emp_id: str, task_id: str, components: StaticComponents,
+            generation: Optional[int] = None):
+        """Store components computed when ``generation`` was current
+
+        The entry is dropped if an invalidation happened in the meantime, so a
+        concurrent skill change can never leave stale scores behind.
+        """
+        with self._lock:
+            if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+                return
+            key = (emp_id, task_id)
+            if key not in self._entries:
+                self._keys_by_employee.setdefault(emp_id, set()).add(key)
+                self._keys_by_task.setdefault(task_id, set()).add(key)
+            self._entries[key] = components
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                oldest, _ = self._entries.popitem(last=False)
+                self._forget(oldest)
+
+    def invalidate_employee(self, emp_id: str):
+        with self._lock:
+            self.generation += 1
+            for key in self._keys_by_employee.pop(emp_id, ()):
+                del self._entries[key]
+                self._discard(self._keys_by_task, key[1], key)
+
+    def invalidate_task(self, task_id: str):
+        with self._lock:
+            self.generation += 1
+            for key in self._keys_by_task.pop(task_id, ()):
+                del self._entries[key]
+                self._discard(self._keys_by_employee, key[0], key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_employee.clear()
+            self._keys_by_task.clear()
+
+    def _forget(self, key: Tuple[str, str]):
+        self._discard(self._keys_by_employee, key[0], key)
+        self._discard(self._keys_by_task, key[1], key)
+
+    @staticmethod
+    def _discard(keys_by_id: Dict[str, Set[Tuple[str, str]]], owner: str, key: Tuple[str, str]):
+        keys = keys_by_id.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del keys_by_id[owner]
@@ -0,0 +1,458 @@
+"""Asyncio HTTP/JSON service around TaskAssignmentSystem.
+
+Endpoints (request and response bodies are JSON; employee and task bodies use
+the bulk_io JSONL record format):
+
+    GET    /health
+    GET    /stats                           request and batching counters
+    GET    /metrics                         Prometheus text (needs --instrument)
+    GET    /employees?offset=0&limit=100
+    POST   /employees                       create (409 if the ID exists)
+    GET    /employees/{emp_id}
+    PUT    /employees/{emp_id}              replace, keeping current assignments
+    DELETE /employees/{emp_id}              only without assigned tasks
+    GET    /tasks?offset=0&limit=100
+    POST   /tasks
+    GET    /tasks/{task_id}
+    PUT    /tasks/{task_id}                 only while unassigned
+    DELETE /tasks/{task_id}                 only while unassigned
+    GET    /tasks/{task_id}/recommendations?top_n=3
+    POST   /tasks/{task_id}/assign          {"employee_id": "..."} or {} to auto-assign
+    POST   /tasks/{task_id}/complete        releases the hours from the assignee's workload
+    GET    /employees/{emp_id}/schedule     open tasks in planned order (see scheduling.py)
+
+Recommendation requests arriving within ``batch_window`` seconds of each
+other are coalesced into one find_best_matches_batch call, so a burst of
+callers costs one trip to the scoring engine instead of one each. All system
+calls run in worker threads; the system's own locking keeps them safe.
+
+Run with ``python service.py --port 8080 [--db task_system.db | --journal DIR]``.
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import bulk_io
+from models import Employee, Task
+from task_assignment import TaskAssignmentSystem
+
+MAX_BODY_BYTES = 1 << 20
+
+# Path shape ("{id}" stands for any ID) -> allowed methods; other paths are 404s
+_ROUTES = {
+    ("health",): ("GET",),
+    ("stats",): ("GET",),
+    ("metrics",): ("GET",),
+    ("employees",): ("GET", "POST"),
+    ("employees", "{id}"): ("GET", "PUT", "DELETE"),
+    ("employees", "{id}", "schedule"): ("GET",),
+    ("tasks",): ("GET", "POST"),
+    ("tasks", "{id}"): ("GET", "PUT", "DELETE"),
+    ("tasks", "{id}", "recommendations"): ("GET",),
+    ("tasks", "{id}", "assign"): ("POST",),
+    ("tasks", "{id}", "complete"): ("POST",),
+}
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RecommendationBatcher:
+    """Coalesces concurrent recommendation requests into batched scoring calls.
+
+    The first request of a batch starts a ``window``-second timer; requests
+    arriving before it fires (or until ``max_batch`` is reached) are scored
+    together in a worker thread. Each request gets the prefix of the batch
+    ranking it asked for, which is identical to its own find_best_matches.
+    """
+
+    def __init__(self, system: TaskAssignmentSystem, window: float = 0.002, max_batch: int = 64):
+        self.system = system
+        self.window = window
+        self.max_batch = max_batch
+        self.requests = 0
+        self.batches = 0
+        self._pending: List[Tuple[Task, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def recommend(self, task: Task, top_n: int) -> List[Tuple[Employee, float]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((task, top_n, future))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self.batches += 1
+            asyncio.get_running_loop().create_task(self._score(batch))
+
+    async def _score(self, batch: List[Tuple[Task, int, asyncio.Future]]):
+        tasks = [task for task, _, _ in batch]
+        top_n = max(top_n for _, top_n, _ in batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self.system.find_best_matches_batch, tasks, top_n)
+        except Exception as error:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, wanted, future), matches in zip(batch, results):
+            if not future.done():
+                future.set_result(matches[:wanted])
+
+
+def _match_record(employee: Employee, probability: float) -> dict:
+    return {
+        "emp_id": employee.emp_id,
+        "name": employee.name,
+        "probability": probability,
+        "current_workload": employee.current_workload,
+        "max_workload_hours": employee.max_workload_hours,
+    }
+
+
+def _int_param(query: Dict[str, List[str]], name: str, default: int, minimum: int = 0) -> int:
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if value < minimum:
+        raise HTTPError(400, f"{name} must be at least {minimum}")
+    return value
+
+
+class AssignmentService:
+    """Routes HTTP requests to a TaskAssignmentSystem"""
+
+    def __init__(self, system: TaskAssignmentSystem, batch_window: float = 0.002, max_batch: int = 64):
+        self.system = system
+        self.batcher = RecommendationBatcher(system, batch_window, max_batch)
+        self.requests_served = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    # HTTP plumbing
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one keep-alive connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    await self._write_response(writer, error.status, {"error": error.message}, False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except Exception as error:  # Keep serving other requests
+                    status, payload = 500, {"error": str(error)}
+                self.requests_served += 1
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "bad Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    # Routing
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        route = tuple(parts[:1]) + ("{id}",) * (len(parts) > 1) + tuple(parts[2:])
+        allowed = _ROUTES.get(route)
+        if allowed is None:
+            raise HTTPError(404, f"no route for {url.path}")
+        if method not in allowed:
+            raise HTTPError(405, f"{method} not allowed on {url.path}")
+        query = parse_qs(url.query)
+        data = self._json_body(body) if body else {}
+        kind, key = parts[0], parts[1] if len(parts) > 1 else None
+
+        if route == ("health",):
+            return 200, {"status": "ok"}
+        if route == ("stats",):
+            return 200, self.stats()
+        if route == ("metrics",):
+            if self.system.instrumentation is None:
+                raise HTTPError(404, "instrumentation is disabled")
+            return 200, self.system.instrumentation.prometheus_text()
+        if len(route) == 1:
+            if method == "GET":
+                return 200, await self._call(self._list, kind, query)
+            return await self._call(self._create, kind, data)
+        if len(route) == 2:
+            if method == "GET":
+                return 200, await self._call(self._get, kind, key)
+            if method == "PUT":
+                return await self._call(self._replace, kind, key, data)
+            return await self._call(self._delete, kind, key)
+        action = route[2]
+        if action == "recommendations":
+            return 200, await self._recommend(key, _int_param(query, "top_n", 3, 1))
+        if action == "assign":
+            return await self._call(self._assign, key, data.get("employee_id"))
+        if action == "complete":
+            return await self._call(self._complete, key)
+        return 200, await self._call(self._schedule, key)
+
+    @staticmethod
+    def _json_body(body: bytes) -> dict:
+        try:
+            data = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise HTTPError(400, f"invalid JSON: {error}") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "request body must be a JSON object")
+        return data
+
+    @staticmethod
+    async def _call(function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def stats(self) -> dict:
+        batcher = self.batcher
+        return {
+            "requests": self.requests_served,
+            "recommendation_requests": batcher.requests,
+            "recommendation_batches": batcher.batches,
+            "mean_batch_size": batcher.requests / batcher.batches if batcher.batches else 0.0,
+            "employees": len(self.system.employees),
+            "tasks": len(self.system.tasks),
+        }
+
+    # Handlers (run in worker threads, except _recommend)
+
+    def _collection(self, kind: str):
+        return self.system.employees if kind == "employees" else self.system.tasks
+
+    def _record(self, kind: str, obj) -> dict:
+        if kind == "employees":
+            record = bulk_io.employee_record(obj, "jsonl")
+            record["assigned_tasks"] = list(obj.assigned_tasks)
+            return record
+        return bulk_io.task_record(obj, "jsonl")
+
+    def _lookup(self, kind: str, key: str):
+        obj = self._collection(kind).get(key)
+        if obj is None:
+            raise HTTPError(404, f"{kind[:-1].capitalize()} {key} not found")
+        return obj
+
+    def _list(self, kind: str, query: Dict[str, List[str]]) -> dict:
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", 100)
+        collection = self._collection(kind)
+        keys = list(collection)
+        page = [self._record(kind, collection[key]) for key in keys[offset:offset + limit]]
+        return {"total": len(keys), "offset": offset, kind: page}
+
+    def _get(self, kind: str, key: str) -> dict:
+        return self._record(kind, self._lookup(kind, key))
+
+    def _parse(self, kind: str, data: dict):
+        try:
+            return bulk_io.parse_employee(data) if kind == "employees" else bulk_io.parse_task(data)
+        except (ValueError, TypeError, KeyError) as error:
+            raise HTTPError(400, str(error)) from None
+
+    def _create(self, kind: str, data: dict) -> Tuple[int, dict]:
+        obj = self._parse(kind, data)
+        with self.system._write_lock:
+            if kind == "employees":
+                if obj.emp_id in self.system.employees:
+                    raise HTTPError(409, f"Employee {obj.emp_id} already exists")
+                self.system.add_employee(obj)
+            else:
+                if obj.task_id in self.system.tasks:
+                    raise HTTPError(409, f"Task {obj.task_id} already exists")
+                self.system.add_task(obj)
+        return 201, self._record(kind, obj)
+
+    def _replace(self, kind: str, key: str, data: dict) -> Tuple[int, dict]:
+        data = {**data, ("emp_id" if kind == "employees" else "task_id"): key}
+        obj = self._parse(kind, data)
+        with self.system._write_lock:
+            previous = self._lookup(kind, key)
+            with self.system.storage.transaction(), self.system.locks.hold(key):
+                if kind == "employees":
+                    obj.current_workload = previous.current_workload
+                    obj.assigned_tasks = list(previous.assigned_tasks)
+                    self.system.add_employee(obj)
+                else:
+                    if previous.assigned_to:
+                        raise HTTPError(409, f"Task {key} is already assigned to {previous.assigned_to}")
+                    self.system.add_task(obj)
+        return 200, self._record(kind, obj)
+
+    def _delete(self, kind: str, key: str) -> Tuple[int, dict]:
+        with self.system._write_lock:
+            obj = self._lookup(kind, key)
+            if kind == "employees":
+                if obj.assigned_tasks:
+                    raise HTTPError(409, f"Employee {key} still has assigned tasks")
+                removed = self.system.remove_employee(key)
+            else:
+                if obj.assigned_to:
+                    raise HTTPError(409, f"Task {key} is already assigned to {obj.assigned_to}")
+                removed = self.system.remove_task(key)
+        if not removed:
+            raise HTTPError(409, f"could not delete {key}")
+        return 200, {"deleted": key}
+
+    async def _recommend(self, task_id: str, top_n: int) -> dict:
+        task = await self._call(self._lookup, "tasks", task_id)
+        matches = await self.batcher.recommend(task, top_n)
+        return {"task_id": task_id,
+                "matches": [_match_record(employee, probability) for employee, probability in matches]}
+
+    def _assign(self, task_id: str, employee_id: Optional[str]) -> Tuple[int, dict]:
+        task = self._lookup("tasks", task_id)
+        if employee_id is not None:
+            if not isinstance(employee_id, str):
+                raise HTTPError(400, "employee_id must be a string")
+            self._lookup("employees", employee_id)
+        result = self.system.try_assign(task_id, employee_id)
+        return (200 if result.ok else 409), {"assigned": result.ok, "task_id": task_id,
+                                             "assigned_to": task.assigned_to, "message": result.message}
+
+    def _complete(self, task_id: str) -> Tuple[int, dict]:
+        task = self._lookup("tasks", task_id)
+        result = self.system.try_complete(task_id)
+        return (200 if result.ok else 409), {"completed": result.ok, "task_id": task_id,
+                                             "is_completed": task.is_completed, "message": result.message}
+
+    def _schedule(self, emp_id: str) -> dict:
+        self._lookup("employees", emp_id)
+        return {"emp_id": emp_id, "schedule": [
+            {"task_id": placement.task_id, "start_day": placement.start_day,
+             "finish_day": placement.finish_day, "deadline_days": placement.deadline_days,
+             "late": placement.late}
+            for placement in self.system.get_scheduler().plan(emp_id)]}
+
+
+def load_files(system: TaskAssignmentSystem, employees: Optional[str], tasks: Optional[str]):
+    """Import employee and task files (CSV or JSONL, see bulk_io) into ``system``"""
+    for path, importer in ((employees, bulk_io.import_employees), (tasks, bulk_io.import_tasks)):
+        if path:
+            with open(path, newline="") as stream:
+                report = importer(system, stream, bulk_io.detect_format(path))
+            print(f"Imported {report.imported} rows from {path} ({report.failed} failed)")
+
+
+async def serve(args: argparse.Namespace):
+    storage = None
+    if args.db:
+        from storage import SQLiteStorage
+        storage = SQLiteStorage(args.db)
+    elif args.journal:
+        from journal import JournalStorage
+        storage = JournalStorage(args.journal)
+    system = TaskAssignmentSystem(storage=storage, verbose=False)
+    if args.instrument:
+        system.enable_instrumentation()
+    load_files(system, args.employees, args.tasks)
+    service = AssignmentService(system, args.batch_window, args.max_batch)
+    server = await service.start(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        system.storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the task assignment system over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="SQLite database path (default: in-memory)")
+    storage.add_argument("--journal", metavar="DIR",
+                         help="keep state in memory, made durable by a journal and snapshots in DIR")
+    parser.add_argument("--employees", help="CSV/JSONL file of employees to import at startup")
+    parser.add_argument("--tasks", help="CSV/JSONL file of tasks to import at startup")
+    parser.add_argument("--batch-window", type=float, default=0.002,
+                        help="seconds to wait for more recommendation requests before scoring")
+    parser.add_argument("--max-batch", type=int, default=64,
+                        help="score a batch as soon as it holds this many requests (1 disables batching)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="collect per-method timings and serve them at /metrics")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""Monte Carlo evaluation of assignment policies over simulated weeks.
+
+A PolicySimulator replays a stream of task arrivals against a roster,
+day by day, for many seeded trials at once, and reports how each policy
+fares: utilization and its spread across the team, how long tasks wait
+in the queue, how many are completed, miss their deadline_days or are
+still unassigned at the end.
+
+Model, per trial and day:
+
+1. the day's arrivals join the queue;
+2. queued tasks are placed one at a time in queue order, like
+   assign_task in a loop: each goes to the employee with the best
+   weighted score among those with capacity, or stays queued if nobody
+   fits (or the best probability is below the policy's min_probability);
+3. every employee works ``hours_per_day`` off their outstanding hours.
+
+An employee's current_workload is their outstanding hours: it starts at
+the roster's current_workload, grows by a task's actual duration when the
+task is assigned (estimated_hours times lognormal noise with mean 1) and
+shrinks as they work, so completions free capacity continuously. Work is
+done in assignment order, so a task finishes once everything assigned
+before it is done; it misses its deadline if that is later than arrival
+plus deadline_days.
+
+Arrivals are either synthetic (a Poisson number per day, each drawn from
+the task templates) or a recorded stream of (day, task) pairs that every
+trial replays. Score components come from the scoring engine via
+what_if.ComponentTensor and are combined in the same order as
+ScoringEngine.weighted_scores, so placements match the real system's.
+
+Trials run in chunks, each with its own seed spawned from ``seed``, and
+every policy sees the same arrivals and durations (common random
+numbers), so differences between policies are not sampling noise.
+Chunks can run in a process pool; results do not depend on the number of
+workers.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Task
+from what_if import ComponentTensor
+
+QUEUE_ORDERS = ('fifo', 'deadline')
+METRICS = ('utilization', 'utilization_std', 'wait_mean', 'wait_max', 'completed',
+           'deadline_misses', 'unassigned', 'arrived')
+
+
+@dataclass
+class Policy:
+    """How tasks are placed: scoring weights, an acceptance threshold and the queue order
+
+    ``weights`` defaults to the system's assignment_weights. With
+    ``min_probability`` a task stays queued rather than go to an employee
+    scoring below it. ``queue_order`` 'deadline' serves the queue earliest
+    due first instead of first come, first served.
+    """
+    name: str
+    weights: Optional[Dict[str, float]] = None
+    min_probability: float = 0.0
+    queue_order: str = 'fifo'
+
+
+@dataclass
+class SimulationResult:
+    """Per-trial outcomes of one policy; every array has one entry per trial"""
+    policy: Policy
+    utilization: np.ndarray  # Share of working hours spent busy, team average
+    utilization_std: np.ndarray  # Spread of that share across employees
+    wait_mean: np.ndarray  # Days from arrival to assignment, over assigned tasks
+    wait_max: np.ndarray
+    completed: np.ndarray  # Tasks finished within the horizon
+    deadline_misses: np.ndarray  # Assigned tasks finishing late, plus queued ones already overdue
+    unassigned: np.ndarray  # Tasks still queued at the end
+    arrived: np.ndarray
+    trials: int = field(init=False)
+
+    def __post_init__(self):
+        self.trials = len(self.utilization)
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> Dict[str, Dict[str, float]]:
+        """Mean, standard deviation and percentiles of every metric over the trials"""
+        summary = {}
+        for metric in METRICS:
+            values = getattr(self, metric)
+            stats = {'mean': float(values.mean()), 'std': float(values.std())}
+            for q, value in zip(percentiles, np.percentile(values, percentiles)):
+                stats[f'p{q:g}'] = float(value)
+            summary[metric] = stats
+        return summary
+
+
+class PolicySimulator:
+    """Simulates assignment policies for one roster and arrival process
+
+    Built from a TaskAssignmentSystem, whose employees (and their current
+    workloads) form the roster. Pass either ``templates``, tasks that
+    synthetic arrivals are drawn from (``arrivals_per_day`` on average,
+    optionally weighted by ``template_weights``), or ``arrivals``, a
+    recorded stream of (day, task) pairs. Templates default to the
+    system's open tasks. Holds arrays only, so it can be sent to worker
+    processes.
+    """
+
+    def __init__(self, system, templates: Sequence[Task] = None,
+                 arrivals: Sequence[Tuple[float, Task]] = None, arrivals_per_day: float = 10.0,
+                 template_weights: Sequence[float] = None, days: int = 20, hours_per_day: float = 8.0,
+                 duration_noise: float = 0.25):
+        recorded = None
+        if arrivals is not None:
+            unique = {id(task): task for _, task in arrivals}
+            templates = list(unique.values())
+            slot = {key: i for i, key in enumerate(unique)}
+            recorded = sorted((int(day), slot[id(task)]) for day, task in arrivals if 0 <= day < days)
+        elif templates is None:
+            templates = [task for task in system.tasks.values() if not task.assigned_to and not task.is_completed]
+        if not templates:
+            raise ValueError("No task templates or arrivals to simulate")
+        if hours_per_day <= 0:
+            raise ValueError("hours_per_day must be positive")
+
+        tensor = ComponentTensor(system.get_scoring_engine(), templates)
+        self.emp_ids = tensor.emp_ids
+        self.default_weights = dict(system.assignment_weights)
+        self.skill_match = tensor.skill_match
+        self.experience = tensor.experience
+        self.priority_match = tensor.priority_match
+        self.priority_index = tensor.priority_index
+        self.performance = tensor.performance
+        self.max_workload = tensor.max_workload
+        self.initial_workload = tensor.current_workload
+        self.hours = tensor.hours
+        self.deadlines = np.array([task.deadline_days for task in templates], dtype=np.float64)
+        self.recorded = recorded
+        self.arrivals_per_day = arrivals_per_day
+        if template_weights is not None:
+            template_weights = np.asarray(template_weights, dtype=np.float64)
+            template_weights = template_weights / template_weights.sum()
+        self.template_weights = template_weights
+        self.days = days
+        self.hours_per_day = hours_per_day
+        self.duration_noise = duration_noise
+
+    def run(self, policies: Sequence[Policy], trials: int = 1000, seed: int = 0,
+            workers: int = None, chunk_trials: int = 250) -> Dict[str, SimulationResult]:
+        """Simulate every policy for ``trials`` seeded trials; returns results by policy name
+
+        With ``workers``, chunks of ``chunk_trials`` trials run in that many
+        processes.
+        """
+        for policy in policies:
+            if policy.queue_order not in QUEUE_ORDERS:
+                raise ValueError(f"Unknown queue order: {policy.queue_order}")
+        sizes = [min(chunk_trials, trials - start) for start in range(0, trials, chunk_trials)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(policy, size, chunk_seed) for policy in policies for size, chunk_seed in zip(sizes, seeds)]
+        if workers:
+            with ProcessPoolExecutor(workers, initializer=_set_worker_model, initargs=(self,)) as pool:
+                chunks = list(pool.map(_simulate_in_worker, *zip(*jobs)))
+        else:
+            chunks = [_simulate_chunk(self, *job) for job in jobs]
+
+        results = {}
+        for i, policy in enumerate(policies):
+            parts = chunks[i * len(sizes):(i + 1) * len(sizes)]
+            results[policy.name] = SimulationResult(
+                policy, **{metric: np.concatenate([part[metric] for part in parts]) for metric in METRICS})
+        return results
+
+    def _arrivals(self, rng: np.random.Generator, trials: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(arrival day, template, duration factor) per trial and slot, by arrival day
+
+        Padding slots arrive on day ``days``, i.e. never.
+        """
+        if self.recorded is not None:
+            slots = len(self.recorded)
+            days = np.tile(np.array([day for day, _ in self.recorded], dtype=np.float64), (trials, 1))
+            templates = np.tile(np.array([t for _, t in self.recorded], dtype=np.int64), (trials, 1))
+        else:
+            counts = rng.poisson(self.arrivals_per_day, (trials, self.days))
+            slots = int(counts.sum(axis=1).max(initial=0))
+            days = np.full((trials, slots), float(self.days))
+            for i in range(trials):
+                arrived = np.repeat(np.arange(self.days, dtype=np.float64), counts[i])
+                days[i, :len(arrived)] = arrived
+            templates = rng.choice(len(self.hours), size=(trials, slots), p=self.template_weights)
+        sigma = self.duration_noise
+        if sigma > 0:
+            factors = rng.lognormal(-sigma * sigma / 2, sigma, (trials, slots))
+        else:
+            factors = np.ones((trials, slots))
+        return days, templates, factors
+
+
+_worker_model: Optional[PolicySimulator] = None  # The simulator, sent once per worker process
+
+
+def _set_worker_model(model: PolicySimulator):
+    global _worker_model
+    _worker_model = model
+
+
+def _simulate_in_worker(policy: Policy, trials: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    return _simulate_chunk(_worker_model, policy, trials, seed)
+
+
+def _simulate_chunk(model: PolicySimulator, policy: Policy, trials: int,
+                    seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Run ``trials`` trials of one policy; returns per-trial metric arrays"""
+    weights = dict(model.default_weights if policy.weights is None else policy.weights)
+    rng = np.random.default_rng(seed)
+    arrival, template, factor = model._arrivals(rng, trials)
+    slots, size, rate = arrival.shape[1], len(model.emp_ids), model.hours_per_day
+    due = arrival + model.deadlines[template]
+    duration = model.hours[template] * factor
+
+    # Weighted components, combined below in ScoringEngine.weighted_scores order
+    skill_term = model.skill_match * weights['skill_match']
+    experience_term = model.experience * weights['experience']
+    performance_term = model.performance * weights['performance']
+    priority_term = model.priority_match * weights['priority_match']
+    w_availability = weights['availability']
+    p = policy.min_probability
+    min_score = -np.inf if p <= 0 else (np.inf if p >= 1 else 0.5 + math.log(p / (1 - p)) / 5)
+
+    max_workload = model.max_workload
+    workload = np.tile(model.initial_workload, (trials, 1))
+    busy = np.zeros((trials, size))
+    assigned = np.zeros((trials, slots), dtype=bool)
+    finish = np.full((trials, slots), np.inf)
+    wait = np.zeros((trials, slots))
+    if policy.queue_order == 'deadline':
+        order_key = due * (slots + 1) + np.arange(slots)
+    else:
+        order_key = np.broadcast_to(np.arange(slots, dtype=np.float64), (trials, slots))
+    trial_rows = np.arange(trials)
+
+    for day in range(model.days):
+        waiting = (arrival <= day) & ~assigned
+        counts = waiting.sum(axis=1)
+        if size and counts.any():
+            queue = np.argsort(np.where(waiting, order_key, np.inf), axis=1, kind='stable')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                availability_term = np.maximum(0, (max_workload - workload) / max_workload) * w_availability
+            room = (max_workload - workload).max(axis=1)
+            for k in range(int(counts.max())):
+                rows = trial_rows[counts > k]
+                slot = queue[rows, k]
+                tasks = template[rows, slot]
+                hours = model.hours[tasks]
+                fits = hours <= room[rows]  # Skip trials where nobody has room for this task
+                rows, slot, tasks, hours = rows[fits], slot[fits], tasks[fits], hours[fits]
+                if not len(rows):
+                    continue
+                scores = skill_term[tasks] + availability_term[rows]
+                scores += experience_term[tasks]
+                scores += performance_term
+                scores += priority_term[model.priority_index[tasks]]
+                scores[workload[rows] + hours[:, None] > max_workload] = -np.inf
+                best = np.argmax(scores, axis=1)
+                best_score = scores[np.arange(len(rows)), best]
+                placed = (best_score > -np.inf) & (best_score >= min_score)
+                rows, slot, best = rows[placed], slot[placed], best[placed]
+
+                hours_before = workload[rows, best]
+                workload[rows, best] = hours_before + duration[rows, slot]
+                assigned[rows, slot] = True
+                wait[rows, slot] = day - arrival[rows, slot]
+                finish[rows, slot] = day + workload[rows, best] / rate
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    availability = np.maximum(0, (max_workload[best] - workload[rows, best]) / max_workload[best])
+                availability_term[rows, best] = availability * w_availability
+                room[rows] = (max_workload - workload[rows]).max(axis=1)
+        worked = np.minimum(workload, rate)
+        busy += worked
+        workload -= worked
+
+    arrived = (arrival < model.days).sum(axis=1)
+    queued = (arrival < model.days) & ~assigned
+    utilization = busy / (rate * model.days)
+    assigned_count = assigned.sum(axis=1)
+    return {
+        'utilization': utilization.mean(axis=1) if size else np.zeros(trials),
+        'utilization_std': utilization.std(axis=1) if size else np.zeros(trials),
+        'wait_mean': wait.sum(axis=1) / np.maximum(assigned_count, 1),
+        'wait_max': wait.max(axis=1, initial=0),
+        'completed': (finish <= model.days).sum(axis=1),
+        'deadline_misses': ((assigned & (finish > due)) | (queued & (due < model.days))).sum(axis=1),
+        'unassigned': queued.sum(axis=1),
+        'arrived': arrived,
+    }
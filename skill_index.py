@@ -0,0 +1,164 @@
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from compact_models import SKILL_VOCABULARY
+from models import Employee, Skill, SkillLevel
+
+LEVELS = len(SkillLevel)
+
+
+def requirement_masks(required_skills: Dict[str, SkillLevel]) -> Tuple[int, ...]:
+    """Bitmask of the skills required at each level (index 0 = BEGINNER)"""
+    masks = [0] * LEVELS
+    for skill_name, level in required_skills.items():
+        masks[level.value - 1] |= 1 << SKILL_VOCABULARY.intern(skill_name)
+    return tuple(masks)
+
+
+def missing_count(held: List[int], required: Tuple[int, ...]) -> int:
+    """Required skills not held at their required level"""
+    return sum((mask & ~have).bit_count() for mask, have in zip(required, held) if mask)
+
+
+class SkillIndex:
+    """Inverted index from skill name to the employees holding that skill.
+
+    Each posting list is kept sorted by descending SkillLevel, ties in the
+    order employees were added, so the strongest holders come first.
+
+    Once coverage is first queried, every employee's skills are also kept
+    as bitmasks over SKILL_VOCABULARY, one per level (bit set = skill held
+    at that level or above), so how many of a task's skills someone is
+    missing takes a few AND/popcounts.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[Tuple[int, int, str]]] = {}  # skill -> [(-level, position, emp_id)]
+        self._positions: Dict[str, int] = {}
+        self._masks: Optional[Dict[str, List[int]]] = None  # emp_id -> [held at >= level, per level]
+
+    def position(self, emp_id: str) -> int:
+        """Roster position of an employee (order of first add_employee)"""
+        return self._positions[emp_id]
+
+    def load(self, emp_ids: Iterable[str], postings: Iterable[Tuple[str, str, int]]):
+        """Bulk-build from the roster order and (emp_id, skill name, level value) rows"""
+        for emp_id in emp_ids:
+            self._positions.setdefault(emp_id, len(self._positions))
+        for emp_id, skill_name, level in postings:
+            self._postings.setdefault(skill_name, []).append((-level, self._positions[emp_id], emp_id))
+        for entries in self._postings.values():
+            entries.sort()
+
+    def add_employee(self, employee: Employee):
+        position = self._positions.setdefault(employee.emp_id, len(self._positions))
+        for skill in employee.skills.values():
+            insort(self._postings.setdefault(skill.name, []), (-skill.level.value, position, employee.emp_id))
+        if self._masks is not None:
+            masks = self._masks[employee.emp_id] = [0] * LEVELS
+            for skill in employee.skills.values():
+                self._set_bits(masks, skill.name, skill.level.value)
+
+    def remove_employee(self, employee: Employee):
+        for skill in employee.skills.values():
+            self._discard(skill, employee.emp_id)
+        if self._masks is not None:
+            self._masks.pop(employee.emp_id, None)
+
+    def update_skill(self, emp_id: str, previous: Optional[Skill], skill: Skill):
+        """Re-index one skill after Employee.add_skill added or replaced it"""
+        if previous is not None:
+            self._discard(previous, emp_id)
+        insort(self._postings.setdefault(skill.name, []),
+               (-skill.level.value, self._positions[emp_id], emp_id))
+        if self._masks is not None:
+            masks = self._masks.setdefault(emp_id, [0] * LEVELS)
+            if previous is not None:
+                self._set_bits(masks, previous.name, previous.level.value, False)
+            self._set_bits(masks, skill.name, skill.level.value)
+
+    @staticmethod
+    def _set_bits(masks: List[int], skill_name: str, level: int, held: bool = True):
+        bit = 1 << SKILL_VOCABULARY.intern(skill_name)
+        for i in range(level):
+            masks[i] = masks[i] | bit if held else masks[i] & ~bit
+
+    def _discard(self, skill: Skill, emp_id: str):
+        postings = self._postings.get(skill.name)
+        if postings is None:
+            return
+        entry = (-skill.level.value, self._positions[emp_id], emp_id)
+        try:
+            postings.remove(entry)
+        except ValueError:
+            return
+        if not postings:
+            del self._postings[skill.name]
+
+    def employees_with(self, skill_name: str, min_level: int = 1) -> Iterator[str]:
+        """Yield IDs of employees with ``skill_name`` at ``min_level`` or above, strongest first"""
+        postings = self._postings.get(skill_name, [])
+        end = bisect_right(postings, (-min_level, float('inf'), ''))
+        for _, _, emp_id in postings[:end]:
+            yield emp_id
+
+    def count(self, skill_name: str) -> int:
+        return len(self._postings.get(skill_name, ()))
+
+    def candidates(self, skill_names: Iterable[str]) -> List[str]:
+        """IDs of employees holding at least one of ``skill_names``, in roster order"""
+        found: Set[str] = set()
+        for skill_name in skill_names:
+            found.update(emp_id for _, _, emp_id in self._postings.get(skill_name, ()))
+        return sorted(found, key=self._positions.__getitem__)
+
+    @property
+    def masks_built(self) -> bool:
+        return self._masks is not None
+
+    def build_masks(self) -> Dict[str, List[int]]:
+        """Per-employee bitmasks, built from the posting lists on first use
+
+        From then on they are maintained with the posting lists; build them
+        while no other thread is changing the index.
+        """
+        if self._masks is None:
+            masks: Dict[str, List[int]] = {}
+            for skill_name, postings in list(self._postings.items()):
+                bit = 1 << SKILL_VOCABULARY.intern(skill_name)
+                for neg_level, _, emp_id in postings:
+                    held = masks.get(emp_id)
+                    if held is None:
+                        held = masks[emp_id] = [0] * LEVELS
+                    for i in range(-neg_level):
+                        held[i] |= bit
+            self._masks = masks
+        return self._masks
+
+    def holding_any(self, emp_ids: Iterable[str], skill_names: Iterable[str]) -> List[str]:
+        """The ``emp_ids`` holding at least one of ``skill_names`` (needs build_masks())"""
+        wanted = 0
+        for skill_name in skill_names:
+            wanted |= 1 << SKILL_VOCABULARY.intern(skill_name)
+        masks = self._masks
+        return [emp_id for emp_id in emp_ids if emp_id in masks and masks[emp_id][0] & wanted]
+
+    def missing_skills(self, emp_id: str, required_skills: Dict[str, SkillLevel]) -> int:
+        """How many of ``required_skills`` an employee does not hold at the required level"""
+        return missing_count(self.build_masks().get(emp_id, [0] * LEVELS), requirement_masks(required_skills))
+
+    def covering(self, required_skills: Dict[str, SkillLevel], max_missing: int = 0) -> List[str]:
+        """IDs of employees missing at most ``max_missing`` of ``required_skills``, in roster order
+
+        None when that allows missing every skill, i.e. anyone qualifies.
+
+        Whoever qualifies holds at least one of any ``max_missing + 1`` of the
+        skills, so only that many posting lists (the shortest) are scanned.
+        """
+        if max_missing >= len(required_skills):
+            return None
+        rarest = sorted(required_skills, key=self.count)[:max_missing + 1]
+        required = requirement_masks(required_skills)
+        masks = self.build_masks()
+        return [emp_id for emp_id in self.candidates(rarest)
+                if missing_count(masks[emp_id], required) <= max_missing]
@@ -0,0 +1,237 @@
+"""Copy-on-write read snapshots of a TaskAssignmentSystem.
+
+A SystemSnapshot is the roster and backlog as of one system version,
+made of private copies of the Employee and Task objects. Readers can
+iterate, render and score it for as long as they like while writers keep
+changing the system, without holding any lock.
+
+Snapshots share structure: records live in a FrozenMap split into
+fixed hash shards. The system marks every employee or task it changes
+as dirty, and the next snapshot copies only the shards holding dirty
+records (and only those records), reusing every other shard, and the
+roster order, from the previous snapshot. Taking a snapshot while the
+version has not moved returns the previous one without locking.
+
+Snapshots are keyed by system.version: equal versions mean equal
+contents, so results computed from a snapshot (e.g. recommendations,
+see SystemSnapshot.recommendations) can be cached by version and reused
+until something changes. Weights and other settings are not part of a
+snapshot; they are read from the system, so cached results are also keyed
+by the weights in use.
+"""
+import copy
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from models import Employee, Task
+
+SHARDS = 256
+
+
+def detach(obj):
+    """Copy of a model object sharing no mutable state with it and notifying no observers"""
+    clone = copy.copy(obj)
+    names = vars(clone) if hasattr(clone, '__dict__') else \
+        [name for cls in type(clone).__mro__ for name in getattr(cls, '__slots__', ())]
+    for name in names:
+        value = getattr(clone, name)
+        if isinstance(value, (list, dict, array)):
+            setattr(clone, name, copy.copy(value))
+    clone._observers = []
+    return clone
+
+
+class FrozenMap(Mapping):
+    """Read-only mapping over hash shards that snapshots share; iterates in ``order``"""
+
+    def __init__(self, shards: Tuple[Dict, ...], order: Tuple[str, ...]):
+        self._shards = shards
+        self._order = order
+
+    @classmethod
+    def build(cls, records: Mapping) -> "FrozenMap":
+        shards = [{} for _ in range(SHARDS)]
+        order = tuple(records)
+        for key in order:
+            shards[hash(key) % SHARDS][key] = detach(records[key])
+        return cls(tuple(shards), order)
+
+    def updated(self, records: Mapping, dirty: Iterable[str], reorder: bool) -> "FrozenMap":
+        """A new map with the ``dirty`` keys re-copied from ``records`` (or dropped if gone)
+
+        Shards without dirty keys, and the order unless ``reorder``, are shared.
+        """
+        shards = list(self._shards)
+        copied: Dict[int, Dict] = {}
+        for key in dirty:
+            index = hash(key) % SHARDS
+            shard = copied.get(index)
+            if shard is None:
+                shard = copied[index] = dict(shards[index])
+            record = records.get(key)
+            if record is None:
+                shard.pop(key, None)
+            else:
+                shard[key] = detach(record)
+        for index, shard in copied.items():
+            shards[index] = shard
+        return FrozenMap(tuple(shards), tuple(records) if reorder else self._order)
+
+    def shares_shards_with(self, other: "FrozenMap") -> int:
+        """How many shards are the very same objects in both maps"""
+        return sum(mine is theirs for mine, theirs in zip(self._shards, other._shards))
+
+    def __getitem__(self, key: str):
+        return self._shards[hash(key) % SHARDS][key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._shards[hash(key) % SHARDS]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class SystemSnapshot:
+    """Immutable view of a system's employees and tasks at ``version``
+
+    The records are copies: treat them as read-only. Changing them does
+    not affect the system.
+    """
+
+    def __init__(self, store: "SnapshotStore", version: int, employees: FrozenMap, tasks: FrozenMap):
+        self._store = store
+        self.version = version
+        self.employees = employees
+        self.tasks = tasks
+        self._engine = None
+        self._engine_lock = threading.Lock()
+
+    def __hash__(self) -> int:
+        return hash(self.version)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, SystemSnapshot) and other._store is self._store
+                and other.version == self.version)
+
+    def __repr__(self) -> str:
+        return f"SystemSnapshot(version={self.version}, employees={len(self.employees)}, tasks={len(self.tasks)})"
+
+    def get_scoring_engine(self):
+        """Vectorized engine over this snapshot's employees, built on first use"""
+        if self._engine is None:
+            from scoring import ScoringEngine
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = ScoringEngine(list(self.employees.values()),
+                                                 self._store.system.assignment_weights)
+        return self._engine
+
+    def find_best_matches(self, task: Task, top_n: int = 3,
+                          vectorized: bool = False) -> List[Tuple[Employee, float]]:
+        """Best matches for ``task`` among this snapshot's employees, ordered like find_best_matches"""
+        if top_n <= 0:
+            return []
+        if vectorized:
+            engine = self.get_scoring_engine()
+            return [(engine.employees[row], probability) for row, probability in engine.top_matches(task, top_n)]
+        system = self._store.system
+        scored = ((system.calculate_assignment_probability(employee, task), -position, employee)
+                  for position, employee in enumerate(self.employees.values()))
+        best = heapq.nlargest(top_n, (entry for entry in scored if entry[0] > 0), key=lambda entry: entry[:2])
+        return [(employee, probability) for probability, _, employee in best]
+
+    def get_score_components(self, employee: Employee, task: Task) -> Dict[str, float]:
+        return self._store.system.get_score_components(employee, task)
+
+    def recommendations(self, task_id: str, top_n: int = 3,
+                        vectorized: bool = False) -> Optional[List[Tuple[Employee, float]]]:
+        """find_best_matches for one of the snapshot's tasks, cached by version and weights
+
+        None if the task is not in the snapshot. Every snapshot of the same
+        version shares the cached result.
+        """
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        weights = tuple(sorted(self._store.system.assignment_weights.items()))
+        key = (self.version, task_id, top_n, weights)
+        matches = self._store.cached(key)
+        if matches is None:
+            matches = self.find_best_matches(task, top_n, vectorized)
+            self._store.cache(key, matches)
+        return matches
+
+
+class SnapshotStore:
+    """Builds snapshots of one system and tracks what changed since the last one
+
+    TaskAssignmentSystem calls employee_changed / task_changed for every
+    record it changes, passing ``membership`` when records are added or
+    removed. Thread-safe.
+    """
+
+    def __init__(self, system, cache_size: int = 1024):
+        self.system = system
+        self.cache_size = cache_size
+        self._latest: Optional[SystemSnapshot] = None
+        self._dirty_employees: Set[str] = set()
+        self._dirty_tasks: Set[str] = set()
+        self._reorder_employees = False
+        self._reorder_tasks = False
+        self._results: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def employee_changed(self, emp_id: str, membership: bool = False):
+        with self._lock:
+            self._dirty_employees.add(emp_id)
+            self._reorder_employees |= membership
+
+    def task_changed(self, task_id: str, membership: bool = False):
+        with self._lock:
+            self._dirty_tasks.add(task_id)
+            self._reorder_tasks |= membership
+
+    def take(self) -> SystemSnapshot:
+        """Snapshot of the current version, reusing the latest one if nothing changed"""
+        system = self.system
+        latest = self._latest
+        if latest is not None and latest.version == system.version:
+            return latest
+        # Writers change records under these locks, so no change is half-applied while copying
+        with system._write_lock, system.storage.transaction(), system.locks.hold_all():
+            latest = self._latest
+            if latest is not None and latest.version == system.version:
+                return latest
+            with self._lock:
+                dirty_employees, self._dirty_employees = self._dirty_employees, set()
+                dirty_tasks, self._dirty_tasks = self._dirty_tasks, set()
+                reorder_employees, self._reorder_employees = self._reorder_employees, False
+                reorder_tasks, self._reorder_tasks = self._reorder_tasks, False
+            if latest is None:
+                employees = FrozenMap.build(system.employees)
+                tasks = FrozenMap.build(system.tasks)
+            else:
+                employees = latest.employees.updated(system.employees, dirty_employees, reorder_employees)
+                tasks = latest.tasks.updated(system.tasks, dirty_tasks, reorder_tasks)
+            snapshot = self._latest = SystemSnapshot(self, system.version, employees, tasks)
+        return snapshot
+
+    def cached(self, key: tuple):
+        with self._lock:
+            value = self._results.get(key)
+            if value is not None:
+                self._results.move_to_end(key)
+            return value
+
+    def cache(self, key: tuple, value):
+        with self._lock:
+            self._results[key] = value
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
@@ -0,0 +1,364 @@
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models import Employee, Skill, SkillLevel, Task, TaskPriority
+
+
+class InMemoryStorage:
+    """Default storage backend: plain dicts, nothing persisted.
+
+    Defines the interface TaskAssignmentSystem expects from a backend:
+    ``employees``/``tasks`` mappings plus write-through hooks that the
+    system calls after every change.
+    """
+
+    def __init__(self):
+        self.employees: Dict[str, Employee] = {}
+        self.tasks: Dict[str, Task] = {}
+
+    def add_load_listener(self, callback: Callable[[object], None]):
+        """Register a callback for objects materialized from storage"""
+
+    def get_employees(self, emp_ids: Sequence[str]) -> List[Employee]:
+        return [self.employees[emp_id] for emp_id in emp_ids if emp_id in self.employees]
+
+    def roster_order(self) -> Iterable[str]:
+        return list(self.employees)
+
+    def skill_postings(self) -> Iterable[Tuple[str, str, int]]:
+        """(emp_id, skill name, level value) for every stored skill"""
+        return [(emp.emp_id, skill.name, skill.level.value)
+                for emp in self.employees.values() for skill in emp.skills.values()]
+
+    def remaining_capacity(self) -> Iterable[Tuple[str, float]]:
+        """(emp_id, max_workload_hours - current_workload) for every employee"""
+        return [(emp.emp_id, emp.max_workload_hours - emp.current_workload) for emp in self.employees.values()]
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def save_employee(self, employee: Employee):
+        pass
+
+    def save_skill(self, emp_id: str, skill: Skill):
+        pass
+
+    def save_task(self, task: Task):
+        pass
+
+    def record_assignment(self, task: Task, employee: Employee):
+        pass
+
+    def record_completion(self, task: Task, employee: Optional[Employee]):
+        pass
+
+    def close(self):
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    emp_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    max_workload_hours REAL NOT NULL,
+    current_workload REAL NOT NULL,
+    performance_rating REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skills (
+    emp_id TEXT NOT NULL REFERENCES employees(emp_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    experience_years REAL NOT NULL,
+    PRIMARY KEY (emp_id, name)
+);
+CREATE INDEX IF NOT EXISTS skills_by_name ON skills(name, level DESC);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    estimated_hours REAL NOT NULL,
+    deadline_days INTEGER NOT NULL,
+    assigned_to TEXT,
+    is_completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_by_assignee ON tasks(assigned_to);
+CREATE TABLE IF NOT EXISTS task_skills (
+    task_id TEXT NOT NULL REFERENCES tasks(task_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (task_id, name)
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    emp_id TEXT NOT NULL,
+    assigned_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS assignments_by_employee ON assignments(emp_id, seq);
+"""
+
+_CHUNK = 500  # Keeps IN (...) lists under SQLite's parameter limit
+
+
+class _LazyMap(MutableMapping):
+    """Dict-like view over a table that materializes objects on first access.
+
+    Loaded objects stay in an identity map, so repeated lookups return the
+    same instance and in-place changes reported to the system are kept.
+    """
+
+    def __init__(self, storage: "SQLiteStorage", table: str, key_column: str,
+                 load: Callable[[Sequence[str]], Dict[str, object]], save: Callable[[object], None]):
+        self._storage = storage
+        self._table = table
+        self._key_column = key_column
+        self._load = load
+        self._save = save
+        self._loaded: Dict[str, object] = {}
+
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            self.get_many([key])
+        return self._loaded[key]
+
+    def __contains__(self, key) -> bool:
+        if key in self._loaded:
+            return True
+        return self._storage._query_one(
+            f"SELECT 1 FROM {self._table} WHERE {self._key_column} = ?", (key,)) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._storage._query(f"SELECT {self._key_column} FROM {self._table} ORDER BY rowid")
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._storage._query_one(f"SELECT COUNT(*) FROM {self._table}")[0]
+
+    def __setitem__(self, key, value):
+        with self._storage.transaction():
+            self._save(value)
+        self._loaded[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        with self._storage.transaction():
+            self._storage._execute(f"DELETE FROM {self._table} WHERE {self._key_column} = ?", (key,))
+        self._loaded.pop(key, None)
+
+    def get_many(self, keys: Sequence[str]) -> List[object]:
+        """Load many objects with one query per chunk, in ``keys`` order"""
+        missing = [key for key in keys if key not in self._loaded]
+        for start in range(0, len(missing), _CHUNK):
+            for key, obj in self._load(missing[start:start + _CHUNK]).items():
+                self._loaded[key] = obj
+                self._storage._notify_loaded(obj)
+        return [self._loaded[key] for key in keys if key in self._loaded]
+
+    def values(self) -> List[object]:
+        return self.get_many(list(self))
+
+    def items(self) -> List[Tuple[str, object]]:
+        keys = list(self)
+        self.get_many(keys)
+        return [(key, self._loaded[key]) for key in keys if key in self._loaded]
+
+
+class SQLiteStorage(InMemoryStorage):
+    """Durable storage in a local SQLite database.
+
+    Employees and tasks are loaded lazily, in bulk, when first accessed;
+    the skill index is rebuilt from the indexed ``skills`` table without
+    materializing any Employee. Every change the system makes is written
+    through inside a transaction.
+    """
+
+    def __init__(self, path: str = "task_system.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._load_listeners: List[Callable[[object], None]] = []
+        self.employees = _LazyMap(self, "employees", "emp_id", self._load_employees, self._insert_employee)
+        self.tasks = _LazyMap(self, "tasks", "task_id", self._load_tasks, self.save_task)
+
+    # Low-level helpers
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _query_one(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _execute(self, sql: str, params: Sequence = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def _notify_loaded(self, obj):
+        for callback in self._load_listeners:
+            callback(obj)
+
+    def add_load_listener(self, callback: Callable[[object], None]):
+        self._load_listeners.append(callback)
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one transaction (nested calls join the outer one)"""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Bulk reads
+
+    def get_employees(self, emp_ids: Sequence[str]) -> List[Employee]:
+        return self.employees.get_many(emp_ids)
+
+    def roster_order(self) -> Iterable[str]:
+        return [row[0] for row in self._query("SELECT emp_id FROM employees ORDER BY rowid")]
+
+    def skill_postings(self) -> Iterable[Tuple[str, str, int]]:
+        return self._query("SELECT emp_id, name, level FROM skills")
+
+    def remaining_capacity(self) -> Iterable[Tuple[str, float]]:
+        """Read from the employees table; only already loaded employees come from their objects"""
+        loaded = self.employees._loaded
+        rows = self._query("SELECT emp_id, max_workload_hours - current_workload FROM employees")
+        return [(emp_id, remaining if emp_id not in loaded else
+                 loaded[emp_id].max_workload_hours - loaded[emp_id].current_workload)
+                for emp_id, remaining in rows]
+
+    def employees_with_skills(self, skill_names: Sequence[str], min_level: int = 1) -> List[str]:
+        """IDs of employees holding any of ``skill_names`` at ``min_level`` or above"""
+        placeholders = ",".join("?" * len(skill_names))
+        rows = self._query(
+            f"SELECT DISTINCT emp_id FROM skills WHERE name IN ({placeholders}) AND level >= ?",
+            (*skill_names, min_level))
+        return [row[0] for row in rows]
+
+    def _load_employees(self, emp_ids: Sequence[str]) -> Dict[str, Employee]:
+        placeholders = ",".join("?" * len(emp_ids))
+        skills: Dict[str, List[Skill]] = {}
+        for emp_id, name, level, years in self._query(
+                f"SELECT emp_id, name, level, experience_years FROM skills "
+                f"WHERE emp_id IN ({placeholders}) ORDER BY rowid", emp_ids):
+            skills.setdefault(emp_id, []).append(Skill(name, SkillLevel(level), years))
+        assigned: Dict[str, List[str]] = {}
+        for emp_id, task_id in self._query(
+                f"SELECT a.emp_id, a.task_id FROM assignments a JOIN tasks t ON t.task_id = a.task_id "
+                f"WHERE a.emp_id IN ({placeholders}) AND t.is_completed = 0 ORDER BY a.seq",
+                emp_ids):
+            assigned.setdefault(emp_id, []).append(task_id)
+
+        employees = {}
+        for emp_id, name, max_hours, workload, rating in self._query(
+                f"SELECT emp_id, name, max_workload_hours, current_workload, performance_rating "
+                f"FROM employees WHERE emp_id IN ({placeholders})", emp_ids):
+            employee = Employee(emp_id, name, skills.get(emp_id, []), max_hours)
+            employee.current_workload = workload
+            employee.performance_rating = rating
+            employee.assigned_tasks = assigned.get(emp_id, [])
+            employees[emp_id] = employee
+        return employees
+
+    def _load_tasks(self, task_ids: Sequence[str]) -> Dict[str, Task]:
+        placeholders = ",".join("?" * len(task_ids))
+        required: Dict[str, Dict[str, SkillLevel]] = {}
+        for task_id, name, level in self._query(
+                f"SELECT task_id, name, level FROM task_skills WHERE task_id IN ({placeholders}) "
+                f"ORDER BY task_id, position", task_ids):
+            required.setdefault(task_id, {})[name] = SkillLevel(level)
+
+        tasks = {}
+        for task_id, name, priority, hours, deadline, assigned_to, completed in self._query(
+                f"SELECT task_id, name, priority, estimated_hours, deadline_days, assigned_to, is_completed "
+                f"FROM tasks WHERE task_id IN ({placeholders})", task_ids):
+            task = Task(task_id, name, required.get(task_id, {}), TaskPriority(priority), hours, deadline)
+            task.assigned_to = assigned_to
+            task.is_completed = bool(completed)
+            tasks[task_id] = task
+        return tasks
+
+    # Write-through
+
+    def _insert_employee(self, employee: Employee):
+        self.save_employee(employee)
+        self._execute("DELETE FROM skills WHERE emp_id = ?", (employee.emp_id,))
+        for skill in employee.skills.values():
+            self.save_skill(employee.emp_id, skill)
+        # A replaced employee keeps only the new record's assignments, as in memory
+        self._execute("DELETE FROM assignments WHERE emp_id = ?", (employee.emp_id,))
+        for task_id in employee.assigned_tasks:
+            self._execute("INSERT INTO assignments (task_id, emp_id) VALUES (?, ?)", (task_id, employee.emp_id))
+
+    def save_employee(self, employee: Employee):
+        self._execute(
+            "INSERT INTO employees (emp_id, name, max_workload_hours, current_workload, performance_rating) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(emp_id) DO UPDATE SET name = excluded.name, "
+            "max_workload_hours = excluded.max_workload_hours, current_workload = excluded.current_workload, "
+            "performance_rating = excluded.performance_rating",
+            (employee.emp_id, employee.name, employee.max_workload_hours,
+             employee.current_workload, employee.performance_rating))
+
+    def save_skill(self, emp_id: str, skill: Skill):
+        self._execute(
+            "INSERT INTO skills (emp_id, name, level, experience_years) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(emp_id, name) DO UPDATE SET level = excluded.level, "
+            "experience_years = excluded.experience_years",
+            (emp_id, skill.name, skill.level.value, skill.experience_years))
+
+    def save_task(self, task: Task):
+        with self.transaction():
+            self._execute(
+                "INSERT INTO tasks (task_id, name, priority, estimated_hours, deadline_days, assigned_to, "
+                "is_completed) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(task_id) DO UPDATE SET "
+                "name = excluded.name, priority = excluded.priority, estimated_hours = excluded.estimated_hours, "
+                "deadline_days = excluded.deadline_days, assigned_to = excluded.assigned_to, "
+                "is_completed = excluded.is_completed",
+                (task.task_id, task.name, task.priority.value, task.estimated_hours, task.deadline_days,
+                 task.assigned_to, int(task.is_completed)))
+            self._execute("DELETE FROM task_skills WHERE task_id = ?", (task.task_id,))
+            for position, (name, level) in enumerate(task.required_skills.items()):
+                self._execute("INSERT INTO task_skills (task_id, name, level, position) VALUES (?, ?, ?, ?)",
+                              (task.task_id, name, level.value, position))
+
+    def record_assignment(self, task: Task, employee: Employee):
+        with self.transaction():
+            self._execute("UPDATE tasks SET assigned_to = ? WHERE task_id = ?", (task.assigned_to, task.task_id))
+            self._execute("UPDATE employees SET current_workload = ? WHERE emp_id = ?",
+                          (employee.current_workload, employee.emp_id))
+            self._execute("INSERT INTO assignments (task_id, emp_id) VALUES (?, ?)",
+                          (task.task_id, employee.emp_id))
+
+    def record_completion(self, task: Task, employee: Optional[Employee]):
+        with self.transaction():
+            self._execute("UPDATE tasks SET is_completed = 1 WHERE task_id = ?", (task.task_id,))
+            if employee is not None:
+                self._execute("UPDATE employees SET current_workload = ? WHERE emp_id = ?",
+                              (employee.current_workload, employee.emp_id))
@@ -0,0 +1,163 @@
+"""Column-oriented, filterable and sortable views of the employee and task tables.
+
+A view copies the fields it displays into NumPy columns once; filtering,
+sorting and paging then work on those arrays, and only the rows of the
+visible page are turned into dicts. The app caches one view per
+TaskAssignmentSystem.version, so reruns that change nothing (typing in a
+form, switching pages) reuse it.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import SkillLevel, TaskPriority
+
+TASK_STATUSES = ("Unassigned", "Assigned", "Completed")
+
+
+class _TableView:
+    sort_columns: Dict[str, str] = {}  # Display name -> column attribute
+
+    def __init__(self):
+        self.size = 0
+        self._orders: Dict[str, np.ndarray] = {}  # Full-table sort order per column, built on demand
+
+    def _order(self, sort_by: str) -> np.ndarray:
+        order = self._orders.get(sort_by)
+        if order is None:
+            order = self._orders[sort_by] = np.argsort(getattr(self, self.sort_columns[sort_by]), kind="stable")
+        return order
+
+    def _search_mask(self, search: str) -> np.ndarray:
+        search = search.strip().lower()
+        return np.fromiter((search in key for key in self._search_keys), dtype=bool, count=self.size)
+
+    def query(self, mask: np.ndarray, sort_by: str, descending: bool, page: int,
+              page_size: int) -> Tuple[int, List[dict]]:
+        """(number of matching rows, records of the requested 0-based page)"""
+        order = self._order(sort_by)
+        matching = order[mask[order]]
+        if descending:
+            matching = matching[::-1]
+        start = page * page_size
+        return len(matching), [self._record(row) for row in matching[start:start + page_size].tolist()]
+
+    def _record(self, row: int) -> dict:
+        raise NotImplementedError
+
+
+class EmployeeTableView(_TableView):
+    sort_columns = {
+        "Employee ID": "ids",
+        "Name": "names",
+        "Utilization": "utilization",
+        "Performance": "performance",
+        "Assigned Tasks": "assigned_counts",
+    }
+
+    def __init__(self, system):
+        super().__init__()
+        self.system = system
+        self.employees = list(system.employees.values())
+        self.size = len(self.employees)
+        self.row_of = {emp.emp_id: row for row, emp in enumerate(self.employees)}
+        self.ids = np.array([emp.emp_id for emp in self.employees], dtype=object)
+        self.names = np.array([emp.name for emp in self.employees], dtype=object)
+        self.max_workload = np.array([emp.max_workload_hours for emp in self.employees], dtype=np.float64)
+        self.current_workload = np.array([emp.current_workload for emp in self.employees], dtype=np.float64)
+        self.performance = np.array([emp.performance_rating for emp in self.employees], dtype=np.float64)
+        self.assigned_counts = np.array([len(emp.assigned_tasks) for emp in self.employees], dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.utilization = np.where(self.max_workload > 0, self.current_workload / self.max_workload, 0.0)
+        self.skill_names = sorted({name for emp in self.employees for name in emp.skills})
+        self._search_keys = [f"{emp.emp_id}\n{emp.name}".lower() for emp in self.employees]
+
+    def filter(self, skills: Sequence[str] = (), min_level: SkillLevel = SkillLevel.BEGINNER,
+               utilization: Optional[Tuple[float, float]] = None, search: str = "") -> np.ndarray:
+        """Boolean row mask: holds any of ``skills`` at ``min_level`` or above, utilization
+        (a fraction) within the inclusive range, and ID or name containing ``search``"""
+        mask = np.ones(self.size, dtype=bool)
+        if skills:
+            holders = np.zeros(self.size, dtype=bool)
+            for skill in skills:
+                rows = [self.row_of[emp_id] for emp_id in self.system.skill_index.employees_with(skill, min_level.value)
+                        if emp_id in self.row_of]
+                holders[rows] = True
+            mask &= holders
+        if utilization is not None:
+            low, high = utilization
+            mask &= (self.utilization >= low) & (self.utilization <= high)
+        if search.strip():
+            mask &= self._search_mask(search)
+        return mask
+
+    def _record(self, row: int) -> dict:
+        emp = self.employees[row]
+        return {
+            "Employee ID": emp.emp_id,
+            "Name": emp.name,
+            "Skills": ", ".join(f"{s.name} ({s.level.name})" for s in emp.skills.values()),
+            "Current Workload": f"{emp.current_workload}/{emp.max_workload_hours} hours",
+            "Utilization": f"{self.utilization[row]:.0%}",
+            "Performance": f"{self.performance[row]:.2f}",
+            "Assigned Tasks": int(self.assigned_counts[row]),
+        }
+
+
+class TaskTableView(_TableView):
+    sort_columns = {
+        "Task ID": "ids",
+        "Name": "names",
+        "Priority": "priorities",
+        "Hours": "hours",
+        "Deadline": "deadlines",
+    }
+
+    def __init__(self, system):
+        super().__init__()
+        self.tasks = list(system.tasks.values())
+        self.size = len(self.tasks)
+        self.ids = np.array([task.task_id for task in self.tasks], dtype=object)
+        self.names = np.array([task.name for task in self.tasks], dtype=object)
+        self.priorities = np.array([task.priority.value for task in self.tasks], dtype=np.int64)
+        self.hours = np.array([task.estimated_hours for task in self.tasks], dtype=np.float64)
+        self.deadlines = np.array([task.deadline_days for task in self.tasks], dtype=np.int64)
+        self.statuses = np.array([2 if task.is_completed else 1 if task.assigned_to else 0
+                                  for task in self.tasks], dtype=np.int8)  # Index into TASK_STATUSES
+        self.rows_by_skill: Dict[str, List[int]] = {}
+        for row, task in enumerate(self.tasks):
+            for skill in task.required_skills:
+                self.rows_by_skill.setdefault(skill, []).append(row)
+        self.skill_names = sorted(self.rows_by_skill)
+        self._search_keys = [f"{task.task_id}\n{task.name}".lower() for task in self.tasks]
+
+    def filter(self, skills: Sequence[str] = (), priorities: Sequence[TaskPriority] = (),
+               statuses: Sequence[str] = (), search: str = "") -> np.ndarray:
+        """Boolean row mask: requires any of ``skills``, has one of ``priorities`` and
+        ``statuses`` (see TASK_STATUSES), and ID or name containing ``search``"""
+        mask = np.ones(self.size, dtype=bool)
+        if skills:
+            requiring = np.zeros(self.size, dtype=bool)
+            for skill in skills:
+                requiring[self.rows_by_skill.get(skill, [])] = True
+            mask &= requiring
+        if priorities:
+            mask &= np.isin(self.priorities, [priority.value for priority in priorities])
+        if statuses:
+            mask &= np.isin(self.statuses, [TASK_STATUSES.index(status) for status in statuses])
+        if search.strip():
+            mask &= self._search_mask(search)
+        return mask
+
+    def _record(self, row: int) -> dict:
+        task = self.tasks[row]
+        return {
+            "Task ID": task.task_id,
+            "Name": task.name,
+            "Priority": task.priority.name,
+            "Hours": task.estimated_hours,
+            "Deadline": f"{task.deadline_days} days",
+            "Required Skills": ", ".join(f"{skill} ({level.name})" for skill, level in task.required_skills.items()),
+            "Assigned To": task.assigned_to or "Unassigned",
+            "Status": "✅ Completed" if task.is_completed else "⏳ Pending",
+        }
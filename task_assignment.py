@@ -1,11 +1,85 @@
+import heapq
 import math
-from typing import Dict, List, Tuple
-from models import Employee, Task, TaskPriority
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from models import Employee, Skill, Task, TaskPriority
+from score_cache import ScoreComponentCache
+from locking import StripedLocks
+from skill_index import SkillIndex
+from storage import InMemoryStorage
+
+# Higher priority tasks should go to higher performing employees
+PRIORITY_PERFORMANCE_THRESHOLDS = {
+    TaskPriority.CRITICAL: 0.9,
+    TaskPriority.HIGH: 0.7,
+    TaskPriority.MEDIUM: 0.5,
+    TaskPriority.LOW: 0.3
+}
+
+
+def _weighted_upper_bound(weights: Dict[str, float], has_skills: bool, availability: float = None,
+                          performance: float = None, priority_match: float = None) -> float:
+    """Sigmoid of the weighted score, with unknown components (None) at their best value
+
+    Terms are summed in the same order as calculate_assignment_probability,
+    so float rounding can never put the bound below a real score.
+    """
+    if has_skills:
+        skill_term = max(0, weights['skill_match'])
+        experience_term = max(0, weights['experience'])
+    else:
+        skill_term = 0.0 * weights['skill_match']
+        experience_term = 0.1 * weights['experience']
+    weighted_score = (
+        skill_term +
+        (max(0, weights['availability']) if availability is None else availability * weights['availability']) +
+        experience_term +
+        (max(0, weights['performance']) if performance is None else performance * weights['performance']) +
+        (max(0, weights['priority_match']) if priority_match is None
+         else priority_match * weights['priority_match'])
+    )
+    return 1 / (1 + math.exp(-5 * (weighted_score - 0.5)))
+
+
+def uncovered_upper_bound(weights: Dict[str, float]) -> float:
+    """Highest probability an employee with none of a task's skills can reach"""
+    return _weighted_upper_bound(weights, False)
+
+
+@dataclass
+class AssignmentResult:
+    """Outcome of try_assign / try_complete; ``message`` is what assign_task / complete_task print"""
+    task_id: str
+    emp_id: Optional[str]  # The assignee, if known
+    ok: bool
+    message: str
+
 
 class TaskAssignmentSystem:
-    def __init__(self):
-        self.employees = {}
-        self.tasks = {}
+    def __init__(self, cache_size: int = 100_000, storage=None, verbose: bool = True):
+        # With verbose=False nothing is printed; use the try_* methods' results instead
+        self.verbose = verbose
+        # Storage backend: in-memory dicts by default, or e.g. storage.SQLiteStorage
+        self.storage = storage if storage is not None else InMemoryStorage()
+        self.employees = self.storage.employees
+        self.tasks = self.storage.tasks
+        self.skill_index = SkillIndex()
+        self.skill_index.load(self.storage.roster_order(), self.storage.skill_postings())
+        self.storage.add_load_listener(lambda obj: obj.add_observer(self))
+        self.score_cache = ScoreComponentCache(cache_size)
+        self._scoring_engine = None  # Built lazily by get_scoring_engine()
+        self.parallel_scorer = None  # See enable_parallel_scoring()
+        self.instrumentation = None  # See enable_instrumentation()
+        self._aggregates = None  # Built lazily by get_dashboard_aggregates()
+        self._scheduler = None  # Built lazily by get_scheduler()
+        self._rankings = None  # See enable_candidate_rankings()
+        self._capacity_index = None  # Built lazily by get_capacity_index()
+        self._snapshots = None  # Built lazily by snapshot()
+        self.locks = StripedLocks()  # Per-task / per-employee locks for assignments
+        self._write_lock = threading.RLock()  # Serializes roster and index changes
+        self.version = 0  # Increases with every change made through the system
+        self._version_lock = threading.Lock()
         self.assignment_weights = {
             'skill_match': 0.4,
             'availability': 0.25,
@@ -15,10 +89,341 @@ class TaskAssignmentSystem:
         }
 
     def add_employee(self, employee: Employee):
-        self.employees[employee.emp_id] = employee
+        with self._write_lock:
+            previous = self.employees.get(employee.emp_id)
+            if previous is not None:
+                previous.remove_observer(self)
+                self.skill_index.remove_employee(previous)
+                self.score_cache.invalidate_employee(employee.emp_id)
+            with self.storage.transaction():
+                self.employees[employee.emp_id] = employee
+            employee.add_observer(self)
+            self.skill_index.add_employee(employee)
+            self._scoring_engine = None
+            if self._aggregates is not None:
+                if previous is not None:
+                    self._aggregates.employee_removed(previous)
+                self._aggregates.employee_added(employee)
+            if self._scheduler is not None:
+                self._scheduler.employee_changed(employee)
+            if self._rankings is not None:
+                if previous is not None:
+                    self._rankings.employee_removed(previous)
+                self._rankings.employee_changed(employee)
+            if self._capacity_index is not None:
+                self._capacity_index.update(employee)
+            if self._snapshots is not None:
+                self._snapshots.employee_changed(employee.emp_id, previous is None)
+            self._changed()
+
+    def _report(self, message: str = ""):
+        if self.verbose:
+            print(message)
+
+    def _changed(self):
+        with self._version_lock:
+            self.version += 1
+
+    def on_skill_added(self, employee: Employee, previous: Skill, skill: Skill):
+        """Keep indexes current when Employee.add_skill is called"""
+        with self._write_lock:
+            if self.employees.get(employee.emp_id) is not employee:
+                return
+            self.storage.save_skill(employee.emp_id, skill)
+            self.skill_index.update_skill(employee.emp_id, previous, skill)
+            self.score_cache.invalidate_employee(employee.emp_id)
+            self._scoring_engine = None
+            if self._aggregates is not None:
+                self._aggregates.skill_added(previous, skill)
+            if self._rankings is not None:
+                self._rankings.employee_changed(employee)
+            if self._snapshots is not None:
+                self._snapshots.employee_changed(employee.emp_id)
+            self._changed()
+
+    def on_performance_changed(self, employee: Employee):
+        with self._write_lock:
+            if self.employees.get(employee.emp_id) is not employee:
+                return
+            self.storage.save_employee(employee)
+            self.score_cache.invalidate_employee(employee.emp_id)
+            if self._scoring_engine is not None:
+                self._scoring_engine.update_employee(employee)
+            if self._rankings is not None:
+                self._rankings.employee_changed(employee)
+            if self._snapshots is not None:
+                self._snapshots.employee_changed(employee.emp_id)
+            self._changed()
+
+    def on_task_changed(self, task: Task):
+        """Drop cached scores when a task's requirements or priority change"""
+        with self._write_lock:
+            if self.tasks.get(task.task_id) is task:
+                self.storage.save_task(task)
+                self.score_cache.invalidate_task(task.task_id)
+                if self._aggregates is not None:
+                    self._aggregates.task_changed(task)
+                if self._scheduler is not None:
+                    self._scheduler.task_changed(task)
+                if self._rankings is not None:
+                    self._rankings.task_changed(task)
+                if self._snapshots is not None:
+                    self._snapshots.task_changed(task.task_id)
+                self._changed()
+
+    def get_scoring_engine(self):
+        """Return the vectorized scoring engine, encoding the roster if needed.
+
+        The engine tracks workload changes made through assign_task and
+        skill and performance changes made through Employee; call
+        invalidate_scoring_engine() after editing employees any other way.
+        """
+        engine = self._scoring_engine
+        if engine is None:
+            from scoring import ScoringEngine  # numpy is only needed for batched scoring
+            with self._write_lock:
+                engine = ScoringEngine(list(self.employees.values()), self.assignment_weights)
+                self._scoring_engine = engine
+            # Pick up assignments committed while the roster was being encoded
+            engine.refresh_workloads()
+        return engine
+
+    def get_dashboard_aggregates(self):
+        """Return the incrementally maintained dashboard figures (see aggregates.py)
+
+        The first call counts the existing employees and tasks; from then on
+        every change made through the system updates them in place.
+        """
+        aggregates = self._aggregates
+        if aggregates is None:
+            from aggregates import DashboardAggregates
+            with self._write_lock, self.storage.transaction(), self.locks.hold_all():
+                if self._aggregates is None:
+                    aggregates = DashboardAggregates()
+                    aggregates.rebuild(self.employees.values(), self.tasks.values())
+                    self._aggregates = aggregates
+                aggregates = self._aggregates
+        return aggregates
+
+    def get_scheduler(self, horizon_days: int = 20):
+        """Return the deadline-aware schedule of assigned work (see scheduling.py)
+
+        The first call plans every open task; from then on assignments,
+        completions and task changes replan only the employee affected.
+        ``horizon_days`` only applies to that first call.
+        """
+        scheduler = self._scheduler
+        if scheduler is None:
+            from scheduling import Scheduler
+            with self._write_lock, self.storage.transaction(), self.locks.hold_all():
+                if self._scheduler is None:
+                    scheduler = Scheduler(horizon_days)
+                    scheduler.rebuild(self.employees.values(), self.tasks.values())
+                    self._scheduler = scheduler
+                scheduler = self._scheduler
+        return scheduler
+
+    def get_capacity_index(self):
+        """Return the index of employees by remaining capacity (see capacity_index.py)
+
+        Built on first use; assignments, completions and roster changes keep
+        it current. Call invalidate_capacity_index() after editing workloads
+        any other way.
+        """
+        index = self._capacity_index
+        if index is None:
+            from capacity_index import CapacityIndex
+            with self._write_lock, self.storage.transaction(), self.locks.hold_all():
+                if self._capacity_index is None:
+                    index = CapacityIndex()
+                    index.load(self.storage.remaining_capacity())  # Without loading every employee
+                    self._capacity_index = index
+                index = self._capacity_index
+        return index
+
+    def invalidate_capacity_index(self):
+        self._capacity_index = None
+
+    def snapshot(self):
+        """Immutable, consistent view of the employees and tasks at the current version
+
+        Cheap to take: only records changed since the previous snapshot are
+        copied, the rest is shared (see snapshots.py). Readers can render and
+        score a snapshot without blocking writers, and cache results by its
+        version. Edits to employees or tasks that bypass the system's
+        notifications are not picked up.
+        """
+        store = self._snapshots
+        if store is None:
+            from snapshots import SnapshotStore
+            with self._write_lock:
+                if self._snapshots is None:
+                    self._snapshots = SnapshotStore(self)
+                store = self._snapshots
+        return store.take()
+
+    def enable_candidate_rankings(self, depth: int = 10):
+        """Keep the best ``depth`` candidates of every open task ranked (see rankings.py)
+
+        Ranks every open task once; from then on each change re-scores only
+        the employee or task it touched, and find_best_matches serves
+        ``top_n <= depth`` straight from the rankings, with identical results.
+        Returns the CandidateRankings.
+        """
+        from rankings import CandidateRankings
+        with self._write_lock, self.storage.transaction(), self.locks.hold_all():
+            rankings = CandidateRankings(self, depth)
+            rankings.rebuild(self.tasks.values())
+            self._rankings = rankings
+        return rankings
+
+    def disable_candidate_rankings(self):
+        self._rankings = None
+
+    def invalidate_scoring_engine(self):
+        self._scoring_engine = None
+
+    def enable_parallel_scoring(self, workers: int = None, shards: int = None):
+        """Shard find_best_matches and find_best_matches_batch across worker processes
+
+        Worth it for very large rosters only; results are identical to the
+        serial path. See parallel_scoring.ParallelScorer.
+        """
+        from parallel_scoring import ParallelScorer
+        self.disable_parallel_scoring()
+        self.parallel_scorer = ParallelScorer(workers, shards)
+
+    def disable_parallel_scoring(self):
+        if self.parallel_scorer is not None:
+            self.parallel_scorer.close()
+            self.parallel_scorer = None
+
+    def enable_instrumentation(self, methods=None):
+        """Start collecting per-method timings (see instrumentation.py)
+
+        Returns the Instrumentation holding the metrics. Costs nothing until
+        called: the timing wrappers live on this instance only.
+        """
+        import instrumentation
+        self.disable_instrumentation()
+        self.instrumentation = instrumentation.instrument(
+            self, instrumentation.INSTRUMENTED_METHODS if methods is None else methods)
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        if self.instrumentation is not None:
+            from instrumentation import uninstrument
+            uninstrument(self, self.instrumentation)
+            self.instrumentation = None
+
+    def profile_assignment(self, task_id: str, employee_id: str = None, mode: str = 'cprofile'):
+        """Run one assign_task under cProfile ('cprofile') or a sampling profiler ('sampling')
+
+        Returns an instrumentation.ProfileResult with assign_task's return
+        value and the profiler report. The assignment is really made.
+        """
+        from instrumentation import profile_call
+        return profile_call(self.assign_task, task_id, employee_id, mode=mode)
 
     def add_task(self, task: Task):
-        self.tasks[task.task_id] = task
+        with self._write_lock:
+            previous = self.tasks.get(task.task_id)
+            if previous is not None:
+                previous.remove_observer(self)
+                self.score_cache.invalidate_task(task.task_id)
+            self.tasks[task.task_id] = task
+            task.add_observer(self)
+            if self._aggregates is not None:
+                if previous is not None:
+                    self._aggregates.task_removed(previous)
+                self._aggregates.task_added(task)
+            if self._scheduler is not None and previous is not None:
+                self._scheduler.task_removed(previous)
+            if self._rankings is not None:
+                if previous is not None:
+                    self._rankings.task_removed(previous)
+                self._rankings.task_added(task)
+            if self._snapshots is not None:
+                self._snapshots.task_changed(task.task_id, previous is None)
+            self._changed()
+
+    def restore_task(self, task: Task):
+        """add_task for a task carrying its assignment state, e.g. re-imported by bulk_io
+
+        An open task is put back on its assignee's assigned_tasks without
+        adding its hours, which the employee's restored current_workload
+        already counts. Raises ValueError if the assignee is not on the roster.
+        """
+        emp_id = task.assigned_to
+        if not emp_id or task.is_completed:
+            self.add_task(task)
+            return
+        with self._write_lock, self.storage.transaction():
+            employee = self.employees.get(emp_id)
+            if employee is None:
+                raise ValueError(f"task {task.task_id} is assigned to unknown employee {emp_id}")
+            self.add_task(task)
+            with self.locks.hold(task.task_id, emp_id):
+                if task.task_id not in employee.assigned_tasks:
+                    employee.assigned_tasks.append(task.task_id)
+                self.storage.record_assignment(task, employee)
+            if self._scheduler is not None:
+                self._scheduler.task_assigned(task, employee)
+            if self._snapshots is not None:
+                self._snapshots.employee_changed(emp_id)
+            self._changed()
+
+    def remove_employee(self, emp_id: str) -> bool:
+        """Remove an employee who has no assigned tasks"""
+        with self._write_lock:
+            if emp_id not in self.employees:
+                self._report(f"Employee {emp_id} not found")
+                return False
+            employee = self.employees[emp_id]
+            with self.storage.transaction(), self.locks.hold(emp_id):
+                if employee.assigned_tasks:
+                    self._report(f"Employee {employee.name} still has assigned tasks")
+                    return False
+                del self.employees[emp_id]
+            employee.remove_observer(self)
+            self.skill_index.remove_employee(employee)
+            self.score_cache.invalidate_employee(emp_id)
+            self._scoring_engine = None
+            if self._aggregates is not None:
+                self._aggregates.employee_removed(employee)
+            if self._scheduler is not None:
+                self._scheduler.employee_removed(employee)
+            if self._rankings is not None:
+                self._rankings.employee_removed(employee)
+            if self._capacity_index is not None:
+                self._capacity_index.remove(emp_id)
+            if self._snapshots is not None:
+                self._snapshots.employee_changed(emp_id, True)
+            self._changed()
+            return True
+
+    def remove_task(self, task_id: str) -> bool:
+        """Remove a task that is not assigned"""
+        with self._write_lock:
+            if task_id not in self.tasks:
+                self._report(f"Task {task_id} not found")
+                return False
+            task = self.tasks[task_id]
+            with self.storage.transaction(), self.locks.hold(task_id):
+                if task.assigned_to:
+                    self._report(f"Task {task_id} is already assigned to {task.assigned_to}")
+                    return False
+                del self.tasks[task_id]
+            task.remove_observer(self)
+            self.score_cache.invalidate_task(task_id)
+            if self._aggregates is not None:
+                self._aggregates.task_removed(task)
+            if self._rankings is not None:
+                self._rankings.task_removed(task)
+            if self._snapshots is not None:
+                self._snapshots.task_changed(task_id, True)
+            self._changed()
+            return True
 
     def calculate_skill_similarity(self, employee: Employee, task: Task) -> float:
         """Calculate how well employee's skills match task requirements (0-1)"""
@@ -53,9 +458,10 @@ class TaskAssignmentSystem:
         total_experience = 0
         skill_count = 0
         
-        for skill_name in task.required_skills.keys():
-            if skill_name in employee.skills:
-                total_experience += employee.skills[skill_name].experience_years
+        for skill_name in task.required_skills:
+            years = employee.get_skill_experience(skill_name)
+            if years is not None:
+                total_experience += years
                 skill_count += 1
         
         if skill_count == 0:
@@ -67,32 +473,55 @@ class TaskAssignmentSystem:
 
     def calculate_priority_match_score(self, employee: Employee, task: Task) -> float:
         """Calculate how well employee matches task priority needs"""
-        # Higher priority tasks should go to higher performing employees
-        performance_threshold = {
-            TaskPriority.CRITICAL: 0.9,
-            TaskPriority.HIGH: 0.7,
-            TaskPriority.MEDIUM: 0.5,
-            TaskPriority.LOW: 0.3
-        }
-        
-        required_performance = performance_threshold[task.priority]
+        required_performance = PRIORITY_PERFORMANCE_THRESHOLDS[task.priority]
         if employee.performance_rating >= required_performance:
             return 1.0
         else:
             return employee.performance_rating / required_performance
 
+    def _static_components(self, employee: Employee, task: Task) -> Tuple[float, float, float]:
+        """Skill similarity, experience and priority match, cached per pair
+
+        Only pairs of registered employees and tasks are cached, since those
+        are the ones whose changes the system is notified about.
+        """
+        cacheable = (self.employees.get(employee.emp_id) is employee and
+                     self.tasks.get(task.task_id) is task)
+        if cacheable:
+            components = self.score_cache.get(employee.emp_id, task.task_id)
+            if components is not None:
+                return components
+            generation = self.score_cache.generation
+        components = (
+            self.calculate_skill_similarity(employee, task),
+            self.calculate_experience_score(employee, task),
+            self.calculate_priority_match_score(employee, task),
+        )
+        if cacheable:
+            self.score_cache.put(employee.emp_id, task.task_id, components, generation)
+        return components
+
+    def get_score_components(self, employee: Employee, task: Task) -> Dict[str, float]:
+        """Return the individual (unweighted) scores behind an assignment probability"""
+        skill_similarity, experience, priority_match = self._static_components(employee, task)
+        return {
+            'skill_match': skill_similarity,
+            'availability': employee.get_availability_ratio(),
+            'experience': experience,
+            'performance': min(1.0, employee.performance_rating),
+            'priority_match': priority_match
+        }
+
     def calculate_assignment_probability(self, employee: Employee, task: Task) -> float:
         """Calculate probability of assigning task to employee"""
         # Check if employee can handle the workload
         if employee.current_workload + task.estimated_hours > employee.max_workload_hours:
             return 0.0  # Cannot assign if it exceeds capacity
         
-        # Calculate individual scores
-        skill_similarity = self.calculate_skill_similarity(employee, task)
+        # Calculate individual scores (only availability depends on the workload)
+        skill_similarity, experience, priority_match = self._static_components(employee, task)
         availability = employee.get_availability_ratio()
-        experience = self.calculate_experience_score(employee, task)
         performance = min(1.0, employee.performance_rating)
-        priority_match = self.calculate_priority_match_score(employee, task)
         
         # Calculate weighted score
         weighted_score = (
@@ -107,77 +536,457 @@ class TaskAssignmentSystem:
         probability = 1 / (1 + math.exp(-5 * (weighted_score - 0.5)))
         return probability
 
-    def find_best_matches(self, task: Task, top_n: int = 3) -> List[Tuple[Employee, float]]:
-        """Find the best employee matches for a task"""
-        matches = []
-        
-        for employee in self.employees.values():
+    def calculate_probability_matrix(self, tasks: List[Task] = None, emp_ids: List[str] = None):
+        """Score many tasks against many employees in one vectorized pass.
+
+        Returns a NumPy array of shape (len(tasks), len(emp_ids)) holding the
+        same values as calculate_assignment_probability. Defaults to every
+        task and every employee.
+        """
+        engine = self.get_scoring_engine()
+        tasks = list(self.tasks.values()) if tasks is None else tasks
+        rows = None if emp_ids is None else engine.rows_for(emp_ids)
+        return engine.probability_matrix(tasks, rows)
+
+    def what_if_weights(self, weight_vectors, task_ids: List[str] = None, sequential: bool = True):
+        """Evaluate many candidate assignment_weights in one vectorized pass
+
+        ``weight_vectors`` holds dicts shaped like assignment_weights (or rows
+        in what_if.COMPONENTS order). Scores ``task_ids`` (default: every
+        unassigned task) against the whole roster without assigning anything
+        and returns a what_if.WeightSweep with each vector's top choices,
+        coverage and utilization spread. See what_if.py for the two modes.
+        """
+        from what_if import ComponentTensor, sweep
+        if task_ids is None:
+            tasks = [task for task in self.tasks.values() if not task.assigned_to and not task.is_completed]
+        else:
+            tasks = [self.tasks[task_id] for task_id in task_ids if task_id in self.tasks]
+        return sweep(ComponentTensor(self.get_scoring_engine(), tasks), weight_vectors, sequential)
+
+    def simulate_policies(self, policies, trials: int = 1000, seed: int = 0, workers: int = None, **model):
+        """Monte Carlo comparison of assignment policies over simulated days
+
+        ``policies`` are simulation.Policy objects (weights, acceptance
+        threshold, queue order). Arrivals are drawn from the open tasks
+        unless ``model`` passes templates or a recorded ``arrivals`` stream;
+        see simulation.PolicySimulator for the other options. Returns a
+        simulation.SimulationResult per policy name. Nothing is assigned.
+        """
+        from simulation import PolicySimulator
+        return PolicySimulator(self, **model).run(policies, trials, seed, workers)
+
+    def find_best_matches(self, task: Task, top_n: int = 3, vectorized: bool = False,
+                          uncovered: str = 'scan', max_missing: int = None) -> List[Tuple[Employee, float]]:
+        """Find the best employee matches for a task
+
+        Candidates come from the skill index and are visited in order of an
+        optimistic upper bound on their probability; a heap keeps the best
+        ``top_n`` and the scan stops as soon as no remaining candidate can beat
+        the current ``top_n``-th score. ``uncovered`` sets the policy for
+        employees holding none of the required skills: 'scan' considers them
+        whenever they could still make the cut (always the case for tasks
+        nobody covers), which keeps results identical to a full scan; 'skip'
+        never considers them. With ``max_missing``, only employees missing at
+        most that many required skills (not held at the required level) are
+        scored; the skill index finds them with bitmask checks.
+        """
+        if uncovered not in ('scan', 'skip'):
+            raise ValueError(f"Unknown uncovered policy: {uncovered}")
+
+        if max_missing is not None:
+            return self._best_covering_matches(task, top_n, max_missing, vectorized)
+
+        rankings = self._rankings
+        if rankings is not None and uncovered == 'scan' and top_n > 0:
+            matches = rankings.top_matches(task, top_n)
+            if matches is not None:
+                return matches
+
+        if vectorized or self.parallel_scorer is not None:
+            return self.find_best_matches_batch([task], top_n)[0]
+
+        if top_n <= 0:
+            return []
+
+        best = []  # Min-heap of (probability, -position, employee), worst match on top
+        scored = 0
+        for (neg_bound, position), employee in self._candidates_by_bound(task, uncovered):
+            if len(best) == top_n and (neg_bound, position) > (-best[0][0], -best[0][1]):
+                break  # No remaining candidate can beat the current top_n
+            if employee is None:
+                continue  # The uncovered group's bound; its members follow
+            scored += 1
+            probability = self.calculate_assignment_probability(employee, task)
+            if probability <= 0:
+                continue
+            if len(best) < top_n:
+                heapq.heappush(best, (probability, -position, employee))
+            elif (probability, -position) > best[0][:2]:
+                heapq.heapreplace(best, (probability, -position, employee))
+
+        if self.instrumentation is not None:
+            self.instrumentation.record_candidates(scored, len(self.employees))
+        return [(employee, probability) for probability, _, employee in sorted(best, reverse=True)]
+
+    def _best_covering_matches(self, task: Task, top_n: int, max_missing: int,
+                               vectorized: bool) -> List[Tuple[Employee, float]]:
+        if top_n <= 0:
+            return []
+        if not self.skill_index.masks_built:
+            with self._write_lock:
+                self.skill_index.build_masks()
+        emp_ids = self.skill_index.covering(task.required_skills, max_missing)
+        if emp_ids is None:
+            return self.find_best_matches(task, top_n, vectorized)  # Nobody can miss too many
+        if vectorized or self.parallel_scorer is not None:
+            engine = self.get_scoring_engine()
+            rows = engine.rows_for(sorted((emp_id for emp_id in emp_ids if emp_id in engine.row_of),
+                                          key=engine.row_of.__getitem__))
+            return [(engine.employees[row], probability)
+                    for row, probability in engine.top_matches(task, top_n, rows)]
+
+        position = self.skill_index.position
+        best = []  # Min-heap of (probability, -position, employee), as in find_best_matches
+        for employee in self.storage.get_employees(emp_ids):
+            probability = self.calculate_assignment_probability(employee, task)
+            if probability <= 0:
+                continue
+            entry = (probability, -position(employee.emp_id), employee)
+            if len(best) < top_n:
+                heapq.heappush(best, entry)
+            elif entry[:2] > best[0][:2]:
+                heapq.heapreplace(best, entry)
+        if self.instrumentation is not None:
+            self.instrumentation.record_candidates(len(emp_ids), len(self.employees))
+        return [(employee, probability) for probability, _, employee in sorted(best, reverse=True)]
+
+    def find_best_matches_batch(self, tasks: List[Task], top_n: int = 3) -> List[List[Tuple[Employee, float]]]:
+        """find_best_matches for many tasks in one vectorized scoring call
+
+        Tasks repeated in ``tasks`` are scored once. Returns one match list per
+        task, in the order given.
+        """
+        engine = self.get_scoring_engine()
+        unique = list({id(task): task for task in tasks}.values())
+        if self.parallel_scorer is not None:
+            results = self.parallel_scorer.top_matches_batch(engine, unique, top_n)
+        else:
+            results = [engine.top_matches(task, top_n) for task in unique]
+        ranked = {id(task): [(engine.employees[row], probability) for row, probability in matches]
+                  for task, matches in zip(unique, results)}
+        return [ranked[id(task)] for task in tasks]
+
+    def iter_ranked_matches(self, task: Task, uncovered: str = 'scan') -> Iterator[Tuple[Employee, float]]:
+        """Lazily yield (employee, probability) pairs, best first
+
+        Produces the same order as find_best_matches with an unlimited top_n,
+        but only scores as many candidates as needed for the items consumed,
+        so callers can page through the ranking with itertools.islice.
+        """
+        if uncovered not in ('scan', 'skip'):
+            raise ValueError(f"Unknown uncovered policy: {uncovered}")
+
+        scored = []  # Min-heap of (-probability, position, employee)
+        for bound_key, employee in self._candidates_by_bound(task, uncovered):
+            while scored and scored[0][:2] < bound_key:
+                neg_probability, _, best = heapq.heappop(scored)
+                yield best, -neg_probability
+            if employee is None:
+                continue
             probability = self.calculate_assignment_probability(employee, task)
             if probability > 0:
-                matches.append((employee, probability))
-        
-        # Sort by probability (descending)
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches[:top_n]
+                heapq.heappush(scored, (-probability, bound_key[1], employee))
+
+        while scored:
+            neg_probability, _, best = heapq.heappop(scored)
+            yield best, -neg_probability
+
+    def _candidates_by_bound(self, task: Task, uncovered: str) -> Iterator[Tuple[Tuple[float, int], Employee]]:
+        """Yield ((-upper bound, roster position), employee), most promising first
+
+        Employees outside the skill index are only expanded (as one group)
+        once the group's shared bound is reached; that bound is yielded first
+        with employee None, so a caller that stops there never loads them.
+        Only employees the capacity index says have room for the task are
+        looked at.
+        """
+        position = self.skill_index.position
+        capacity_index = self.get_capacity_index()
+        if not task.required_skills:
+            candidate_ids = None
+            candidates = self.storage.get_employees(capacity_index.with_room(task.estimated_hours))
+        elif (capacity_index.count_with_room(task.estimated_hours) <
+              sum(self.skill_index.count(skill_name) for skill_name in task.required_skills)):
+            # Fewer employees with room than skill holders: filter the former by skill bitmasks
+            if not self.skill_index.masks_built:
+                with self._write_lock:
+                    self.skill_index.build_masks()
+            candidate_ids = self.skill_index.holding_any(capacity_index.with_room(task.estimated_hours),
+                                                         task.required_skills)
+            candidates = self.storage.get_employees(candidate_ids)
+        else:
+            candidate_ids = self.skill_index.candidates(task.required_skills)
+            candidates = self.storage.get_employees(candidate_ids)
+
+        heap = [(-self._probability_upper_bound(employee, task, True), position(employee.emp_id), employee)
+                for employee in candidates if self._has_capacity(employee, task)]
+        heapq.heapify(heap)
+        if candidate_ids is not None and uncovered == 'scan':
+            heapq.heappush(heap, (-uncovered_upper_bound(self.assignment_weights), -1, None))
+
+        while heap:
+            neg_bound, pos, employee = heapq.heappop(heap)
+            if employee is None:
+                yield (neg_bound, pos), None
+                covered = set(candidate_ids)
+                room = capacity_index.with_room(task.estimated_hours)
+                for other in self.storage.get_employees([emp_id for emp_id in room if emp_id not in covered]):
+                    if self._has_capacity(other, task):
+                        heapq.heappush(heap, (-self._probability_upper_bound(other, task, False),
+                                              position(other.emp_id), other))
+                continue
+            yield (neg_bound, pos), employee
+
+    @staticmethod
+    def _has_capacity(employee: Employee, task: Task) -> bool:
+        return not employee.current_workload + task.estimated_hours > employee.max_workload_hours
+
+    def _probability_upper_bound(self, employee: Employee, task: Task, has_skills: bool) -> float:
+        """Cheap upper bound on calculate_assignment_probability
+
+        Availability, performance and priority match are exact; skill match and
+        experience are bounded by 1.0, or known exactly (0.0 and 0.1) for
+        employees holding none of the required skills.
+        """
+        return _weighted_upper_bound(self.assignment_weights, has_skills, employee.get_availability_ratio(),
+                                     min(1.0, employee.performance_rating),
+                                     self.calculate_priority_match_score(employee, task))
 
     def assign_task(self, task_id: str, employee_id: str = None) -> bool:
-        """Assign a task to an employee (auto-assign if employee_id not provided)"""
+        """Assign a task to an employee (auto-assign if employee_id not provided)
+
+        Safe to call from several threads: scoring runs without locks, and the
+        final check-and-update happens under the task's and employee's locks,
+        so a task is never assigned twice and no employee is overcommitted.
+        """
+        result = self.try_assign(task_id, employee_id)
+        self._report(result.message)
+        return result.ok
+
+    def try_assign(self, task_id: str, employee_id: str = None) -> AssignmentResult:
+        """assign_task without printing: returns an AssignmentResult"""
         if task_id not in self.tasks:
-            print(f"Task {task_id} not found")
-            return False
+            return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
         
         task = self.tasks[task_id]
         
         if task.assigned_to:
-            print(f"Task {task_id} is already assigned to {task.assigned_to}")
-            return False
+            return AssignmentResult(task_id, task.assigned_to, False,
+                                    f"Task {task_id} is already assigned to {task.assigned_to}")
         
         if employee_id:
             # Manual assignment
             if employee_id not in self.employees:
-                print(f"Employee {employee_id} not found")
-                return False
+                return AssignmentResult(task_id, None, False, f"Employee {employee_id} not found")
             
             employee = self.employees[employee_id]
-            if employee.current_workload + task.estimated_hours > employee.max_workload_hours:
-                print(f"Employee {employee.name} doesn't have enough capacity")
-                return False
+            candidates = [employee]
         else:
             # Auto assignment - find best match
             matches = self.find_best_matches(task)
             if not matches:
-                print(f"No suitable employee found for task {task_id}")
-                return False
+                return AssignmentResult(task_id, None, False, f"No suitable employee found for task {task_id}")
             
-            employee = matches[0][0]  # Best match
+            candidates = [match[0] for match in matches]  # Best match first
+        
+        # Make the assignment, re-checking under the locks in case another
+        # dispatcher committed since we scored. The storage transaction is
+        # always entered before the locks, as in assign_batch.
+        for employee in candidates:
+            with self.storage.transaction(), self.locks.hold(task_id, employee.emp_id):
+                if task.assigned_to:
+                    return AssignmentResult(task_id, task.assigned_to, False,
+                                            f"Task {task_id} is already assigned to {task.assigned_to}")
+                if self.tasks.get(task_id) is not task:
+                    return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
+                if self.employees.get(employee.emp_id) is not employee:
+                    continue  # Removed or replaced since scoring
+                if self._has_capacity(employee, task):
+                    self._apply_assignment(task, employee)
+                    break
+        else:
+            if employee_id:
+                return AssignmentResult(task_id, None, False, f"Employee {employee.name} doesn't have enough capacity")
+            return AssignmentResult(task_id, None, False, f"No suitable employee found for task {task_id}")
         
-        # Make the assignment
+        return AssignmentResult(task_id, employee.emp_id, True, f"Task '{task.name}' assigned to {employee.name}")
+
+    def _apply_assignment(self, task: Task, employee: Employee):
         task.assigned_to = employee.emp_id
         employee.current_workload += task.estimated_hours
-        employee.assigned_tasks.append(task_id)
-        
-        print(f"Task '{task.name}' assigned to {employee.name}")
-        return True
+        employee.assigned_tasks.append(task.task_id)
+        self.storage.record_assignment(task, employee)
+        engine = self._scoring_engine
+        if engine is not None:
+            engine.update_employee(employee)
+        if self._aggregates is not None:
+            self._aggregates.task_assigned(task, employee)
+        if self._scheduler is not None:
+            self._scheduler.task_assigned(task, employee)
+        if self._capacity_index is not None:
+            self._capacity_index.update(employee)
+        if self._rankings is not None:
+            self._rankings.task_assigned(task, employee)
+        if self._snapshots is not None:
+            self._snapshots.task_changed(task.task_id)
+            self._snapshots.employee_changed(employee.emp_id)
+        self._changed()
+
+    def complete_task(self, task_id: str) -> bool:
+        """Mark an assigned task as done, releasing its hours from the assignee's workload"""
+        result = self.try_complete(task_id)
+        self._report(result.message)
+        return result.ok
+
+    def try_complete(self, task_id: str) -> AssignmentResult:
+        """complete_task without printing: returns an AssignmentResult"""
+        if task_id not in self.tasks:
+            return AssignmentResult(task_id, None, False, f"Task {task_id} not found")
+
+        task = self.tasks[task_id]
+        emp_id = task.assigned_to
+        if not emp_id:
+            return AssignmentResult(task_id, None, False, f"Task {task_id} is not assigned")
+
+        with self.storage.transaction(), self.locks.hold(task_id, emp_id):
+            if task.is_completed:
+                return AssignmentResult(task_id, emp_id, False, f"Task {task_id} is already completed")
+            task.is_completed = True
+            employee = self.employees.get(emp_id)
+            released = 0.0
+            if employee is not None:
+                before = employee.current_workload
+                employee.current_workload = max(0.0, before - task.estimated_hours)
+                released = before - employee.current_workload  # Less than the estimate when clamped at 0
+                if task_id in employee.assigned_tasks:
+                    employee.assigned_tasks.remove(task_id)
+            self.storage.record_completion(task, employee)
+            engine = self._scoring_engine
+            if engine is not None and employee is not None:
+                engine.update_employee(employee)
+            if self._aggregates is not None:
+                self._aggregates.task_completed(task, employee, released)
+            if self._scheduler is not None:
+                self._scheduler.task_completed(task)
+            if self._capacity_index is not None and employee is not None:
+                self._capacity_index.update(employee)
+            if self._rankings is not None and employee is not None:
+                self._rankings.workload_released(employee)
+            if self._snapshots is not None:
+                self._snapshots.task_changed(task_id)
+                if employee is not None:
+                    self._snapshots.employee_changed(emp_id)
+            self._changed()
+
+        return AssignmentResult(task_id, emp_id, True, f"Task '{task.name}' completed")
+
+    def assign_batch(self, task_ids: List[str], candidates_per_task: int = 16) -> Dict[str, str]:
+        """Assign many tasks at once with a global greedy matching heuristic
+
+        Candidate pairs from all tasks are taken best first while capacity
+        allows, then one augmenting pass tries to place what is left (see
+        batch_assignment). This is not an exact optimum, but unlike calling
+        assign_task in a loop, tasks are not placed in list order. Unknown and
+        already assigned tasks are skipped. Returns a mapping of task ID to
+        the employee ID it was assigned to.
+        """
+        from batch_assignment import plan_batch_assignment
+
+        tasks = [self.tasks[task_id] for task_id in dict.fromkeys(task_ids)
+                 if task_id in self.tasks and not self.tasks[task_id].assigned_to]
+        engine = self.get_scoring_engine()
+        plan = plan_batch_assignment(engine, tasks, candidates_per_task)
+
+        # Apply the whole plan in one go, skipping pairs another thread invalidated
+        assignments = {}
+        with self.storage.transaction():
+            for task, row in plan:
+                employee = engine.employees[row]
+                with self.locks.hold(task.task_id, employee.emp_id):
+                    if task.assigned_to or not self._has_capacity(employee, task):
+                        continue
+                    if self.tasks.get(task.task_id) is not task or self.employees.get(employee.emp_id) is not employee:
+                        continue  # Removed or replaced since scoring
+                    self._apply_assignment(task, employee)
+                assignments[task.task_id] = employee.emp_id
+
+        self._report(f"Assigned {len(assignments)} of {len(tasks)} tasks")
+        return assignments
+
+    def assign_by_deadline(self, task_ids: List[str] = None, candidates_per_task: int = 8,
+                           chunk_size: int = 256) -> Dict[str, str]:
+        """Assign unassigned tasks earliest-deadline-first (default: all of them)
+
+        Tasks leave a priority queue ordered by priority-weighted deadline
+        (see scheduling.urgency_key). Each goes to the best of its top
+        ``candidates_per_task`` matches that can finish it on time without
+        making other work late, given the current schedule; failing that,
+        to the best match with capacity. Matches are scored a chunk of
+        tasks at a time. Returns a mapping of task ID to employee ID.
+        """
+        from scheduling import choose_employee, urgency_key
+
+        scheduler = self.get_scheduler()
+        task_ids = list(self.tasks) if task_ids is None else dict.fromkeys(task_ids)
+        queue = [(urgency_key(task), task) for task in (self.tasks.get(task_id) for task_id in task_ids)
+                 if task is not None and not task.assigned_to and not task.is_completed]
+        heapq.heapify(queue)
+        total = len(queue)
+
+        assignments = {}
+        while queue:
+            chunk = [heapq.heappop(queue)[1] for _ in range(min(chunk_size, len(queue)))]
+            ranked = self.find_best_matches_batch(chunk, candidates_per_task)
+            with self.storage.transaction():
+                for task, matches in zip(chunk, ranked):
+                    employee = choose_employee(scheduler, task, [match[0] for match in matches], self._has_capacity)
+                    if employee is None:
+                        continue
+                    with self.locks.hold(task.task_id, employee.emp_id):
+                        if task.assigned_to or not self._has_capacity(employee, task):
+                            continue
+                        self._apply_assignment(task, employee)
+                    assignments[task.task_id] = employee.emp_id
+
+        self._report(f"Assigned {len(assignments)} of {total} tasks by deadline")
+        return assignments
+
+    def assign_all(self, candidates_per_task: int = 16) -> Dict[str, str]:
+        """Assign every unassigned task (see assign_batch)"""
+        return self.assign_batch([task_id for task_id, task in self.tasks.items()
+                                  if not task.assigned_to], candidates_per_task)
 
     def get_assignment_recommendations(self, task_id: str) -> None:
         """Display assignment recommendations for a task"""
         if task_id not in self.tasks:
-            print(f"Task {task_id} not found")
+            self._report(f"Task {task_id} not found")
             return
         
         task = self.tasks[task_id]
         matches = self.find_best_matches(task, top_n=5)
         
-        print(f"\nAssignment recommendations for task '{task.name}':")
-        print("-" * 60)
+        self._report(f"\nAssignment recommendations for task '{task.name}':")
+        self._report("-" * 60)
         
         for i, (employee, probability) in enumerate(matches, 1):
-            skill_match = self.calculate_skill_similarity(employee, task)
-            availability = employee.get_availability_ratio()
+            components = self.get_score_components(employee, task)
+            skill_match = components['skill_match']
+            availability = components['availability']
             
-            print(f"{i}. {employee.name}")
-            print(f"   Probability: {probability:.2%}")
-            print(f"   Skill Match: {skill_match:.2%}")
-            print(f"   Availability: {availability:.2%}")
-            print(f"   Current Workload: {employee.current_workload}/{employee.max_workload_hours} hours")
-            print() 
\ No newline at end of file
+            self._report(f"{i}. {employee.name}")
+            self._report(f"   Probability: {probability:.2%}")
+            self._report(f"   Skill Match: {skill_match:.2%}")
+            self._report(f"   Availability: {availability:.2%}")
+            self._report(f"   Current Workload: {employee.current_workload}/{employee.max_workload_hours} hours")
+            self._report() 
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""What-if evaluation of many assignment_weights at once.
+
+The five score components of every (task, employee) pair are computed once
+into a ComponentTensor; sweep() then scores all the weight vectors against
+it in one vectorized pass per task, with the same operations and order as
+ScoringEngine.weighted_scores. Per weight vector it reports each task's top
+choice, how many tasks could be assigned (coverage) and how evenly the
+resulting workload is spread.
+
+Two modes:
+
+- sequential (default): tasks are placed one after another, each on its
+  best match given the workload added so far, like assign_task in a loop;
+- independent: every task takes its best match against the current
+  workload, as find_best_matches(task, 1) would report it right now.
+
+Best matches are taken on the weighted score; the probability is a
+monotonic function of it, so this only differs from find_best_matches
+where two scores round to the same probability.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models import Task, TaskPriority
+
+COMPONENTS = ('skill_match', 'availability', 'experience', 'performance', 'priority_match')
+
+# Scores held in memory at once by the independent mode
+_CHUNK_ELEMENTS = 4_000_000
+
+
+class ComponentTensor:
+    """Score components of ``tasks`` against every employee of ``engine``
+
+    Skill match and experience are stored per (task, employee), priority
+    match per (priority, employee), availability and performance per
+    employee. Workloads are copied, so the tensor is a consistent
+    snapshot even while assignments continue.
+    """
+
+    def __init__(self, engine, tasks: Sequence[Task]):
+        self.emp_ids = [employee.emp_id for employee in engine.employees]
+        self.task_ids = [task.task_id for task in tasks]
+        size = engine.size
+        self.max_workload = engine.max_workload.copy()
+        self.current_workload = engine.current_workload.copy()
+        self.hours = np.array([task.estimated_hours for task in tasks], dtype=np.float64)
+        self.skill_match = np.empty((len(tasks), size), dtype=np.float64)
+        self.experience = np.empty((len(tasks), size), dtype=np.float64)
+        self.priority_index = np.empty(len(tasks), dtype=np.int64)
+        self.priority_match = np.empty((len(TaskPriority), size), dtype=np.float64)
+
+        priorities = list(TaskPriority)
+        seen = set()
+        for i, task in enumerate(tasks):
+            components = engine.score_components(task)
+            self.skill_match[i] = components['skill_match']
+            self.experience[i] = components['experience']
+            index = self.priority_index[i] = priorities.index(task.priority)
+            if index not in seen:
+                seen.add(index)
+                self.priority_match[index] = components['priority_match']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.availability = np.maximum(0, (self.max_workload - self.current_workload) / self.max_workload)
+        self.performance = np.minimum(1.0, engine.performance)
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+
+@dataclass
+class WeightSweep:
+    """Outcome of sweep(); row ``i`` of every array belongs to ``weights[i]``"""
+    weights: np.ndarray  # (vectors, 5), columns in COMPONENTS order
+    emp_ids: List[str]
+    task_ids: List[str]
+    choices: np.ndarray  # (vectors, tasks): employee index per task, -1 if none fits
+    coverage: np.ndarray  # Fraction of tasks given an employee
+    utilization_mean: np.ndarray  # Over employees, after the simulated assignments
+    utilization_std: np.ndarray
+    utilization_spread: np.ndarray  # Highest minus lowest utilization
+    sequential: bool
+
+    def top_choices(self, i: int) -> Dict[str, Optional[str]]:
+        """Task ID -> chosen employee ID (None if nobody fits) for weight vector ``i``"""
+        return {task_id: self.emp_ids[row] if row >= 0 else None
+                for task_id, row in zip(self.task_ids, self.choices[i].tolist())}
+
+    def records(self) -> List[dict]:
+        """One summary row per weight vector, e.g. for a DataFrame"""
+        return [dict(zip(COMPONENTS, self.weights[i].tolist()),
+                     coverage=float(self.coverage[i]),
+                     utilization_mean=float(self.utilization_mean[i]),
+                     utilization_std=float(self.utilization_std[i]),
+                     utilization_spread=float(self.utilization_spread[i]))
+                for i in range(len(self.weights))]
+
+    def best(self) -> int:
+        """Index of the vector with the highest coverage, then the lowest utilization spread"""
+        return int(np.lexsort((self.utilization_spread, -self.coverage))[0])
+
+
+def weight_matrix(weight_vectors: Union[np.ndarray, Sequence]) -> np.ndarray:
+    """(vectors, 5) array from assignment_weights-style dicts or rows in COMPONENTS order"""
+    vectors = list(weight_vectors) if not isinstance(weight_vectors, np.ndarray) else weight_vectors
+    if len(vectors) and isinstance(vectors[0], dict):
+        missing = set()
+        for vector in vectors:
+            missing |= set(COMPONENTS) - set(vector)
+        if missing:
+            raise ValueError(f"Weight vectors missing components: {sorted(missing)}")
+        vectors = [[vector[name] for name in COMPONENTS] for vector in vectors]
+    return np.array(vectors, dtype=np.float64).reshape(-1, len(COMPONENTS))
+
+
+def sweep(tensor: ComponentTensor, weight_vectors, sequential: bool = True) -> WeightSweep:
+    """Evaluate every weight vector against ``tensor`` (see the module docstring)"""
+    weights = weight_matrix(weight_vectors)
+    vectors, tasks, size = len(weights), len(tensor), len(tensor.emp_ids)
+    w_skill, w_availability, w_experience, w_performance, w_priority = (weights[:, [j]] for j in range(5))
+    choices = np.full((vectors, tasks), -1, dtype=np.int64)
+    workload = np.tile(tensor.current_workload, (vectors, 1))
+    max_workload = tensor.max_workload
+    performance_term = tensor.performance * w_performance
+
+    if size and sequential:
+        # Only the chosen employee's availability changes after each task
+        vector_rows = np.arange(vectors)
+        availability_term = np.tile(tensor.availability, (vectors, 1)) * w_availability
+        scores = np.empty((vectors, size))
+        term = np.empty((vectors, size))
+        for t in range(tasks):
+            hours = tensor.hours[t]
+            np.multiply(tensor.skill_match[t], w_skill, out=scores)
+            scores += availability_term
+            scores += np.multiply(tensor.experience[t], w_experience, out=term)
+            scores += performance_term
+            scores += np.multiply(tensor.priority_match[tensor.priority_index[t]], w_priority, out=term)
+            infeasible = np.add(workload, hours, out=term) > max_workload
+            scores[infeasible] = -np.inf
+            best = np.argmax(scores, axis=1)
+            placed = ~infeasible[vector_rows, best]
+            rows, columns = vector_rows[placed], best[placed]
+            choices[rows, t] = columns
+            workload[rows, columns] += hours
+            with np.errstate(divide='ignore', invalid='ignore'):
+                availability = np.maximum(0, (max_workload[columns] - workload[rows, columns]) / max_workload[columns])
+            availability_term[rows, columns] = availability * w_availability[rows, 0]
+    elif size:
+        availability_term = tensor.availability * w_availability
+        chunk = max(1, _CHUNK_ELEMENTS // max(1, vectors * size))
+        for start in range(0, tasks, chunk):
+            block = slice(start, min(tasks, start + chunk))
+            scores = tensor.skill_match[None, block] * w_skill[:, :, None]
+            scores += availability_term[:, None, :]
+            scores += tensor.experience[None, block] * w_experience[:, :, None]
+            scores += performance_term[:, None, :]
+            scores += tensor.priority_match[tensor.priority_index[block]][None] * w_priority[:, :, None]
+            feasible = ~(tensor.current_workload + tensor.hours[block, None] > max_workload)
+            scores[:, ~feasible] = -np.inf
+            best = np.argmax(scores, axis=2)
+            placed = feasible[np.arange(best.shape[1]), best]
+            choices[:, block] = np.where(placed, best, -1)
+        for i in range(vectors):
+            placed = choices[i] >= 0
+            np.add.at(workload[i], choices[i][placed], tensor.hours[placed])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilization = np.where(max_workload > 0, workload / max_workload, 0.0)
+    empty = np.zeros(vectors)
+    return WeightSweep(
+        weights=weights,
+        emp_ids=tensor.emp_ids,
+        task_ids=tensor.task_ids,
+        choices=choices,
+        coverage=(choices >= 0).mean(axis=1) if tasks else empty,
+        utilization_mean=utilization.mean(axis=1) if size else empty,
+        utilization_std=utilization.std(axis=1) if size else empty,
+        utilization_spread=np.ptp(utilization, axis=1) if size else empty,
+        sequential=sequential,
+    )